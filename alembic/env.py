@@ -50,6 +50,10 @@ import src.db.models.activities
 import src.db.models.tokens
 import src.db.models.splits
 import src.db.models.athletes
+import src.db.models.best_efforts
+import src.db.models.training_load
+import src.db.models.stats_versions
+import src.db.models.activity_routes
 
 # Alembic Config object
 config = context.config
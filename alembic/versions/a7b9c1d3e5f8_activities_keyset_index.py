@@ -0,0 +1,29 @@
+"""Extend the athlete/start_date index with activity_id for keyset pagination
+
+Revision ID: a7b9c1d3e5f8
+Revises: f6a8b0c2d4e7
+Create Date: 2026-10-19 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b9c1d3e5f8'
+down_revision: Union[str, None] = 'f6a8b0c2d4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_activities_athlete_start_date_id', 'activities',
+        ['athlete_id', 'start_date', 'activity_id']
+    )
+    op.drop_index('ix_activities_athlete_start_date', table_name='activities')
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_activities_athlete_start_date', 'activities', ['athlete_id', 'start_date'])
+    op.drop_index('ix_activities_athlete_start_date_id', table_name='activities')
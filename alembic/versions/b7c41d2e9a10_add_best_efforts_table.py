@@ -0,0 +1,43 @@
+"""Add best_efforts table
+
+Revision ID: b7c41d2e9a10
+Revises: f23968f5fa38
+Create Date: 2026-10-19 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41d2e9a10'
+down_revision: Union[str, None] = 'f23968f5fa38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'best_efforts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('athlete_id', sa.BigInteger(), nullable=False),
+        sa.Column('activity_id', sa.BigInteger(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('distance', sa.Float(), nullable=False),
+        sa.Column('elapsed_time', sa.Float(), nullable=False),
+        sa.Column('start_index', sa.Integer(), nullable=True),
+        sa.Column('end_index', sa.Integer(), nullable=True),
+        sa.Column('start_date', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['activity_id'], ['activities.activity_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('activity_id', 'distance', name='uq_best_effort_activity_distance')
+    )
+    op.create_index(
+        'ix_best_efforts_athlete_distance_time', 'best_efforts',
+        ['athlete_id', 'distance', 'elapsed_time']
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_best_efforts_athlete_distance_time', table_name='best_efforts')
+    op.drop_table('best_efforts')
@@ -0,0 +1,29 @@
+"""Add stats_versions table
+
+Revision ID: b8c0d2e4f6a9
+Revises: a7b9c1d3e5f8
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c0d2e4f6a9'
+down_revision: Union[str, None] = 'a7b9c1d3e5f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'stats_versions',
+        sa.Column('athlete_id', sa.BigInteger(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('athlete_id')
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stats_versions')
@@ -0,0 +1,33 @@
+"""Add training_load table
+
+Revision ID: c3d5e7f90b12
+Revises: b7c41d2e9a10
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d5e7f90b12'
+down_revision: Union[str, None] = 'b7c41d2e9a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'training_load',
+        sa.Column('athlete_id', sa.BigInteger(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('load', sa.Float(), nullable=False),
+        sa.Column('ctl', sa.Float(), nullable=False),
+        sa.Column('atl', sa.Float(), nullable=False),
+        sa.Column('tsb', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('athlete_id', 'day')
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('training_load')
@@ -0,0 +1,24 @@
+"""Add updated_at to stats_versions for Last-Modified
+
+Revision ID: c9d1e3f5a7b0
+Revises: b8c0d2e4f6a9
+Create Date: 2026-10-19 16:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d1e3f5a7b0'
+down_revision: Union[str, None] = 'b8c0d2e4f6a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('stats_versions', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('stats_versions', 'updated_at')
@@ -0,0 +1,42 @@
+"""Add activity_routes for latlng polylines
+
+Revision ID: d0e2f4a6b8c1
+Revises: c9d1e3f5a7b0
+Create Date: 2026-10-19 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e2f4a6b8c1'
+down_revision: Union[str, None] = 'c9d1e3f5a7b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'activity_routes',
+        sa.Column('activity_id', sa.BigInteger(), nullable=False),
+        sa.Column('athlete_id', sa.BigInteger(), nullable=False),
+        sa.Column('polyline', sa.Text(), nullable=False),
+        sa.Column('point_count', sa.Integer(), nullable=False),
+        sa.Column('min_lat', sa.Float(), nullable=False),
+        sa.Column('min_lng', sa.Float(), nullable=False),
+        sa.Column('max_lat', sa.Float(), nullable=False),
+        sa.Column('max_lng', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['activity_id'], ['activities.activity_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('activity_id')
+    )
+    op.create_index(
+        'ix_activity_routes_athlete_bbox', 'activity_routes',
+        ['athlete_id', 'min_lat', 'max_lat', 'min_lng', 'max_lng'],
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_routes_athlete_bbox', table_name='activity_routes')
+    op.drop_table('activity_routes')
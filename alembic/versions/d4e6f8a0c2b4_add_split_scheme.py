@@ -0,0 +1,30 @@
+"""Add scheme column to splits
+
+Revision ID: d4e6f8a0c2b4
+Revises: c3d5e7f90b12
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e6f8a0c2b4'
+down_revision: Union[str, None] = 'c3d5e7f90b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows were all built as mile splits
+    op.add_column('splits', sa.Column('scheme', sa.String(), nullable=False, server_default='mi'))
+    op.drop_constraint('uq_activity_lap', 'splits', type_='unique')
+    op.create_unique_constraint('uq_activity_scheme_lap', 'splits', ['activity_id', 'scheme', 'lap_index'])
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM splits WHERE scheme <> 'mi'")
+    op.drop_constraint('uq_activity_scheme_lap', 'splits', type_='unique')
+    op.create_unique_constraint('uq_activity_lap', 'splits', ['activity_id', 'lap_index'])
+    op.drop_column('splits', 'scheme')
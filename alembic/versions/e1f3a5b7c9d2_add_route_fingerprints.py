@@ -0,0 +1,39 @@
+"""Add route fingerprint and cluster columns to activity_routes
+
+Revision ID: e1f3a5b7c9d2
+Revises: d0e2f4a6b8c1
+Create Date: 2026-10-19 19:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f3a5b7c9d2'
+down_revision: Union[str, None] = 'd0e2f4a6b8c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('activity_routes', sa.Column('distance', sa.Float(), nullable=True))
+    op.add_column('activity_routes', sa.Column('start_cell', sa.String(length=12), nullable=True))
+    op.add_column('activity_routes', sa.Column('end_cell', sa.String(length=12), nullable=True))
+    op.add_column('activity_routes', sa.Column('shape', sa.Text(), nullable=True))
+    op.add_column('activity_routes', sa.Column('cluster_id', sa.BigInteger(), nullable=True))
+    op.create_index(
+        'ix_activity_routes_athlete_start_cell_distance', 'activity_routes',
+        ['athlete_id', 'start_cell', 'distance'],
+    )
+    op.create_index('ix_activity_routes_athlete_cluster', 'activity_routes', ['athlete_id', 'cluster_id'])
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_routes_athlete_cluster', table_name='activity_routes')
+    op.drop_index('ix_activity_routes_athlete_start_cell_distance', table_name='activity_routes')
+    op.drop_column('activity_routes', 'cluster_id')
+    op.drop_column('activity_routes', 'shape')
+    op.drop_column('activity_routes', 'end_cell')
+    op.drop_column('activity_routes', 'start_cell')
+    op.drop_column('activity_routes', 'distance')
@@ -0,0 +1,26 @@
+"""Add HR zone settings to athletes
+
+Revision ID: e5f7a9b1d3c6
+Revises: d4e6f8a0c2b4
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f7a9b1d3c6'
+down_revision: Union[str, None] = 'd4e6f8a0c2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('athletes', sa.Column('max_heartrate', sa.Integer(), nullable=True))
+    op.add_column('athletes', sa.Column('hr_zone_bounds', sa.JSON(), nullable=True))
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('athletes', 'hr_zone_bounds')
+    op.drop_column('athletes', 'max_heartrate')
@@ -0,0 +1,31 @@
+"""Add pace zone settings and pace-zone reporting indexes
+
+Revision ID: f6a8b0c2d4e7
+Revises: e5f7a9b1d3c6
+Create Date: 2026-10-19 13:00:00.000000
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a8b0c2d4e7'
+down_revision: Union[str, None] = 'e5f7a9b1d3c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('athletes', sa.Column('pace_zone_bounds', sa.JSON(), nullable=True))
+    op.create_index('ix_activities_athlete_start_date', 'activities', ['athlete_id', 'start_date'])
+    op.create_index(
+        'ix_splits_activity_scheme_zone', 'splits',
+        ['activity_id', 'scheme', 'pace_zone', 'moving_time']
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_splits_activity_scheme_zone', table_name='splits')
+    op.drop_index('ix_activities_athlete_start_date', table_name='activities')
+    op.drop_column('athletes', 'pace_zone_bounds')
@@ -1,4 +1,4 @@
-import React, { useState } from "react";
+import React, { useRef, useState } from "react";
 
 const baseUrl = import.meta.env.VITE_API_BASE_URL;
 
@@ -6,34 +6,77 @@ export default function AskGptMvpUI() {
   const [question, setQuestion] = useState("");
   const [response, setResponse] = useState("");
   const [loading, setLoading] = useState(false);
+  const abortRef = useRef(null);
 
   const athleteId = 347085; // TODO: Replace with dynamic value if needed
 
+  // Parse one SSE block ("event: x\ndata: {...}") into [event, data]
+  const parseEvent = (block) => {
+    let event = "message";
+    let data = "";
+    for (const line of block.split("\n")) {
+      if (line.startsWith("event: ")) event = line.slice(7);
+      else if (line.startsWith("data: ")) data += line.slice(6);
+    }
+    return [event, data ? JSON.parse(data) : {}];
+  };
+
   const handleAsk = async () => {
     if (!question.trim()) return;
     setLoading(true);
     setResponse("");
 
+    const controller = new AbortController();
+    abortRef.current = controller;
+
     try {
-      const res = await fetch(`${baseUrl}/ask`, {
+      const res = await fetch(`${baseUrl}/ask/stream`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
         },
         credentials: "include",
         body: JSON.stringify({ question, athlete_id: athleteId }),
+        signal: controller.signal,
       });
 
-      const data = await res.json();
-      setResponse(data.response || data.error || "No response returned.");
+      if (!res.ok || !res.body) {
+        const data = await res.json();
+        setResponse(data.error || "No response returned.");
+        return;
+      }
+
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let sep;
+        while ((sep = buffer.indexOf("\n\n")) !== -1) {
+          const [event, data] = parseEvent(buffer.slice(0, sep));
+          buffer = buffer.slice(sep + 2);
+          if (event === "token") setResponse((prev) => prev + data.token);
+          else if (event === "done") setResponse(data.response || "No response returned.");
+          else if (event === "error") setResponse(data.error);
+        }
+      }
     } catch (err) {
-      console.error("Error:", err);
-      setResponse("❌ Error contacting backend.");
+      if (err.name !== "AbortError") {
+        console.error("Error:", err);
+        setResponse("❌ Error contacting backend.");
+      }
     } finally {
+      abortRef.current = null;
       setLoading(false);
     }
   };
 
+  const handleCancel = () => abortRef.current?.abort();
+
   return (
     <div className="max-w-2xl mx-auto mt-10 p-4">
       <div className="border rounded-xl shadow-xl p-6 bg-white">
@@ -51,6 +94,14 @@ export default function AskGptMvpUI() {
         >
           {loading ? "Loading..." : "Ask CoachGPT"}
         </button>
+        {loading && (
+          <button
+            onClick={handleCancel}
+            className="ml-2 border px-4 py-2 rounded"
+          >
+            Cancel
+          </button>
+        )}
         {response && (
           <div className="mt-4 bg-gray-50 p-4 rounded-xl border text-sm whitespace-pre-line">
             {response}
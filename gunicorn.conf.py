@@ -0,0 +1,70 @@
+"""
+Production server profile; gunicorn loads ./gunicorn.conf.py automatically.
+
+    gunicorn wsgi:app
+
+Sizing comes from src.utils.server_profile. Override with WEB_CONCURRENCY,
+GUNICORN_WORKER_CLASS, GUNICORN_THREADS, GUNICORN_TIMEOUT and
+GUNICORN_MAX_REQUESTS.
+"""
+
+import os
+import shutil
+
+# Underscored: gunicorn treats every public module-level name as a setting
+from src.utils.env import load_environment as _load_environment
+
+_load_environment()
+
+import src.utils.config as _config  # noqa: E402  (reads the environment loaded above)
+from src.utils.server_profile import compute_profile as _compute_profile  # noqa: E402
+
+_profile = _compute_profile(
+    cpu_count=os.cpu_count() or 1,
+    worker_class=_config.GUNICORN_WORKER_CLASS,
+    workers=_config.GUNICORN_WORKERS,
+    threads=_config.GUNICORN_THREADS,
+    db_pool_size=_config.DB_POOL_SIZE,
+    db_max_overflow=_config.DB_MAX_OVERFLOW,
+    db_max_connections=_config.DB_MAX_CONNECTIONS,
+    timeout=_config.GUNICORN_TIMEOUT,
+    max_requests=_config.GUNICORN_MAX_REQUESTS,
+)
+
+bind = f"0.0.0.0:{_config.PORT}"
+worker_class = _profile.worker_class
+workers = _profile.workers
+threads = _profile.threads
+worker_connections = _profile.worker_connections
+timeout = _profile.timeout
+graceful_timeout = _profile.graceful_timeout
+keepalive = 5
+max_requests = _profile.max_requests
+max_requests_jitter = _profile.max_requests_jitter
+preload_app = True
+accesslog = "-"
+
+
+def on_starting(server):
+    """
+    Prometheus multiprocess mode needs an empty directory at startup.
+    """
+    prom_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if prom_dir:
+        shutil.rmtree(prom_dir, ignore_errors=True)
+        os.makedirs(prom_dir, exist_ok=True)
+    server.log.info(
+        "Gunicorn profile: %s x %d workers, %d threads, timeout %ss",
+        worker_class, workers, threads, timeout,
+    )
+
+
+def child_exit(server, worker):
+    from src.utils.metrics import child_exit as mark_process_dead
+    mark_process_dead(server, worker)
+
+
+def post_fork(server, worker):
+    # preload_app imports the app in the master; never share its DB sockets
+    from src.db.db_session import dispose_engines
+    dispose_engines()
@@ -2,44 +2,22 @@ import sys
 import os
 from pathlib import Path
 from datetime import datetime
-from dotenv import load_dotenv
 
 # ─────────────────────────────
 # 📦 Setup
 # ─────────────────────────────
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-# Check and print the FLASK_ENV to confirm it's being set correctly
-env_mode = os.getenv("FLASK_ENV", "production")  # Default to production if FLASK_ENV is not set
+# Environment (.env.test / .env / .env.prod by FLASK_ENV) is loaded once by src.app
+env_mode = os.getenv("FLASK_ENV", "production")
 print(f"🌍 FLASK_ENV is set to: {env_mode}", flush=True)
 
-# Load environment variables based on FLASK_ENV
-if env_mode == "test":
-    load_dotenv(".env.test", override=True)
-    print("🔍 Loading .env.test for testing", flush=True)
-elif env_mode == "development":
-    load_dotenv(".env", override=True)
-    print("🔍 Loading .env for development", flush=True)
-else:
-    load_dotenv(".env.prod", override=True)
-    print("🔍 Loading .env.prod for production", flush=True)
-
-    
-    
-    
-    
-
-print("DATABASE_URL at runtime:", os.getenv("DATABASE_URL"), flush=True)
-
-import src.utils.config as config
-from src.db.db_session import get_session
-from src.services.ingestion_orchestrator_service import run_full_ingestion_and_enrichment
-
 # ─────────────────────────────
 # 🚀 Flask App Setup for Gunicorn
 # ─────────────────────────────
 try:
     from src.app import create_app
+    import src.utils.config as config
     app = create_app()
     print("✅ App created via create_app()", flush=True)
 except Exception as e:
@@ -66,6 +44,9 @@ if __name__ == "__main__":
     if os.getenv("RUN_CRON") == "true":
         print(f"[CRON SYNC] ✅ Sync job started at {datetime.utcnow().isoformat()}", flush=True)
         try:
+            from src.db.db_session import get_session
+            from src.services.ingestion_orchestrator_service import run_full_ingestion_and_enrichment
+
             session = get_session()
             athlete_id = int(os.getenv("ATHLETE_ID", "123456"))
             result = run_full_ingestion_and_enrichment(session, athlete_id)
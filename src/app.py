@@ -1,27 +1,13 @@
 import os
-from dotenv import load_dotenv
 from pathlib import Path
 
-# 📦 Environment Setup
-raw_env_mode = os.environ.get("FLASK_ENV", "production")
-env_path = {
-    "test": ".env.test",
-    "staging": ".env.staging",
-    "production": ".env.prod"
-}.get(raw_env_mode, ".env")
+# 📦 Environment Setup: once, quietly, before anything imports src.utils.config
+from src.utils.env import load_environment
 
-load_dotenv(env_path, override=True)
-print(f"✅ Loaded environment: {env_path}", flush=True)
-
-if env_path != ".env":
-    print("🚫 Skipping .env fallback", flush=True)
-else:
-    print("ℹ️ Default .env used", flush=True)
-
-print(f"📍 STRAVA_REDIRECT_URI = {os.getenv('STRAVA_REDIRECT_URI')}", flush=True)
+ENV_PATH = load_environment()
 
 # 🌐 Flask Setup
-from flask import Flask, send_from_directory, redirect
+from flask import Flask, redirect
 from flask_cors import CORS
 import src.utils.config as config
 from src.routes.admin_routes import admin_bp
@@ -29,9 +15,22 @@ from src.routes.auth_routes import auth_bp
 from src.routes.activity_routes import activity_bp
 from src.routes.health_routes import health_bp
 from src.routes.ask_routes import ask_bp
+from src.routes.metrics_routes import metrics_bp
+from src.routes.records_routes import records_bp
+from src.routes.training_load_routes import training_load_bp
+from src.routes.hr_zone_routes import hr_zone_bp
+from src.routes.pace_zone_routes import pace_zone_bp
+from src.routes.activity_list_routes import activity_list_bp
+from src.routes.stats_routes import stats_bp
+from src.routes.export_routes import export_bp
+from src.routes.heatmap_routes import heatmap_bp
+from src.routes.route_cluster_routes import route_cluster_bp
+from src.utils import compression, metrics, static_files
 
 def create_app(test_config=None):
     app = Flask(__name__, static_folder="static", static_url_path="/")
+    app.logger.info("Loaded environment from %s", ENV_PATH)
+    app.logger.info("STRAVA_REDIRECT_URI = %s", config.STRAVA_REDIRECT_URI)
     CORS(app, supports_credentials=True)
 
     # 🔐 Configuration
@@ -52,6 +51,26 @@ def create_app(test_config=None):
     app.register_blueprint(activity_bp, url_prefix="/sync")
     app.register_blueprint(health_bp)
     app.register_blueprint(ask_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(records_bp)
+    app.register_blueprint(training_load_bp)
+    app.register_blueprint(hr_zone_bp)
+    app.register_blueprint(pace_zone_bp)
+    app.register_blueprint(activity_list_bp)
+    app.register_blueprint(stats_bp)
+    app.register_blueprint(export_bp)
+    app.register_blueprint(heatmap_bp)
+    app.register_blueprint(route_cluster_bp)
+
+    # 🗜️ Compression runs last among after_request hooks, so register it first
+    compression.init_app(app)
+
+    # 📈 Request latency metrics
+    metrics.init_app(app)
+
+    # 📦 SPA assets: precompressed files, cache headers, in-memory index.html
+    static_files.init_app(app)
+    spa_index = app.extensions["spa_index"]
 
     # 🧪 Utility Endpoints
     @app.route("/ping")
@@ -72,10 +91,9 @@ def create_app(test_config=None):
     @app.route("/db-check")
     def db_check():
         try:
-            from sqlalchemy import create_engine, inspect
-            db_url = os.getenv("DATABASE_URL")
-            engine = create_engine(db_url)
-            insp = inspect(engine)
+            from sqlalchemy import inspect
+            from src.db.db_session import get_engine
+            insp = inspect(get_engine())
             columns = insp.get_columns("splits")
             split_col = next((c for c in columns if c["name"] == "split"), None)
             return {
@@ -98,16 +116,14 @@ def create_app(test_config=None):
         if env in ["development", "test"]:
             redirect_url = os.getenv("FRONTEND_REDIRECT")
             return redirect(redirect_url)
-        index_path = os.path.join(app.static_folder, "index.html")
-        if os.path.exists(index_path):
-            return send_from_directory(app.static_folder, "index.html")
+        if spa_index.exists:
+            return spa_index.response()
         return "❌ Frontend not found", 404
 
     @app.errorhandler(404)
     def spa_fallback(e):
-        index_path = os.path.join(app.static_folder, "index.html")
-        if os.path.exists(index_path):
-            return send_from_directory(app.static_folder, "index.html")
+        if spa_index.exists:
+            return spa_index.response()
         return "404 Not Found", 404
 
     return app
@@ -1,51 +1,62 @@
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from src.db.models.activities import Activity
 
-from src.utils.conversions import convert_metrics
+from src.utils.conversions import convert_metrics_batch
 from src.utils.logger import get_logger
-from typing import List, Dict
+from src.utils.ask_cache import invalidate_athlete
+from src.utils.stats_cache import bump_version
+from src.utils.activity_index import update_index
+from datetime import datetime
+from typing import List, Dict, Optional, Sequence
 
 logger = get_logger(__name__)
 
+# Columns a listing may project; activity_id and start_date are always included for the cursor
+LISTABLE_COLUMNS = (
+    "activity_id", "start_date", "name", "type", "timezone",
+    "distance", "moving_time", "elapsed_time", "total_elevation_gain",
+    "average_speed", "max_speed", "average_heartrate", "max_heartrate", "suffer_score", "calories",
+    "conv_distance", "conv_elevation_feet", "conv_avg_speed", "conv_max_speed",
+    "conv_moving_time", "conv_elapsed_time",
+    "hr_zone_1", "hr_zone_2", "hr_zone_3", "hr_zone_4", "hr_zone_5",
+)
+
 class ActivityDAO:
     @staticmethod
-    def upsert_activities(session: Session, athlete_id: int, activities: List[Dict]) -> int:
+    def missing_required_fields(act: Dict) -> list[str]:
+        """
+        Fields upsert_activities needs but the payload lacks; external_id is optional for treadmill runs.
+        """
+        is_treadmill = "treadmill" in (act.get("name") or "").lower()
+        required_fields = ["id", "start_date", "distance", "moving_time", "elapsed_time"]
+        if not is_treadmill:
+            required_fields.append("external_id")
+        return [f for f in required_fields if not act.get(f)]
+
+    @staticmethod
+    def upsert_activities(session: Session, athlete_id: int, activities: List[Dict], commit: bool = True) -> int:
         """
         Upsert activities into the database, filtering only 'Run' types.
+        Pass commit=False to leave the transaction open; the caller then owns
+        the commit, and the /ask retrieval index catches up on its next search.
         """
         if not activities:
             return 0
 
         rows = []
+        kept = []
         for act in activities:
             if act.get("type") != "Run":
                 logger.warning(f"⚠️ Skipping non-Run activity {act.get('id')} — type={act.get('type')}")
                 continue
 
-            name = act.get("name", "").lower()
-            is_treadmill = "treadmill" in name
-
-            required_fields = ["id", "start_date", "distance", "moving_time", "elapsed_time"]
-            if not is_treadmill:
-                required_fields.append("external_id")
-
-            missing = [f for f in required_fields if not act.get(f)]
+            missing = ActivityDAO.missing_required_fields(act)
             if missing:
                 logger.error(f"❌ Skipping activity {act.get('id')} due to missing required fields: {missing}")
                 continue
 
-            conv_input = {
-                "distance": act.get("distance"),
-                "elevation": act.get("total_elevation_gain"),
-                "average_speed": act.get("average_speed"),
-                "max_speed": act.get("max_speed"),
-                "moving_time": act.get("moving_time"),
-                "elapsed_time": act.get("elapsed_time")
-            }
-            conv_fields = ["distance", "elevation", "average_speed", "max_speed", "moving_time", "elapsed_time"]
-            conv = convert_metrics(conv_input, conv_fields)
-
             row = {
                 "activity_id": act["id"],
                 "athlete_id": athlete_id,
@@ -63,18 +74,26 @@ class ActivityDAO:
                 "hr_zone_3": act.get("hr_zone_3"),
                 "hr_zone_4": act.get("hr_zone_4"),
                 "hr_zone_5": act.get("hr_zone_5"),
-                "conv_distance": conv.get("conv_distance"),
-                "conv_elevation_feet": conv.get("conv_elevation_feet"),
-                "conv_avg_speed": conv.get("conv_avg_speed"),
-                "conv_max_speed": conv.get("conv_max_speed"),
-                "conv_moving_time": conv.get("conv_moving_time"),
-                "conv_elapsed_time": conv.get("conv_elapsed_time"),
             }
             rows.append(row)
+            kept.append(act)
 
         if not rows:
             return 0
 
+        # Convert the whole page column-wise in one pass
+        conv = convert_metrics_batch({
+            "distance": [a.get("distance") for a in kept],
+            "elevation": [a.get("total_elevation_gain") for a in kept],
+            "average_speed": [a.get("average_speed") for a in kept],
+            "max_speed": [a.get("max_speed") for a in kept],
+            "moving_time": [a.get("moving_time") for a in kept],
+            "elapsed_time": [a.get("elapsed_time") for a in kept],
+        }, ["distance", "elevation", "average_speed", "max_speed", "moving_time", "elapsed_time"])
+        for key, values in conv.items():
+            for row, value in zip(rows, values):
+                row[key] = value
+
         stmt = insert(Activity).values(rows)
         update_cols = {
             col.name: getattr(stmt.excluded, col.name)
@@ -84,7 +103,15 @@ class ActivityDAO:
         stmt = stmt.on_conflict_do_update(index_elements=["activity_id"], set_=update_cols)
 
         result = session.execute(stmt)
+        bump_version(session, athlete_id)
+        if not commit:
+            return result.rowcount
         session.commit()
+        invalidate_athlete(athlete_id)
+        try:
+            update_index(athlete_id, rows)
+        except Exception as e:
+            logger.warning(f"⚠️ Retrieval index update failed for athlete {athlete_id}: {e}")
         return result.rowcount
 
     @staticmethod
@@ -103,3 +130,50 @@ class ActivityDAO:
             .order_by(Activity.start_date.desc())
             .all()
         )
+
+    @staticmethod
+    def get_activities_since(session: Session, athlete_id: int, since: datetime) -> list[Activity]:
+        """
+        An athlete's activities starting at or after `since`, newest first.
+        """
+        return (
+            session.query(Activity)
+            .filter(Activity.athlete_id == athlete_id, Activity.start_date >= since)
+            .order_by(Activity.start_date.desc())
+            .all()
+        )
+
+    @staticmethod
+    def count_by_athlete(session: Session, athlete_id: int) -> int:
+        return session.scalar(select(func.count()).select_from(Activity).where(Activity.athlete_id == athlete_id))
+
+    @staticmethod
+    def get_activities_page(
+        session: Session,
+        athlete_id: int,
+        limit: int,
+        before: Optional[tuple[datetime, int]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> list:
+        """
+        One page of an athlete's activities, newest first, strictly older than
+        the (start_date, activity_id) cursor `before`. Seeks on
+        ix_activities_athlete_start_date_id, so every page costs the same
+        regardless of depth. Rows without a start_date are never listed.
+        Returns row mappings restricted to `columns`.
+        """
+        names = ["activity_id", "start_date"] + [
+            c for c in (columns or LISTABLE_COLUMNS) if c not in ("activity_id", "start_date")
+        ]
+        unknown = set(names) - set(LISTABLE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown activity columns: {sorted(unknown)}")
+
+        # Undated rows can't be ordered against the cursor; upserts require start_date anyway
+        stmt = select(*(getattr(Activity, c) for c in names)).where(
+            Activity.athlete_id == athlete_id, Activity.start_date.isnot(None)
+        )
+        if before is not None:
+            stmt = stmt.where(tuple_(Activity.start_date, Activity.activity_id) < tuple_(*before))
+        stmt = stmt.order_by(Activity.start_date.desc(), Activity.activity_id.desc()).limit(limit)
+        return [row._mapping for row in session.execute(stmt)]
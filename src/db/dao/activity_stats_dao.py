@@ -1,6 +1,8 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from sqlalchemy import func, extract, select
 from src.db.models.activities import Activity
+from src.db.models.training_load import TrainingLoad
+from src.db.models.splits import Split
 from sqlalchemy.orm import Session
 from typing import List, Dict, Optional
 
@@ -157,3 +159,33 @@ class ActivityStatsDAO:
             Activity.start_date >= cutoff
         ).group_by('week').order_by('week')
         return [dict(row._mapping) for row in session.execute(stmt)]
+
+    @staticmethod
+    def get_training_load(session: Session, athlete_id: int, start_date: date, end_date: date) -> List[TrainingLoad]:
+        """
+        Daily CTL/ATL/TSB rows in [start_date, end_date], read by primary key range.
+        """
+        stmt = select(TrainingLoad).where(
+            TrainingLoad.athlete_id == athlete_id,
+            TrainingLoad.day.between(start_date, end_date)
+        ).order_by(TrainingLoad.day)
+        return session.scalars(stmt).all()
+
+    @staticmethod
+    def get_weekly_pace_zone_time(session: Session, athlete_id: int, past_weeks: int = 12, scheme: str = "mi") -> List[Dict]:
+        """
+        Moving seconds per pace zone per week, from one split scheme so time isn't double counted.
+        """
+        cutoff = datetime.utcnow() - timedelta(weeks=past_weeks)
+        week = func.date_trunc('week', Activity.start_date).label('week')
+        stmt = select(
+            week,
+            Split.pace_zone,
+            func.sum(Split.moving_time).label('moving_time')
+        ).join(Split, Split.activity_id == Activity.activity_id).where(
+            Activity.athlete_id == athlete_id,
+            Activity.start_date >= cutoff,
+            Split.scheme == scheme,
+            Split.pace_zone.isnot(None)
+        ).group_by(week, Split.pace_zone).order_by(week, Split.pace_zone)
+        return [dict(row._mapping) for row in session.execute(stmt)]
@@ -69,3 +69,68 @@ def upsert_athlete(
     )
     session.execute(stmt)
     session.commit()
+
+
+def get_hr_zone_settings(session: Session, strava_athlete_id: int) -> tuple[Optional[list], Optional[int]]:
+    """
+    (hr_zone_bounds, max_heartrate) for an athlete; (None, None) if unknown.
+    """
+    row = (
+        session.query(Athlete.hr_zone_bounds, Athlete.max_heartrate)
+        .filter_by(strava_athlete_id=strava_athlete_id)
+        .first()
+    )
+    return (row.hr_zone_bounds, row.max_heartrate) if row else (None, None)
+
+
+HR_ZONE_SETTINGS = ("hr_zone_bounds", "max_heartrate")
+
+
+def set_hr_zone_settings(session: Session, strava_athlete_id: int, settings: dict) -> bool:
+    """
+    Store the HR zone settings present in `settings` (hr_zone_bounds and/or
+    max_heartrate; None clears one), leaving the other untouched.
+    Returns False if the athlete is unknown.
+    """
+    values = {k: v for k, v in settings.items() if k in HR_ZONE_SETTINGS}
+    if not values:
+        raise ValueError(f"Expected at least one of {HR_ZONE_SETTINGS}")
+    updated = (
+        session.query(Athlete)
+        .filter_by(strava_athlete_id=strava_athlete_id)
+        .update(values)
+    )
+    session.commit()
+    return bool(updated)
+
+
+def get_pace_zone_bounds(session: Session, strava_athlete_id: int) -> Optional[list]:
+    """
+    Configured pace zone boundaries (m/s) for an athlete, or None.
+    """
+    row = (
+        session.query(Athlete.pace_zone_bounds)
+        .filter_by(strava_athlete_id=strava_athlete_id)
+        .first()
+    )
+    return row.pace_zone_bounds if row else None
+
+
+def set_pace_zone_bounds(
+    session: Session,
+    strava_athlete_id: int,
+    pace_zone_bounds: Optional[list],
+    commit: bool = True
+) -> bool:
+    """
+    Store (or clear, with None) an athlete's pace zone boundaries. Returns False if the athlete is unknown.
+    Pass commit=False to leave the transaction open.
+    """
+    updated = (
+        session.query(Athlete)
+        .filter_by(strava_athlete_id=strava_athlete_id)
+        .update({"pace_zone_bounds": pace_zone_bounds})
+    )
+    if commit:
+        session.commit()
+    return bool(updated)
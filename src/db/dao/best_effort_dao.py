@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.db.models.best_efforts import BestEffort
+
+
+def upsert_best_efforts(session: Session, efforts: list, commit: bool = True) -> int:
+    """
+    Insert or replace best efforts, keyed on (activity_id, distance).
+    Pass commit=False to leave the transaction open for the caller.
+    """
+    if not efforts:
+        return 0
+
+    # Last one wins: a single INSERT ... ON CONFLICT can't touch a row twice
+    rows = list({(e["activity_id"], e["distance"]): e for e in efforts}.values())
+
+    stmt = insert(BestEffort).values(rows)
+    update_map = {
+        col.name: getattr(stmt.excluded, col.name)
+        for col in BestEffort.__table__.columns
+        if col.name not in ("id", "activity_id", "distance")
+    }
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["activity_id", "distance"],
+        set_=update_map
+    )
+
+    result = session.execute(stmt)
+    if commit:
+        session.commit()
+    return result.rowcount
+
+
+def get_personal_records(session: Session, athlete_id: int) -> list[BestEffort]:
+    """
+    Fastest effort per distance for an athlete, shortest distance first.
+    Served from the (athlete_id, distance, elapsed_time) index.
+    """
+    stmt = (
+        select(BestEffort)
+        .where(BestEffort.athlete_id == athlete_id)
+        .distinct(BestEffort.distance)
+        .order_by(BestEffort.distance, BestEffort.elapsed_time)
+    )
+    return session.scalars(stmt).all()
+
+
+def get_efforts_for_distance(session: Session, athlete_id: int, distance: float, limit: int = 10) -> list[BestEffort]:
+    """
+    An athlete's top efforts over one distance, fastest first.
+    """
+    stmt = (
+        select(BestEffort)
+        .where(BestEffort.athlete_id == athlete_id, BestEffort.distance == distance)
+        .order_by(BestEffort.elapsed_time)
+        .limit(limit)
+    )
+    return session.scalars(stmt).all()
+
+
+def get_recent_best_times(session: Session, athlete_id: int, days: int) -> list[tuple[float, float]]:
+    """
+    (distance, fastest elapsed_time) per distance over the last `days` days.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    stmt = (
+        select(BestEffort.distance, func.min(BestEffort.elapsed_time))
+        .where(BestEffort.athlete_id == athlete_id, BestEffort.start_date >= cutoff)
+        .group_by(BestEffort.distance)
+    )
+    return [(distance, elapsed) for distance, elapsed in session.execute(stmt)]
@@ -0,0 +1,221 @@
+from sqlalchemy import case, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from src.db.models.activities import Activity
+from src.db.models.activity_routes import ActivityRoute
+from src.utils import polyline
+from src.utils.route_fingerprint import fingerprint
+import src.utils.config as config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def build_route(activity_id, athlete_id, latlng) -> dict | None:
+    """
+    activity_routes row for a latlng stream, or None without at least two fixes.
+    """
+    points = [p for p in latlng or [] if p is not None and p[0] is not None and p[1] is not None]
+    if len(points) < 2 or not athlete_id:
+        return None
+    lats = [p[0] for p in points]
+    lngs = [p[1] for p in points]
+    return {
+        "activity_id": activity_id,
+        "athlete_id": athlete_id,
+        "polyline": polyline.encode(points),
+        "point_count": len(points),
+        "min_lat": min(lats),
+        "min_lng": min(lngs),
+        "max_lat": max(lats),
+        "max_lng": max(lngs),
+        **fingerprint_columns(points),
+    }
+
+def fingerprint_columns(latlng) -> dict:
+    """
+    Fingerprint columns; the shape is left empty for routes too short to
+    compare meaningfully, which keeps them out of clustering.
+    """
+    fp = fingerprint(latlng)
+    comparable = fp["distance"] >= config.ROUTE_MIN_DISTANCE
+    return {
+        "distance": fp["distance"],
+        "start_cell": fp["start_cell"],
+        "end_cell": fp["end_cell"],
+        "shape": polyline.encode(fp["shape"]) if comparable else None,
+    }
+
+def upsert_routes(session, routes: list, commit: bool = True) -> int:
+    """
+    Insert or replace routes; pass commit=False to leave the transaction open.
+    A route whose polyline is unchanged keeps its cluster_id and updated_at.
+    """
+    routes = list({r["activity_id"]: r for r in routes if r}.values())
+    if not routes:
+        return 0
+    stmt = insert(ActivityRoute).values(routes)
+    # Re-enrichment re-upserts identical tracks; only a new polyline counts as a change
+    changed = ActivityRoute.polyline.is_distinct_from(stmt.excluded.polyline)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["activity_id"],
+        set_={
+            **{c: getattr(stmt.excluded, c) for c in routes[0] if c != "activity_id"},
+            # A replaced track is re-clustered by the next clustering run
+            "cluster_id": case((changed, None), else_=ActivityRoute.cluster_id),
+            # ON CONFLICT ignores Column.onupdate; heatmap tiles use updated_at
+            # to notice a replaced track
+            "updated_at": case((changed, func.now()), else_=ActivityRoute.updated_at),
+        },
+    )
+    result = session.execute(stmt)
+    if commit:
+        session.commit()
+    logger.debug("Upserted %d routes", len(routes))
+    return result.rowcount
+
+def get_route_versions_in_bbox(session, athlete_id: int, bbox) -> dict[int, int]:
+    """
+    {activity_id: version} of the athlete's routes whose bounding box overlaps
+    (min_lat, min_lng, max_lat, max_lng). The version (updated_at in
+    microseconds) changes whenever a route is re-upserted.
+    """
+    min_lat, min_lng, max_lat, max_lng = bbox
+    rows = session.execute(
+        select(ActivityRoute.activity_id, ActivityRoute.updated_at).where(
+            ActivityRoute.athlete_id == athlete_id,
+            ActivityRoute.min_lat <= max_lat,
+            ActivityRoute.max_lat >= min_lat,
+            ActivityRoute.min_lng <= max_lng,
+            ActivityRoute.max_lng >= min_lng,
+        )
+    )
+    return {
+        activity_id: int(updated_at.timestamp() * 1_000_000) if updated_at else 0
+        for activity_id, updated_at in rows
+    }
+
+def get_polylines(session, activity_ids) -> dict[int, str]:
+    if not activity_ids:
+        return {}
+    rows = session.execute(
+        select(ActivityRoute.activity_id, ActivityRoute.polyline)
+        .where(ActivityRoute.activity_id.in_(list(activity_ids)))
+    )
+    return {activity_id: encoded for activity_id, encoded in rows}
+
+def get_routes_without_fingerprint(session, athlete_id: int) -> list:
+    """
+    (activity_id, polyline) for routes stored before fingerprints existed.
+    """
+    return session.execute(
+        select(ActivityRoute.activity_id, ActivityRoute.polyline)
+        .where(ActivityRoute.athlete_id == athlete_id, ActivityRoute.distance.is_(None))
+    ).all()
+
+def update_route_columns(session, activity_id: int, values: dict):
+    session.execute(update(ActivityRoute).where(ActivityRoute.activity_id == activity_id).values(**values))
+
+def get_comparable_routes(session, athlete_id: int) -> list:
+    """
+    Fingerprints and cluster ids of all the athlete's comparable routes,
+    oldest run first.
+    """
+    return session.execute(
+        select(
+            ActivityRoute.activity_id, ActivityRoute.distance, ActivityRoute.start_cell,
+            ActivityRoute.end_cell, ActivityRoute.shape, ActivityRoute.cluster_id,
+        )
+        .join(Activity, Activity.activity_id == ActivityRoute.activity_id)
+        .where(ActivityRoute.athlete_id == athlete_id, ActivityRoute.shape.isnot(None))
+        .order_by(Activity.start_date, ActivityRoute.activity_id)
+    ).all()
+
+def bulk_assign_clusters(session, assignments: dict, chunk_size: int = 5000) -> int:
+    """
+    Set cluster_id for {activity_id: cluster_id} in one UPDATE ... FROM
+    (VALUES ...) statement per chunk. Does not commit.
+    """
+    items = list(assignments.items())
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        binds = {}
+        rows = []
+        for i, (activity_id, cluster_id) in enumerate(chunk):
+            binds[f"a{i}"], binds[f"c{i}"] = activity_id, cluster_id
+            rows.append(f"(CAST(:a{i} AS BIGINT), CAST(:c{i} AS BIGINT))")
+        session.execute(
+            text(f"""
+                UPDATE activity_routes AS r SET cluster_id = v.cluster_id
+                FROM (VALUES {", ".join(rows)}) AS v(activity_id, cluster_id)
+                WHERE r.activity_id = v.activity_id
+            """),
+            binds,
+        )
+    return len(items)
+
+def get_route_fingerprint(session, athlete_id: int, activity_id: int):
+    return session.execute(
+        select(
+            ActivityRoute.activity_id, ActivityRoute.distance, ActivityRoute.start_cell,
+            ActivityRoute.end_cell, ActivityRoute.shape, ActivityRoute.cluster_id,
+        )
+        .where(ActivityRoute.athlete_id == athlete_id, ActivityRoute.activity_id == activity_id)
+    ).first()
+
+def get_candidate_routes(session, athlete_id: int, cells, min_distance: float, max_distance: float,
+                         exclude_id=None) -> list:
+    """
+    Routes starting in one of `cells` with a length in range: an index range
+    scan on (athlete_id, start_cell, distance).
+    """
+    stmt = (
+        select(ActivityRoute.activity_id, ActivityRoute.shape, ActivityRoute.cluster_id)
+        .where(
+            ActivityRoute.athlete_id == athlete_id,
+            ActivityRoute.start_cell.in_(list(cells)),
+            ActivityRoute.distance.between(min_distance, max_distance),
+            ActivityRoute.shape.isnot(None),
+        )
+    )
+    if exclude_id is not None:
+        stmt = stmt.where(ActivityRoute.activity_id != exclude_id)
+    return session.execute(stmt).all()
+
+RUN_COLUMNS = (
+    Activity.activity_id, Activity.name, Activity.start_date, Activity.distance,
+    Activity.moving_time, Activity.average_speed, Activity.average_heartrate,
+)
+
+def get_runs(session, activity_ids) -> list:
+    if not activity_ids:
+        return []
+    return session.execute(
+        select(*RUN_COLUMNS).where(Activity.activity_id.in_(list(activity_ids)))
+    ).all()
+
+def get_cluster_runs(session, athlete_id: int, cluster_id: int) -> list:
+    return session.execute(
+        select(*RUN_COLUMNS)
+        .join(ActivityRoute, ActivityRoute.activity_id == Activity.activity_id)
+        .where(ActivityRoute.athlete_id == athlete_id, ActivityRoute.cluster_id == cluster_id)
+        .order_by(Activity.start_date)
+    ).all()
+
+def get_cluster_summaries(session, athlete_id: int, min_runs: int = 2) -> list:
+    """
+    One row per cluster with at least `min_runs` runs, most-run first.
+    """
+    return session.execute(
+        select(
+            ActivityRoute.cluster_id,
+            func.count().label("runs"),
+            func.avg(ActivityRoute.distance).label("distance"),
+            func.min(Activity.start_date).label("first_run"),
+            func.max(Activity.start_date).label("last_run"),
+            func.min(Activity.moving_time).label("best_moving_time"),
+        )
+        .join(Activity, Activity.activity_id == ActivityRoute.activity_id)
+        .where(ActivityRoute.athlete_id == athlete_id, ActivityRoute.cluster_id.isnot(None))
+        .group_by(ActivityRoute.cluster_id)
+        .having(func.count() >= min_runs)
+        .order_by(func.count().desc(), func.max(Activity.start_date).desc())
+    ).all()
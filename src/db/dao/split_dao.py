@@ -1,17 +1,23 @@
+from sqlalchemy import text
 from sqlalchemy.dialects.postgresql import insert
 from src.db.models.splits import Split
-from src.utils.conversions import convert_metrics
+from src.utils.conversions import convert_metrics_batch
+from src.utils.logger import get_logger
 
-def upsert_splits(session, splits: list) -> int:
+logger = get_logger(__name__, debug_sample_rate=0.1)
+
+def upsert_splits(session, splits: list, commit: bool = True) -> int:
     """
     Upserts multiple split records into the 'splits' table.
     Applies conversion logic centrally before inserting.
     Ensures 'split' field is consistently a valid integer type.
+    Splits may span several activities and schemes (missing scheme means
+    "mi"); pass commit=False to leave the transaction open for the caller.
     """
     if not splits:
         return 0
 
-    converted = []
+    converted = {}
     for s in splits:
         # Ensure 'split' is a true int, not a bool or invalid type
         split_raw = s.get("split")
@@ -25,17 +31,12 @@ def upsert_splits(session, splits: list) -> int:
                 except (ValueError, TypeError):
                     split_value = None  # fallback for invalid string etc.
 
-        conv_fields = ["distance", "average_speed", "moving_time", "elapsed_time"]
-        conv_data = {
-            "distance": s.get("distance"),
-            "average_speed": s.get("average_speed"),
-            "moving_time": s.get("moving_time"),
-            "elapsed_time": s.get("elapsed_time"),
-        }
-        enriched = convert_metrics(conv_data, conv_fields)
-
-        converted.append({
+        # Keyed on the conflict target: Postgres rejects a single INSERT ... ON
+        # CONFLICT that touches the same row twice, so the last one wins.
+        scheme = s.get("scheme", "mi")
+        converted[(s["activity_id"], scheme, s["lap_index"])] = {
             "activity_id": s["activity_id"],
+            "scheme": scheme,
             "lap_index": s["lap_index"],
             "distance": s["distance"],
             "elapsed_time": s["elapsed_time"],
@@ -47,28 +48,92 @@ def upsert_splits(session, splits: list) -> int:
             "split": split_value,
             "average_heartrate": s.get("average_heartrate"),
             "pace_zone": s.get("pace_zone"),
-            "conv_distance": enriched.get("conv_distance"),
-            "conv_avg_speed": enriched.get("conv_avg_speed"),
-            "conv_moving_time": enriched.get("conv_moving_time"),
-            "conv_elapsed_time": enriched.get("conv_elapsed_time"),
-        })
+        }
+
+    rows = list(converted.values())
 
-    # 🔍 Debug output to verify types
-    print(f"[DAO DEBUG] split values: {[row['split'] for row in converted]} | types: {[type(row['split']) for row in converted]}")
+    # Conversions are applied here, once, for every split in the batch
+    conv = convert_metrics_batch({
+        "distance": [r["distance"] for r in rows],
+        "average_speed": [r["average_speed"] for r in rows],
+        "moving_time": [r["moving_time"] for r in rows],
+        "elapsed_time": [r["elapsed_time"] for r in rows],
+    }, ["distance", "average_speed", "moving_time", "elapsed_time"])
+    for key, values in conv.items():
+        for row, value in zip(rows, values):
+            row[key] = value
+    logger.debug("Upserting %d splits for %d activities", len(rows), len({r["activity_id"] for r in rows}))
 
-    stmt = insert(Split).values(converted)
+    stmt = insert(Split).values(rows)
 
     update_map = {
         col.name: getattr(stmt.excluded, col.name)
         for col in Split.__table__.columns
-        if col.name not in ("activity_id", "lap_index")
+        if col.name not in ("activity_id", "scheme", "lap_index")
     }
 
     stmt = stmt.on_conflict_do_update(
-        index_elements=["activity_id", "lap_index"],
+        index_elements=["activity_id", "scheme", "lap_index"],
         set_=update_map
     )
 
     result = session.execute(stmt)
-    session.commit()
+    if commit:
+        session.commit()
+    return result.rowcount
+
+
+# Same speed as src.utils.pace_zones.split_speed: moving speed, else stream average
+SPLIT_SPEED_SQL = """
+    CASE WHEN s.distance > 0 AND s.moving_time > 0
+         THEN s.distance / s.moving_time
+         ELSE s.average_speed END
+"""
+
+
+def bulk_assign_pace_zones(session, athlete_id: int, bounds: list, commit: bool = True) -> int:
+    """
+    Classify every split for an athlete in one set-based UPDATE.
+    `bounds` are the lower speed edges (m/s) of zones 2-5.
+    """
+    result = session.execute(
+        text(f"""
+            UPDATE splits AS s SET pace_zone = CASE
+                WHEN v.speed IS NULL OR v.speed <= 0 THEN NULL
+                WHEN v.speed >= :b4 THEN 5
+                WHEN v.speed >= :b3 THEN 4
+                WHEN v.speed >= :b2 THEN 3
+                WHEN v.speed >= :b1 THEN 2
+                ELSE 1 END
+            FROM (
+                SELECT s.id, {SPLIT_SPEED_SQL} AS speed
+                FROM splits AS s
+                JOIN activities AS a ON a.activity_id = s.activity_id
+                WHERE a.athlete_id = :athlete_id
+            ) AS v
+            WHERE s.id = v.id
+        """),
+        {"athlete_id": athlete_id, "b1": bounds[0], "b2": bounds[1], "b3": bounds[2], "b4": bounds[3]}
+    )
+    if commit:
+        session.commit()
     return result.rowcount
+
+
+def get_activity_splits(session, athlete_id: int, activity_id: int, scheme: str = "mi") -> list[dict]:
+    """
+    Splits of one activity in lap order; empty if the activity isn't the athlete's.
+    """
+    result = session.execute(
+        text("""
+            SELECT s.lap_index, s.distance, s.elapsed_time, s.moving_time, s.average_speed,
+                   s.max_speed, s.average_heartrate, s.pace_zone,
+                   s.conv_distance, s.conv_avg_speed, s.conv_moving_time, s.conv_elapsed_time
+            FROM splits AS s
+            JOIN activities AS a ON a.activity_id = s.activity_id
+            WHERE s.activity_id = :activity_id AND a.athlete_id = :athlete_id AND s.scheme = :scheme
+            ORDER BY s.lap_index
+        """),
+        {"activity_id": activity_id, "athlete_id": athlete_id, "scheme": scheme}
+    )
+    return [dict(row._mapping) for row in result]
@@ -0,0 +1,44 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.db.models.training_load import TrainingLoad
+
+
+def get_day_before(session: Session, athlete_id: int, day: date) -> Optional[TrainingLoad]:
+    """
+    Latest stored day strictly before `day`, used to seed a recomputation.
+    """
+    stmt = (
+        select(TrainingLoad)
+        .where(TrainingLoad.athlete_id == athlete_id, TrainingLoad.day < day)
+        .order_by(TrainingLoad.day.desc())
+        .limit(1)
+    )
+    return session.scalar(stmt)
+
+
+def upsert_training_load(session: Session, athlete_id: int, days: list, commit: bool = True) -> int:
+    """
+    Insert or overwrite daily rows from a list of LoadDay.
+    """
+    if not days:
+        return 0
+
+    rows = [
+        {"athlete_id": athlete_id, "day": d.day, "load": d.load, "ctl": d.ctl, "atl": d.atl, "tsb": d.tsb}
+        for d in days
+    ]
+    stmt = insert(TrainingLoad).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["athlete_id", "day"],
+        set_={col: getattr(stmt.excluded, col) for col in ("load", "ctl", "atl", "tsb")}
+    )
+
+    result = session.execute(stmt)
+    if commit:
+        session.commit()
+    return result.rowcount
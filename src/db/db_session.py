@@ -1,24 +1,59 @@
+import threading
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 import src.utils.config as config
+from src.utils.metrics import instrument_engine
 
 # Global declarative base — shared across models
 Base = declarative_base()
 
+# One engine (and so one connection pool) per URL per process
+_engines = {}
+_engines_lock = threading.Lock()
+
 def get_engine(db_url=None):
     """
-    Create a SQLAlchemy engine.
+    Return the process-wide SQLAlchemy engine for a URL, creating it on first use.
     Allows optional db_url override for tests or special cases.
+    Pool size is DB_POOL_SIZE + DB_MAX_OVERFLOW connections per process;
+    checkouts wait at most DB_POOL_TIMEOUT and new Postgres connections
+    DB_CONNECT_TIMEOUT seconds.
     """
     db_url = db_url or config.DATABASE_URL
     if not db_url:
         raise RuntimeError("DATABASE_URL is not set in configuration.")
-    return create_engine(db_url, echo=False, future=True)
+    engine = _engines.get(db_url)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(db_url)
+            if engine is None:
+                kwargs = {"echo": False, "future": True, "pool_pre_ping": True}
+                if not db_url.startswith("sqlite"):
+                    kwargs.update(
+                        pool_size=config.DB_POOL_SIZE,
+                        max_overflow=config.DB_MAX_OVERFLOW,
+                        pool_timeout=config.DB_POOL_TIMEOUT,
+                    )
+                if db_url.startswith("postgres"):
+                    # Bounds how long an unreachable database can hold up a request or probe
+                    kwargs["connect_args"] = {"connect_timeout": config.DB_CONNECT_TIMEOUT}
+                engine = instrument_engine(create_engine(db_url, **kwargs))
+                _engines[db_url] = engine
+    return engine
+
+def dispose_engines():
+    """
+    Drop pooled connections inherited from a parent process. Call after fork
+    (gunicorn post_fork) so workers never share a socket with the master.
+    """
+    for engine in list(_engines.values()):
+        engine.dispose(close=False)
 
 def get_session(engine=None):
     """
-    Create a new SQLAlchemy sessionmaker (not a global session).
+    Create a new SQLAlchemy session on the shared engine (not a global session).
     Allows optional engine injection for test harnesses.
     """
     engine = engine or get_engine()
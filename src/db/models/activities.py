@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Integer, String, Float, DateTime
+from sqlalchemy import Column, BigInteger, Integer, String, Float, DateTime, Index
 from src.db.db_session import Base
 
 class Activity(Base):
@@ -37,3 +37,6 @@ class Activity(Base):
     hr_zone_4 = Column(Float, nullable=True)
     hr_zone_5 = Column(Float, nullable=True)
 
+    __table_args__ = (
+        Index("ix_activities_athlete_start_date_id", "athlete_id", "start_date", "activity_id"),
+    )
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, BigInteger, Integer, Float, String, Text, ForeignKey, TIMESTAMP, Index
+from sqlalchemy.sql import func
+from src.db.db_session import Base
+
+
+class ActivityRoute(Base):
+    """
+    An activity's GPS track as an encoded polyline, with its bounding box so
+    map tiles can select the routes that cross them, and a fingerprint
+    (start/finish geohash cells, length, resampled shape) for matching runs
+    on the same course. cluster_id is the activity_id of the first run of
+    the course; NULL until the clustering job has seen the route.
+    """
+    __tablename__ = "activity_routes"
+
+    activity_id = Column(BigInteger, ForeignKey("activities.activity_id", ondelete="CASCADE"), primary_key=True)
+    athlete_id = Column(BigInteger, nullable=False)
+    polyline = Column(Text, nullable=False)
+    point_count = Column(Integer, nullable=False)
+    min_lat = Column(Float, nullable=False)
+    min_lng = Column(Float, nullable=False)
+    max_lat = Column(Float, nullable=False)
+    max_lng = Column(Float, nullable=False)
+    distance = Column(Float)
+    start_cell = Column(String(12))
+    end_cell = Column(String(12))
+    shape = Column(Text)  # encoded polyline of ROUTE_SHAPE_POINTS points
+    cluster_id = Column(BigInteger)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_activity_routes_athlete_bbox", "athlete_id", "min_lat", "max_lat", "min_lng", "max_lng"),
+        # Candidate lookup for similar runs: start cell, then length range
+        Index("ix_activity_routes_athlete_start_cell_distance", "athlete_id", "start_cell", "distance"),
+        Index("ix_activity_routes_athlete_cluster", "athlete_id", "cluster_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, String, DateTime, func
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, JSON, func
 from src.db.db_session import Base
 
 class Athlete(Base):
@@ -9,3 +9,6 @@ class Athlete(Base):
     name = Column(String, nullable=True)
     email = Column(String, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
+    max_heartrate = Column(Integer, nullable=True)
+    hr_zone_bounds = Column(JSON, nullable=True)  # lower edges of zones 2-5, bpm
+    pace_zone_bounds = Column(JSON, nullable=True)  # lower edges of zones 2-5, m/s
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from src.db.db_session import Base
+
+
+class BestEffort(Base):
+    """
+    Fastest time over a standard distance within one activity.
+    """
+    __tablename__ = "best_efforts"
+
+    id = Column(Integer, primary_key=True)
+    athlete_id = Column(BigInteger, nullable=False)
+    activity_id = Column(BigInteger, ForeignKey("activities.activity_id", ondelete="CASCADE"), nullable=False)
+    name = Column(String, nullable=False)
+    distance = Column(Float, nullable=False)      # meters
+    elapsed_time = Column(Float, nullable=False)  # seconds
+    start_index = Column(Integer)
+    end_index = Column(Integer)
+    start_date = Column(DateTime)
+
+    __table_args__ = (
+        UniqueConstraint("activity_id", "distance", name="uq_best_effort_activity_distance"),
+        Index("ix_best_efforts_athlete_distance_time", "athlete_id", "distance", "elapsed_time"),
+    )
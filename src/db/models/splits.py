@@ -8,6 +8,7 @@ from sqlalchemy import (
     String,
     UniqueConstraint,
     Boolean,  # ✅ Added Boolean
+    Index,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import insert
@@ -19,6 +20,7 @@ class Split(Base):
 
     id = Column(Integer, primary_key=True)
     activity_id = Column(BigInteger, ForeignKey("activities.activity_id", ondelete="CASCADE"), nullable=False)
+    scheme = Column(String, nullable=False, server_default="mi")  # "km", "mi" or custom e.g. "400m"
     lap_index = Column(Integer, nullable=False)
     distance = Column(Float)
     elapsed_time = Column(Integer)
@@ -37,7 +39,9 @@ class Split(Base):
     conv_elapsed_time = Column(String)
 
     __table_args__ = (
-        UniqueConstraint("activity_id", "lap_index", name="uq_activity_lap"),
+        UniqueConstraint("activity_id", "scheme", "lap_index", name="uq_activity_scheme_lap"),
+        # Covers "time in pace zone per week" without touching the heap
+        Index("ix_splits_activity_scheme_zone", "activity_id", "scheme", "pace_zone", "moving_time"),
     )
 
 
@@ -53,7 +57,7 @@ def upsert_splits(session, splits_data: list[dict]):
     }
 
     stmt = stmt.on_conflict_do_update(
-        constraint="uq_activity_lap",
+        constraint="uq_activity_scheme_lap",
         set_=update_cols
     )
 
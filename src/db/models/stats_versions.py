@@ -0,0 +1,14 @@
+from sqlalchemy import Column, BigInteger, DateTime
+from src.db.db_session import Base
+
+
+class StatsVersion(Base):
+    """
+    Per-athlete data version; bumped whenever activities change so cached
+    /stats responses keyed on an older version are never served.
+    """
+    __tablename__ = "stats_versions"
+
+    athlete_id = Column(BigInteger, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True))  # served as Last-Modified
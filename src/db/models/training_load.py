@@ -0,0 +1,16 @@
+from sqlalchemy import Column, BigInteger, Float, Date
+from src.db.db_session import Base
+
+
+class TrainingLoad(Base):
+    """
+    Daily training load with fitness (CTL), fatigue (ATL) and form (TSB).
+    """
+    __tablename__ = "training_load"
+
+    athlete_id = Column(BigInteger, primary_key=True)
+    day = Column(Date, primary_key=True)
+    load = Column(Float, nullable=False, default=0.0)
+    ctl = Column(Float, nullable=False)
+    atl = Column(Float, nullable=False)
+    tsb = Column(Float, nullable=False)
@@ -0,0 +1,91 @@
+# src/routes/activity_list_routes.py
+
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request
+from src.db.db_session import get_session
+from src.db.dao.activity_dao import ActivityDAO
+from src.db.dao.split_dao import get_activity_splits
+from src.utils.conditional import athlete_from_path, athlete_from_query, conditional_athlete_get
+
+activity_list_bp = Blueprint("activity_list", __name__)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def parse_cursor(value: str) -> tuple[datetime, int]:
+    """
+    "<start_date ISO>,<activity_id>" -> (datetime, int).
+    """
+    start_date, _, activity_id = value.rpartition(",")
+    # An unencoded "+00:00" offset arrives as " 00:00"
+    return datetime.fromisoformat(start_date.replace(" ", "+")), int(activity_id)
+
+
+def format_cursor(row) -> str | None:
+    if row["start_date"] is None:
+        return None
+    return f"{row['start_date'].isoformat()},{row['activity_id']}"
+
+
+def _serialize(row) -> dict:
+    return {k: v.isoformat() if isinstance(v, datetime) else v for k, v in row.items()}
+
+
+@activity_list_bp.route("/activities", methods=["GET"])
+@conditional_athlete_get(athlete_from_query)
+def list_activities():
+    """
+    Newest-first activity listing with keyset pagination.
+    Query params: athlete_id (required), before (cursor from next_before),
+    limit (default 50, max 200), fields (comma-separated columns).
+    """
+    athlete_id = request.args.get("athlete_id", type=int)
+    if athlete_id is None:
+        return jsonify({"error": "athlete_id is required"}), 400
+    limit = request.args.get("limit", default=DEFAULT_LIMIT, type=int)
+    if not limit or not 1 <= limit <= MAX_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {MAX_LIMIT}"}), 400
+    try:
+        before = parse_cursor(request.args["before"]) if "before" in request.args else None
+    except ValueError:
+        return jsonify({"error": "before must be '<start_date>,<activity_id>'"}), 400
+    fields = request.args.get("fields")
+    columns = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+    session = get_session()
+    try:
+        # One extra row tells us whether another page exists without a COUNT
+        rows = ActivityDAO.get_activities_page(session, athlete_id, limit + 1, before, columns)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        session.close()
+
+    page = rows[:limit]
+    return jsonify({
+        "athlete_id": athlete_id,
+        "activities": [_serialize(r) for r in page],
+        "next_before": format_cursor(page[-1]) if len(rows) > limit else None,
+    }), 200
+
+
+@activity_list_bp.route("/athletes/<int:athlete_id>/activities/<int:activity_id>/splits", methods=["GET"])
+@conditional_athlete_get(athlete_from_path)
+def activity_splits(athlete_id, activity_id):
+    """
+    Splits for one of the athlete's activities. Query param: scheme (default "mi").
+    """
+    scheme = request.args.get("scheme", default="mi")
+    session = get_session()
+    try:
+        splits = get_activity_splits(session, athlete_id, activity_id, scheme)
+    finally:
+        session.close()
+    return jsonify({
+        "athlete_id": athlete_id,
+        "activity_id": activity_id,
+        "scheme": scheme,
+        "splits": splits,
+    }), 200
@@ -1,77 +1,224 @@
-from flask import Blueprint, request, jsonify
-from src.utils.gpt_ops import format_prompt, get_gpt_response
+import json
+from datetime import date, datetime, time, timedelta
+
+from flask import Blueprint, Response, request, jsonify
+import src.utils.config as config
+from src.utils.gpt_ops import get_gpt_response, stream_gpt_response
+from src.utils.prompt_context import build_prompt, load_aggregates
+from src.utils import activity_index
 from src.db.db_session import get_session
 from src.db.dao.activity_dao import ActivityDAO
-from datetime import datetime, timedelta
+from src.utils.ask_cache import ask_cache, normalise_question, context_hash
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
 
 ask_bp = Blueprint('ask', __name__)
 
-@ask_bp.route('/ask', methods=['POST'])
-def ask():
+
+def _parse_ask_request():
+    """
+    Validate the /ask JSON body.
+    Returns (sanitized_question, athlete_id, None) or (None, None, error_response).
+    """
     if not request.is_json:
-        print("Error: Content-Type is not JSON")
-        return jsonify({"error": "Request content-type must be application/json"}), 400
+        log.warning("⚠️ /ask rejected: Content-Type is not JSON")
+        return None, None, (jsonify({"error": "Request content-type must be application/json"}), 400)
 
     data = request.get_json()
-    print(f"Received data: {data}")
 
     if not data:
-        print("Error: Missing JSON payload")
-        return jsonify({"error": "Missing JSON payload"}), 400
+        log.warning("⚠️ /ask rejected: missing JSON payload")
+        return None, None, (jsonify({"error": "Missing JSON payload"}), 400)
 
     question = data.get("question")
     athlete_id = data.get("athlete_id")
 
     if not isinstance(question, str) or not question.strip():
-        print("Error: Invalid or missing 'question'")
-        return jsonify({"error": "Invalid or missing 'question'"}), 400
+        log.warning("⚠️ /ask rejected: invalid or missing 'question'")
+        return None, None, (jsonify({"error": "Invalid or missing 'question'"}), 400)
 
     try:
         athlete_id = int(athlete_id)
         if athlete_id <= 0:
             raise ValueError
     except (ValueError, TypeError):
-        print("Error: Invalid or missing 'athlete_id'")
-        return jsonify({"error": "Invalid or missing 'athlete_id' (must be a positive integer)"}), 400
+        log.warning("⚠️ /ask rejected: invalid or missing 'athlete_id'")
+        return None, None, (jsonify({"error": "Invalid or missing 'athlete_id' (must be a positive integer)"}), 400)
 
-    sanitized_question = " ".join(question.strip().split())
+    return " ".join(question.strip().split()), athlete_id, None
 
-    
-    from datetime import date, timedelta
-    # Get start of current week (Monday)
+
+def _load_activity_context(athlete_id, question):
+    """
+    Activities from the start of the current week (Monday) through today,
+    plus the history entries most relevant to the question from the
+    retrieval index, in the shape build_prompt expects. The full history is
+    only read when the index needs (re)building.
+    Returns (activity_data, retrieved_weeks).
+    """
     today = date.today()
     start_date = today - timedelta(days=today.weekday())
 
     session = get_session()
     try:
-        activities = ActivityDAO.get_activities_by_athlete(session, athlete_id)
-        filtered = [
-            a for a in activities
-            if a.start_date and start_date <= a.start_date.date() <= today
-        ]
-
+        activities = ActivityDAO.get_activities_since(session, athlete_id, datetime.combine(start_date, time.min))
         activity_data = [
             {
-                "start_date": a.start_date.strftime("%Y-%m-%d %H:%M:%S"),
-                "conv_distance": round(a.conv_distance, 2),
-                "duration": f"{round(a.moving_time / 60)} minutes"
+                "activity_id": a.activity_id,
+                "date": a.start_date.strftime("%Y-%m-%d %H:%M:%S"),
+                "distance_km": round((a.distance or 0) / 1000, 2),
+                "duration_min": round((a.moving_time or 0) / 60),
+                "name": a.name,
+                "type": a.type,
             }
-            for a in filtered
+            for a in activities
+            if a.start_date.date() <= today
         ]
+
+        retrieved_weeks = []
+        seen = {a["activity_id"] for a in activity_data}
+        hits = activity_index.search(
+            athlete_id, question,
+            ActivityDAO.count_by_athlete(session, athlete_id),
+            lambda: ActivityDAO.get_activities_by_athlete(session, athlete_id),
+        )
+        for hit in hits:
+            kind = hit.pop("kind")
+            hit.pop("score")
+            if kind == "week":
+                retrieved_weeks.append(hit)
+            elif hit["activity_id"] not in seen:
+                activity_data.append(hit)
+        return activity_data, retrieved_weeks
     finally:
         session.close()
 
-    print(f"Activity data: {activity_data}")
 
-    prompt = format_prompt(sanitized_question, activity_data)
-    print(f"Generated prompt: {prompt}")
+def _load_prompt_aggregates(athlete_id):
+    """
+    Weekly totals, HR zones and longest/fastest runs for the prompt summary.
+    Best-effort: /ask still answers from raw activities if these queries fail.
+    """
+    session = get_session()
+    try:
+        return load_aggregates(session, athlete_id, days=config.ASK_CONTEXT_DAYS)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        log.warning("⚠️ Prompt aggregates unavailable for athlete %s: %s", athlete_id, e)
+        return None
+    finally:
+        session.close()
 
-    gpt_response = get_gpt_response(prompt)
-    print(f"Full GPT Response: {gpt_response}")
+
+def _build_prompt(question, activity_data, retrieved_weeks, aggregates):
+    aggregates = dict(aggregates or {})
+    if retrieved_weeks:
+        recent = {(int(w["year"]), int(w["week"])) for w in aggregates.get("weekly") or []}
+        aggregates["weekly"] = list(aggregates.get("weekly") or []) + [
+            w for w in retrieved_weeks if (w["year"], w["week"]) not in recent
+        ]
+    context = build_prompt(question, activity_data, aggregates)
+    log.info(
+        "🧾 Prompt context: %d tokens, %d activities included, %d omitted",
+        context.tokens, context.activities_included, context.activities_omitted,
+    )
+    return context
+
+
+@ask_bp.route('/ask', methods=['POST'])
+def ask():
+    sanitized_question, athlete_id, error = _parse_ask_request()
+    if error:
+        return error
+
+    activity_data, retrieved_weeks = _load_activity_context(athlete_id, sanitized_question)
+    log.debug("📥 /ask for athlete %s: %d activities, %d retrieved weeks",
+              athlete_id, len(activity_data), len(retrieved_weeks))
+    aggregates = _load_prompt_aggregates(athlete_id)
+
+    cache_question = normalise_question(sanitized_question)
+    # Everything the prompt is built from, so new zones or PRs change the key
+    ctx_hash = context_hash([activity_data, retrieved_weeks, aggregates])
+    cached = ask_cache.get(athlete_id, cache_question, ctx_hash)
+    if cached is not None:
+        return jsonify({
+            "message": "✅ GPT response generated",
+            "athlete_id": athlete_id,
+            "question": sanitized_question,
+            "response": cached,
+            "cached": True
+        }), 200
+
+    context = _build_prompt(sanitized_question, activity_data, retrieved_weeks, aggregates)
+
+    gpt_response = get_gpt_response(context.prompt)
+    log.debug("🤖 GPT response for athlete %s: %d chars", athlete_id, len(gpt_response))
+
+    if gpt_response and not gpt_response.startswith("❌"):
+        ask_cache.put(athlete_id, cache_question, ctx_hash, gpt_response)
 
     return jsonify({
         "message": "✅ GPT response generated",
         "athlete_id": athlete_id,
         "question": sanitized_question,
-        "response": gpt_response
+        "response": gpt_response,
+        "cached": False,
+        "prompt_tokens": context.tokens
     }), 200
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@ask_bp.route('/ask/stream', methods=['POST'])
+def ask_stream():
+    """
+    Server-Sent Events variant of /ask. Emits `token` events as the model
+    generates, then a single `done` event with the full response (or `error`).
+    Closing the connection closes the upstream completion stream.
+    """
+    sanitized_question, athlete_id, error = _parse_ask_request()
+    if error:
+        return error
+
+    activity_data, retrieved_weeks = _load_activity_context(athlete_id, sanitized_question)
+    aggregates = _load_prompt_aggregates(athlete_id)
+    cache_question = normalise_question(sanitized_question)
+    ctx_hash = context_hash([activity_data, retrieved_weeks, aggregates])
+    cached = ask_cache.get(athlete_id, cache_question, ctx_hash)
+    context = None if cached is not None else _build_prompt(sanitized_question, activity_data, retrieved_weeks, aggregates)
+
+    def generate():
+        if cached is not None:
+            yield _sse("token", {"token": cached})
+            yield _sse("done", {"response": cached, "cached": True})
+            return
+
+        parts = []
+        tokens = stream_gpt_response(context.prompt)
+        try:
+            for token in tokens:
+                parts.append(token)
+                yield _sse("token", {"token": token})
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log.exception("❌ GPT streaming failed for athlete %s: %s", athlete_id, e)
+            yield _sse("error", {"error": f"❌ GPT error: {e}"})
+            return
+        finally:
+            # Runs on client disconnect too (GeneratorExit), releasing the upstream stream
+            tokens.close()
+
+        full = "".join(parts).strip()
+        if not full:
+            log.warning("⚠️ GPT stream for athlete %s ended without content", athlete_id)
+            yield _sse("error", {"error": "❌ GPT error: empty response"})
+            return
+        ask_cache.put(athlete_id, cache_question, ctx_hash, full)
+        yield _sse("done", {"response": full, "cached": False, "prompt_tokens": context.tokens})
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,31 @@
+# src/routes/export_routes.py
+
+from flask import Blueprint, Response, jsonify, request
+from src.db.db_session import get_session
+from src.services.export_service import EXPORT_FORMATS, parquet_available, stream_export
+
+export_bp = Blueprint("export", __name__)
+
+
+@export_bp.route("/export/<int:athlete_id>", methods=["GET"])
+def export_athlete(athlete_id):
+    """
+    Stream every activity and split for an athlete as CSV, NDJSON or Parquet.
+    Sent with chunked encoding as rows are read; `scheme` limits the splits.
+    """
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    if fmt == "parquet" and not parquet_available():
+        return jsonify({"error": "parquet export requires the pyarrow package"}), 400
+    scheme = request.args.get("scheme") or None
+
+    return Response(
+        stream_export(get_session, athlete_id, fmt, scheme),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="athlete_{athlete_id}.{fmt}"',
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no",
+        },
+    )
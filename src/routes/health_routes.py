@@ -1,16 +1,129 @@
 # src/routes/health_routes.py
+"""
+/livez answers from memory: the process is up and serving requests.
+/readyz checks the database on the pooled engine, within READYZ_TIMEOUT_MS,
+and caches the result for READYZ_CACHE_SECONDS so frequent platform probes
+cost at most one pooled query per worker per window. While a check is in
+flight, other probes get the previous result rather than waiting on it.
+"""
+
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
 
 from flask import Blueprint, jsonify
 from sqlalchemy import text
-from src.db.db_session import get_session
+from src.db.db_session import get_engine, get_session
+import src.utils.config as config
 
 health_bp = Blueprint("health", __name__)
 
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+_ready_lock = threading.Lock()
+# (checked_at, body, status), replaced as a whole so readers never see a mix
+_ready_cache = {"result": None}
+
 @health_bp.route("/health", methods=["GET"])
 def health_check():
+    session = None
     try:
         session = get_session()
         session.execute(text("SELECT 1"))
         return jsonify({"status": "ok", "db": "connected"}), 200
     except Exception as e:
         return jsonify({"status": "error", "db": "disconnected", "error": str(e)}), 500
+    finally:
+        if session is not None:
+            session.close()
+
+@health_bp.route("/livez", methods=["GET"])
+def livez():
+    return jsonify({"status": "ok"}), 200
+
+@health_bp.route("/readyz", methods=["GET"])
+def readyz():
+    result = _fresh_readiness()
+    if result is None:
+        # One probe per worker checks the database; while it runs, others
+        # answer from the previous result instead of queueing behind it
+        if _ready_lock.acquire(blocking=_ready_cache["result"] is None):
+            try:
+                result = _fresh_readiness()
+                if result is None:
+                    body, status = check_readiness(get_engine())
+                    result = _ready_cache["result"] = (time.monotonic(), body, status)
+            finally:
+                _ready_lock.release()
+        else:
+            result = _ready_cache["result"]
+    at, body, status = result
+    return jsonify({**body, "age_seconds": round(time.monotonic() - at, 3)}), status
+
+def _fresh_readiness():
+    result = _ready_cache["result"]
+    if result is None or time.monotonic() - result[0] >= config.READYZ_CACHE_SECONDS:
+        return None
+    return result
+
+def pool_stats(engine) -> dict:
+    """
+    Checked-out connections against the pool's capacity (size + overflow).
+    """
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"checked_out": None, "capacity": None, "saturation": None}
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else None,
+    }
+
+@lru_cache(maxsize=1)
+def migration_head():
+    try:
+        from alembic.config import Config
+        from alembic.script import ScriptDirectory
+        cfg = Config()
+        cfg.set_main_option("script_location", str(ALEMBIC_DIR))
+        return ScriptDirectory.from_config(cfg).get_current_head()
+    except Exception:
+        return None
+
+def _set_statement_timeout(engine, conn):
+    if engine.dialect.name == "postgresql":
+        conn.execute(text(f"SET LOCAL statement_timeout = {int(config.READYZ_TIMEOUT_MS)}"))
+
+def check_readiness(engine) -> tuple[dict, int]:
+    pool = pool_stats(engine)
+    body = {"status": "ok", "db": "connected", "pool": pool, "migration": None}
+
+    # A saturated pool would block the probe for the full checkout timeout
+    if pool["capacity"] and pool["checked_out"] >= pool["capacity"]:
+        return {**body, "status": "error", "db": "pool saturated"}, 503
+
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            _set_statement_timeout(engine, conn)
+            try:
+                current = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+            except Exception:
+                # The rollback ends the transaction SET LOCAL applied to
+                conn.rollback()
+                _set_statement_timeout(engine, conn)
+                conn.execute(text("SELECT 1"))
+                current = None
+    except Exception as e:
+        return {**body, "status": "error", "db": "disconnected", "error": str(e)}, 503
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    head = migration_head()
+    body["latency_ms"] = round(elapsed_ms, 1)
+    body["migration"] = {"current": current, "head": head, "up_to_date": head is not None and current == head}
+    if elapsed_ms > config.READYZ_TIMEOUT_MS:
+        return {**body, "status": "error", "db": "slow"}, 503
+    return body, 200
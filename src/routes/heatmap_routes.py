@@ -0,0 +1,31 @@
+# src/routes/heatmap_routes.py
+
+from flask import Blueprint, Response, jsonify
+from src.db.db_session import get_session
+from src.db.dao.route_dao import get_polylines, get_route_versions_in_bbox
+from src.utils import heatmap
+from src.utils.conditional import athlete_from_path, conditional_athlete_get
+import src.utils.config as config
+
+heatmap_bp = Blueprint("heatmap", __name__)
+
+
+@heatmap_bp.route("/tiles/<int:athlete_id>/<int:z>/<int:x>/<int:y>", methods=["GET"])
+@heatmap_bp.route("/tiles/<int:athlete_id>/<int:z>/<int:x>/<int:y>.png", methods=["GET"])
+@conditional_athlete_get(athlete_from_path)
+def heatmap_tile(athlete_id, z, x, y):
+    """
+    PNG heatmap tile of the athlete's routes; transparent where none pass.
+    """
+    if not config.HEATMAP_MIN_ZOOM <= z <= config.HEATMAP_MAX_ZOOM:
+        return jsonify({"error": f"zoom must be between {config.HEATMAP_MIN_ZOOM} and {config.HEATMAP_MAX_ZOOM}"}), 404
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return jsonify({"error": "tile out of range"}), 404
+
+    session = get_session()
+    try:
+        routes = get_route_versions_in_bbox(session, athlete_id, heatmap.tile_bbox(z, x, y))
+        tile = heatmap.get_tile(athlete_id, z, x, y, routes, lambda ids: get_polylines(session, ids))
+    finally:
+        session.close()
+    return Response(tile.png, mimetype="image/png")
@@ -0,0 +1,64 @@
+# src/routes/hr_zone_routes.py
+
+from flask import Blueprint, jsonify, request
+from src.db.db_session import get_session
+from src.db.dao.athlete_dao import HR_ZONE_SETTINGS, get_hr_zone_settings, set_hr_zone_settings
+from src.utils.hr_zones import resolve_bounds, validate_bounds
+from src.utils.jwt_utils import require_auth
+
+hr_zone_bp = Blueprint("hr_zones", __name__)
+
+
+@hr_zone_bp.route("/athletes/<int:athlete_id>/hr-zones", methods=["GET"])
+def get_hr_zones(athlete_id):
+    """
+    Stored settings plus the boundaries enrichment will actually use.
+    """
+    session = get_session()
+    try:
+        bounds, max_hr = get_hr_zone_settings(session, athlete_id)
+        return jsonify({
+            "athlete_id": athlete_id,
+            "hr_zone_bounds": bounds,
+            "max_heartrate": max_hr,
+            "effective_bounds": resolve_bounds(bounds, max_hr),
+        }), 200
+    finally:
+        session.close()
+
+
+@hr_zone_bp.route("/athletes/<int:athlete_id>/hr-zones", methods=["PUT"])
+@require_auth
+def put_hr_zones(athlete_id):
+    """
+    Body: {"hr_zone_bounds": [z2, z3, z4, z5]} and/or {"max_heartrate": bpm}.
+    Only the fields present are changed; null clears one.
+    Applies to activities enriched from now on.
+    """
+    data = request.get_json(silent=True) or {}
+    settings = {k: data[k] for k in HR_ZONE_SETTINGS if k in data}
+    if not settings:
+        return jsonify({"error": "hr_zone_bounds or max_heartrate is required"}), 400
+    try:
+        if settings.get("hr_zone_bounds") is not None:
+            settings["hr_zone_bounds"] = validate_bounds(settings["hr_zone_bounds"])
+        if settings.get("max_heartrate") is not None:
+            settings["max_heartrate"] = int(settings["max_heartrate"])
+            if not 100 <= settings["max_heartrate"] <= 250:
+                raise ValueError("max_heartrate must be between 100 and 250")
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    session = get_session()
+    try:
+        if not set_hr_zone_settings(session, athlete_id, settings):
+            return jsonify({"error": f"Athlete {athlete_id} not found"}), 404
+        bounds, max_hr = get_hr_zone_settings(session, athlete_id)
+        return jsonify({
+            "athlete_id": athlete_id,
+            "hr_zone_bounds": bounds,
+            "max_heartrate": max_hr,
+            "effective_bounds": resolve_bounds(bounds, max_hr),
+        }), 200
+    finally:
+        session.close()
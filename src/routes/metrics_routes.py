@@ -0,0 +1,11 @@
+# src/routes/metrics_routes.py
+
+from flask import Blueprint, Response
+from src.utils.metrics import render_latest
+
+metrics_bp = Blueprint("metrics", __name__)
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    body, content_type = render_latest()
+    return Response(body, content_type=content_type)
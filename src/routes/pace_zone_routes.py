@@ -0,0 +1,101 @@
+# src/routes/pace_zone_routes.py
+
+from flask import Blueprint, jsonify, request
+from src.db.db_session import get_session
+from src.db.dao.activity_stats_dao import ActivityStatsDAO
+from src.db.dao.athlete_dao import get_pace_zone_bounds, set_pace_zone_bounds
+from src.db.dao.split_dao import bulk_assign_pace_zones
+from src.services.activity_service import resolve_pace_zone_bounds, parse_split_schemes
+from src.utils.pace_zones import validate_bounds
+from src.utils.conditional import athlete_from_path, conditional_athlete_get
+from src.utils.jwt_utils import require_auth
+from src.utils.stats_cache import bump_version
+
+pace_zone_bp = Blueprint("pace_zones", __name__)
+
+MAX_WEEKS = 104
+
+
+@pace_zone_bp.route("/athletes/<int:athlete_id>/pace-zones", methods=["GET"])
+def get_pace_zones(athlete_id):
+    """
+    Stored boundaries plus the ones enrichment will actually use.
+    """
+    session = get_session()
+    try:
+        return jsonify({
+            "athlete_id": athlete_id,
+            "pace_zone_bounds": get_pace_zone_bounds(session, athlete_id),
+            "effective_bounds": resolve_pace_zone_bounds(session, athlete_id),
+        }), 200
+    finally:
+        session.close()
+
+
+@pace_zone_bp.route("/athletes/<int:athlete_id>/pace-zones", methods=["PUT"])
+@require_auth
+def put_pace_zones(athlete_id):
+    """
+    Body: {"pace_zone_bounds": [z2, z3, z4, z5]} in m/s, or null to go back
+    to derived zones. Existing splits are reclassified in the same request.
+    """
+    data = request.get_json(silent=True) or {}
+    if "pace_zone_bounds" not in data:
+        return jsonify({"error": "pace_zone_bounds is required"}), 400
+    bounds = data["pace_zone_bounds"]
+    try:
+        if bounds is not None:
+            bounds = validate_bounds(bounds)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    session = get_session()
+    try:
+        # Bounds, reclassified splits and the stats version commit together
+        if not set_pace_zone_bounds(session, athlete_id, bounds, commit=False):
+            session.rollback()
+            return jsonify({"error": f"Athlete {athlete_id} not found"}), 404
+        effective = resolve_pace_zone_bounds(session, athlete_id)
+        updated = bulk_assign_pace_zones(session, athlete_id, effective, commit=False)
+        bump_version(session, athlete_id)
+        session.commit()
+        return jsonify({
+            "athlete_id": athlete_id,
+            "pace_zone_bounds": bounds,
+            "effective_bounds": effective,
+            "splits_updated": updated,
+        }), 200
+    finally:
+        session.close()
+
+
+@pace_zone_bp.route("/athletes/<int:athlete_id>/pace-zones/weekly", methods=["GET"])
+@conditional_athlete_get(athlete_from_path)
+def weekly_pace_zones(athlete_id):
+    """
+    Moving minutes per pace zone per week.
+    Query params: weeks (default 12), scheme (default "mi").
+    """
+    weeks = request.args.get("weeks", default=12, type=int)
+    scheme = request.args.get("scheme", default="mi")
+    if not weeks or not 1 <= weeks <= MAX_WEEKS:
+        return jsonify({"error": f"weeks must be between 1 and {MAX_WEEKS}"}), 400
+    try:
+        parse_split_schemes(scheme)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    session = get_session()
+    try:
+        rows = ActivityStatsDAO.get_weekly_pace_zone_time(session, athlete_id, weeks, scheme)
+        by_week = {}
+        for r in rows:
+            week = by_week.setdefault(r["week"].date().isoformat(), [0.0] * 5)
+            week[r["pace_zone"] - 1] = round(r["moving_time"] / 60, 1)
+        return jsonify({
+            "athlete_id": athlete_id,
+            "scheme": scheme,
+            "weeks": [{"week": w, "zone_minutes": mins} for w, mins in by_week.items()],
+        }), 200
+    finally:
+        session.close()
@@ -0,0 +1,36 @@
+# src/routes/records_routes.py
+
+from flask import Blueprint, jsonify
+from src.db.db_session import get_session
+from src.db.dao.best_effort_dao import get_personal_records
+from src.utils.conversions import format_seconds_to_hms
+from src.utils.conditional import athlete_from_path, conditional_athlete_get
+
+records_bp = Blueprint("records", __name__)
+
+
+@records_bp.route("/athletes/<int:athlete_id>/records", methods=["GET"])
+@conditional_athlete_get(athlete_from_path)
+def personal_records(athlete_id):
+    """
+    Fastest effort per standard distance across the athlete's history.
+    """
+    session = get_session()
+    try:
+        records = get_personal_records(session, athlete_id)
+        return jsonify({
+            "athlete_id": athlete_id,
+            "records": [
+                {
+                    "name": r.name,
+                    "distance": r.distance,
+                    "elapsed_time": r.elapsed_time,
+                    "conv_elapsed_time": format_seconds_to_hms(r.elapsed_time),
+                    "activity_id": r.activity_id,
+                    "start_date": r.start_date.isoformat() if r.start_date else None,
+                }
+                for r in records
+            ],
+        }), 200
+    finally:
+        session.close()
@@ -0,0 +1,61 @@
+# src/routes/route_cluster_routes.py
+
+from flask import Blueprint, jsonify, request
+from src.db.db_session import get_session
+from src.services.route_cluster_service import cluster_detail, list_clusters, similar_runs
+from src.utils.conditional import athlete_from_path, conditional_athlete_get
+
+route_cluster_bp = Blueprint("route_clusters", __name__)
+
+
+@route_cluster_bp.route("/athletes/<int:athlete_id>/activities/<int:activity_id>/similar", methods=["GET"])
+@conditional_athlete_get(athlete_from_path)
+def similar_activities(athlete_id, activity_id):
+    """
+    Runs on the same course as this activity, closest shape first.
+    """
+    limit = request.args.get("limit", 20, type=int)
+    if limit is None or not 1 <= limit <= 200:
+        return jsonify({"error": "limit must be between 1 and 200"}), 400
+
+    session = get_session()
+    try:
+        runs = similar_runs(session, athlete_id, activity_id, limit)
+        if runs is None:
+            return jsonify({"error": "No route stored for this activity"}), 404
+        return jsonify({"athlete_id": athlete_id, "activity_id": activity_id, "similar": runs}), 200
+    finally:
+        session.close()
+
+
+@route_cluster_bp.route("/athletes/<int:athlete_id>/route-clusters", methods=["GET"])
+@conditional_athlete_get(athlete_from_path)
+def route_clusters(athlete_id):
+    """
+    Courses the athlete has run at least `min_runs` times.
+    """
+    min_runs = request.args.get("min_runs", 2, type=int)
+    if min_runs is None or min_runs < 1:
+        return jsonify({"error": "min_runs must be a positive integer"}), 400
+
+    session = get_session()
+    try:
+        return jsonify({"athlete_id": athlete_id, "clusters": list_clusters(session, athlete_id, min_runs)}), 200
+    finally:
+        session.close()
+
+
+@route_cluster_bp.route("/athletes/<int:athlete_id>/route-clusters/<int:cluster_id>", methods=["GET"])
+@conditional_athlete_get(athlete_from_path)
+def route_cluster_runs(athlete_id, cluster_id):
+    """
+    Every run of one course, oldest first, for comparison.
+    """
+    session = get_session()
+    try:
+        runs = cluster_detail(session, athlete_id, cluster_id)
+        if not runs:
+            return jsonify({"error": "Cluster not found"}), 404
+        return jsonify({"athlete_id": athlete_id, "cluster_id": cluster_id, "runs": runs}), 200
+    finally:
+        session.close()
@@ -0,0 +1,61 @@
+# src/routes/stats_routes.py
+
+from flask import Blueprint, jsonify, request
+from src.db.db_session import get_session
+from src.services.stats_service import STATS, cached_stat
+from src.utils.conditional import athlete_from_path, conditional_athlete_get
+
+stats_bp = Blueprint("stats", __name__)
+
+# param -> (default, min, max); metric is a string and is validated by the service
+INT_PARAMS = {
+    "days": (30, 1, 3660),
+    "weeks": (4, 1, 520),
+    "window": (7, 1, 52),
+}
+
+
+def _parse_params(accepted) -> dict:
+    params = {}
+    for name in accepted:
+        if name == "metric":
+            params[name] = request.args.get("metric", "")
+            continue
+        default, low, high = INT_PARAMS[name]
+        value = request.args.get(name, default=default, type=int)
+        if value is None or not low <= value <= high:
+            raise ValueError(f"{name} must be an integer between {low} and {high}")
+        params[name] = value
+    return params
+
+
+@stats_bp.route("/stats", methods=["GET"])
+def list_stats():
+    return jsonify({name: list(accepted) for name, (_, accepted) in STATS.items()}), 200
+
+
+@stats_bp.route("/stats/<int:athlete_id>/<name>", methods=["GET"])
+@conditional_athlete_get(athlete_from_path)
+def get_stat(athlete_id, name):
+    """
+    One ActivityStatsDAO view, served from the stats cache until the
+    athlete's activities change. X-Cache reports HIT or MISS.
+    """
+    if name not in STATS:
+        return jsonify({"error": f"Unknown stat: {name}"}), 404
+    try:
+        params = _parse_params(STATS[name][1])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    session = get_session()
+    try:
+        data, hit = cached_stat(session, athlete_id, name, params)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        session.close()
+
+    resp = jsonify({"athlete_id": athlete_id, "stat": name, "params": params, "data": data})
+    resp.headers["X-Cache"] = "HIT" if hit else "MISS"
+    return resp
@@ -0,0 +1,43 @@
+# src/routes/training_load_routes.py
+
+from datetime import date, timedelta
+
+from flask import Blueprint, jsonify, request
+from src.db.db_session import get_session
+from src.services.training_load_service import training_load_series
+from src.utils.conditional import athlete_from_path, conditional_athlete_get
+
+training_load_bp = Blueprint("training_load", __name__)
+
+MAX_DAYS = 3660
+
+
+@training_load_bp.route("/athletes/<int:athlete_id>/training-load", methods=["GET"])
+@conditional_athlete_get(athlete_from_path)
+def training_load(athlete_id):
+    """
+    Daily load, fitness (CTL), fatigue (ATL) and form (TSB).
+    Query params: start, end (YYYY-MM-DD); defaults to the last 90 days.
+    """
+    try:
+        end = date.fromisoformat(request.args["end"]) if "end" in request.args else date.today()
+        start = date.fromisoformat(request.args["start"]) if "start" in request.args else end - timedelta(days=89)
+    except ValueError:
+        return jsonify({"error": "start and end must be YYYY-MM-DD"}), 400
+    if start > end or (end - start).days >= MAX_DAYS:
+        return jsonify({"error": f"start must be on or before end, at most {MAX_DAYS} days apart"}), 400
+
+    session = get_session()
+    try:
+        series = training_load_series(session, athlete_id, start, end)
+        return jsonify({
+            "athlete_id": athlete_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "days": [
+                {"day": d.day.isoformat(), "load": d.load, "ctl": d.ctl, "atl": d.atl, "tsb": d.tsb}
+                for d in series
+            ],
+        }), 200
+    finally:
+        session.close()
@@ -0,0 +1,46 @@
+"""
+Reclassify stored splits into pace zones, for one athlete or all of them.
+
+    python -m src.scripts.backfill_pace_zones [--athlete_id <id>]
+"""
+
+import argparse
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import select
+
+from src.db.db_session import get_session
+from src.db.dao.split_dao import bulk_assign_pace_zones
+from src.db.models.activities import Activity
+from src.services.activity_service import resolve_pace_zone_bounds
+from src.utils.stats_cache import bump_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill split pace zones")
+    parser.add_argument("--athlete_id", type=int)
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        if args.athlete_id:
+            athlete_ids = [args.athlete_id]
+        else:
+            athlete_ids = session.scalars(
+                select(Activity.athlete_id).where(Activity.athlete_id.isnot(None)).distinct()
+            ).all()
+        for athlete_id in athlete_ids:
+            bounds = resolve_pace_zone_bounds(session, athlete_id)
+            # Reclassified splits and the stats version commit together
+            updated = bulk_assign_pace_zones(session, athlete_id, bounds, commit=False)
+            bump_version(session, athlete_id)
+            session.commit()
+            print(f"✅ Athlete {athlete_id}: {updated} splits classified with bounds {bounds}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Rebuild the training_load table for one athlete from their full history.
+
+    python -m src.scripts.backfill_training_load --athlete_id <id>
+"""
+
+import argparse
+from datetime import date
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from src.db.db_session import get_session
+from src.services.training_load_service import update_training_load
+from src.utils.stats_cache import bump_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill daily training load")
+    parser.add_argument("--athlete_id", type=int, required=True)
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        # No stored day precedes date.min, so the sweep starts at the first activity
+        written = update_training_load(session, args.athlete_id, date.min)
+        # /training-load is served conditionally; the series and the bump commit together
+        bump_version(session, args.athlete_id)
+        session.commit()
+        print(f"✅ Wrote {written} training-load days for athlete {args.athlete_id}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark the /ask retrieval index: build, incremental update and query latency.
+
+    python -m src.scripts.bench_activity_index --activities 10000 --queries 200
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from src.utils.activity_index import ActivityIndex
+
+QUESTIONS = [
+    "How did my long runs this spring compare to last year?",
+    "What was my fastest tempo run in October?",
+    "How much weekly volume did I run last summer?",
+    "Show my easy Sunday runs",
+    "When did I last run a half marathon?",
+]
+NAMES = ["Morning Run", "Easy run", "Tempo", "Long run", "Intervals", "Recovery jog", "Race", "Treadmill"]
+
+
+def make_activities(n, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2015, 1, 1)
+    return [
+        {
+            "activity_id": i + 1,
+            "start_date": start + timedelta(hours=rng.randint(0, 24 * 365 * 10)),
+            "distance": rng.uniform(3000, 42195),
+            "moving_time": rng.randint(900, 15000),
+            "name": rng.choice(NAMES),
+            "type": "Run",
+        }
+        for i in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the activity retrieval index")
+    parser.add_argument("--activities", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    activities = make_activities(args.activities)
+
+    start = time.perf_counter()
+    index = ActivityIndex()
+    index.upsert(activities)
+    build_s = time.perf_counter() - start
+
+    extra = make_activities(50, seed=1)
+    for i, a in enumerate(extra):
+        a["activity_id"] = args.activities + i + 1
+    start = time.perf_counter()
+    index.upsert(extra)
+    update_s = time.perf_counter() - start
+
+    latencies = []
+    for i in range(args.queries):
+        start = time.perf_counter()
+        index.search(QUESTIONS[i % len(QUESTIONS)], args.k)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    print(f"entries:        {len(index)} ({args.activities + len(extra)} activities + weekly summaries)")
+    print(f"build:          {build_s * 1000:.1f} ms")
+    print(f"upsert 50:      {update_s * 1000:.1f} ms")
+    print(f"query p50:      {statistics.median(latencies):.3f} ms")
+    print(f"query p95:      {latencies[int(len(latencies) * 0.95) - 1]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark scalar convert_metrics against convert_metrics_batch.
+
+    python -m src.scripts.bench_conversions --rows 200 --repeat 50
+"""
+
+import argparse
+import random
+import time
+
+from src.utils.conversions import convert_metrics, convert_metrics_batch
+
+FIELDS = ["distance", "elevation", "average_speed", "max_speed", "moving_time", "elapsed_time"]
+
+
+def make_rows(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "distance": round(rng.uniform(1000, 42195), 1),
+            "elevation": round(rng.uniform(0, 500), 1),
+            "average_speed": round(rng.uniform(2.0, 5.0), 3),
+            "max_speed": round(rng.uniform(3.0, 8.0), 3),
+            "moving_time": rng.randint(300, 15000),
+            "elapsed_time": rng.randint(300, 16000),
+        }
+        for _ in range(n)
+    ]
+
+
+def bench(rows, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        scalar = [convert_metrics(r, FIELDS) for r in rows]
+    scalar_s = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        columns = {k: [r[k] for r in rows] for k in FIELDS}
+        batch = convert_metrics_batch(columns, FIELDS)
+    batch_s = (time.perf_counter() - start) / repeat
+
+    for i, row in enumerate(scalar):
+        for key, value in row.items():
+            assert batch[key][i] == value, f"mismatch at row {i} {key}: {value} != {batch[key][i]}"
+
+    return scalar_s, batch_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metric conversions")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 200, 2000, 20000], help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'scalar ms':>10} {'batch ms':>10} {'speedup':>8}")
+    for n in args.rows:
+        scalar_s, batch_s = bench(make_rows(n), args.repeat)
+        print(f"{n:>8} {scalar_s * 1000:>10.3f} {batch_s * 1000:>10.3f} {scalar_s / batch_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
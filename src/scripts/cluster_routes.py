@@ -0,0 +1,39 @@
+"""
+Cluster stored routes into courses, for one athlete or all of them. Only
+routes not yet clustered are processed, so it is cheap to re-run.
+
+    python -m src.scripts.cluster_routes [--athlete_id <id>]
+"""
+
+import argparse
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import select
+
+from src.db.db_session import get_session
+from src.db.models.activity_routes import ActivityRoute
+from src.services.route_cluster_service import cluster_routes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster routes into courses")
+    parser.add_argument("--athlete_id", type=int)
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        if args.athlete_id:
+            athlete_ids = [args.athlete_id]
+        else:
+            athlete_ids = session.scalars(select(ActivityRoute.athlete_id).distinct()).all()
+        for athlete_id in athlete_ids:
+            assigned = cluster_routes(session, athlete_id)
+            print(f"✅ Athlete {athlete_id}: {assigned} routes clustered")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
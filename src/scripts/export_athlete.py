@@ -0,0 +1,47 @@
+"""
+Export an athlete's activities and splits to a file, streamed with constant
+memory (same rows as GET /export/<athlete_id>).
+
+    python -m src.scripts.export_athlete --athlete_id <id> [--format csv|ndjson|parquet] \
+        [--scheme km] [--output athlete.csv]
+
+Without --output the export is written to stdout.
+"""
+
+import argparse
+import sys
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from src.db.db_session import get_session
+from src.services.export_service import EXPORT_FORMATS, parquet_available, stream_export
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export activities and splits")
+    parser.add_argument("--athlete_id", type=int, required=True)
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--scheme", help="only splits of this scheme (mi, km or custom)")
+    parser.add_argument("--output", help="file path; stdout if omitted")
+    args = parser.parse_args()
+
+    if args.format == "parquet" and not parquet_available():
+        parser.error("parquet export requires the pyarrow package")
+
+    chunks = stream_export(get_session, args.athlete_id, args.format, args.scheme)
+    if args.output:
+        total = 0
+        with open(args.output, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                total += len(chunk)
+        print(f"✅ Wrote {total} bytes to {args.output}", file=sys.stderr)
+    else:
+        for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
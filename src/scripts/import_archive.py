@@ -0,0 +1,39 @@
+"""
+Backfill an athlete's history from a Strava bulk archive export, with no
+API calls.
+
+    python -m src.scripts.import_archive --athlete_id <id> --archive export_12345.zip [--workers 4]
+
+--archive is the downloaded zip or its extracted directory.
+"""
+
+import argparse
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from src.db.db_session import get_session
+from src.services.archive_import_service import IMPORT_CHUNK_SIZE, import_archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a Strava archive export")
+    parser.add_argument("--athlete_id", type=int, required=True)
+    parser.add_argument("--archive", required=True)
+    parser.add_argument("--workers", type=int, help="parser processes (default: CPU count)")
+    parser.add_argument("--chunk_size", type=int, default=IMPORT_CHUNK_SIZE, help="activities per transaction")
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        counts = import_archive(session, args.athlete_id, args.archive, workers=args.workers, chunk_size=args.chunk_size)
+        print(
+            f"✅ Imported {counts['imported']} runs ({counts['splits']} splits); "
+            f"{counts['skipped']} skipped, {counts['failed']} failed"
+        )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Compare gunicorn configurations under load: /health, /ask (stub LLM) and a
+stats route, each hammered by concurrent clients for a fixed duration.
+
+    python -m src.scripts.load_test --athlete_id <id> \
+        --configs sync:5:1 gthread:3:5 --concurrency 20 --duration 15
+
+A config is worker_class:workers:threads. Each one starts a fresh gunicorn
+with gunicorn.conf.py and those overrides (LLM_BACKEND=stub), so results
+reflect the server profile rather than OpenAI latency. Needs DATABASE_URL.
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def scenarios(athlete_id):
+    counter = itertools.count()
+    return {
+        "/health": lambda s, base: s.get(f"{base}/health", timeout=30),
+        # A new question each time so the /ask response cache doesn't short-circuit the work
+        "/ask": lambda s, base: s.post(
+            f"{base}/ask",
+            json={"athlete_id": athlete_id, "question": f"How was my training this week? #{next(counter)}"},
+            timeout=60,
+        ),
+        "/stats": lambda s, base: s.get(f"{base}/stats/{athlete_id}/weekly_summary?weeks=12", timeout=30),
+    }
+
+
+def start_server(worker_class, workers, threads, port):
+    env = {
+        **os.environ,
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_THREADS": str(threads),
+        "LLM_BACKEND": "stub",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "wsgi:app", "--bind", f"127.0.0.1:{port}", "--access-logfile", os.devnull],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base}/ping", timeout=1).ok:
+                return proc, base
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"gunicorn ({worker_class}:{workers}:{threads}) did not start")
+
+
+def run_load(call, base, concurrency, duration):
+    """
+    Returns (requests per second, latencies in ms, error count).
+    """
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        session = requests.Session()
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                ok = call(session, base).status_code < 500
+            except requests.RequestException:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return len(latencies) / duration, latencies, errors[0]
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    return statistics.quantiles(values, n=100)[pct - 1] if len(values) > 1 else values[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test gunicorn configurations")
+    parser.add_argument("--athlete_id", type=int, required=True)
+    parser.add_argument("--configs", nargs="+", default=["sync:5:1", "gthread:3:5"])
+    parser.add_argument("--paths", nargs="+", default=["/health", "/ask", "/stats"])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    calls = scenarios(args.athlete_id)
+    print(f"{'config':<16} {'path':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for spec in args.configs:
+        worker_class, workers, threads = spec.split(":")
+        proc, base = start_server(worker_class, int(workers), int(threads), args.port)
+        try:
+            for path in args.paths:
+                rps, latencies, errors = run_load(calls[path], base, args.concurrency, args.duration)
+                print(
+                    f"{spec:<16} {path:<8} {rps:>8.1f} {percentile(latencies, 50):>8.1f} "
+                    f"{percentile(latencies, 95):>8.1f} {errors:>7}"
+                )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,6 @@ from src.services.ingestion_orchestrator_service import (
 from src.services.token_service import refresh_token_if_expired
 from src.db.dao.athlete_dao import get_all_athletes
 from src.db.dao.token_dao import get_tokens_sa
-from src.scripts import oauth_cli
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,6 +37,7 @@ def run_for_athlete(session, athlete_id, args):
 
     if not tokens:
         logger.info(f"🔐 No token found for athlete {athlete_id}. Launching OAuth flow...")
+        from src.scripts import oauth_cli  # interactive path only
         oauth_cli.main(athlete_id_override=athlete_id)
 
     if args.activity_id:
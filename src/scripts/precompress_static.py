@@ -0,0 +1,53 @@
+"""
+Write .gz (and .br, when the brotli package is installed) next to every
+compressible file in the SPA build, so the app can serve them without
+compressing per request. Run after copying the frontend build into place:
+
+    python -m src.scripts.precompress_static [--dir <static folder>]
+"""
+
+import argparse
+import mimetypes
+from pathlib import Path
+
+import src.utils.config as config
+from src.utils.compression import COMPRESSIBLE_TYPES, available_encodings, compress
+
+# Flask's static folder for src.app
+DEFAULT_DIR = Path(__file__).resolve().parents[1] / "static"
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def precompress(root: Path, min_bytes: int = config.COMPRESS_MIN_BYTES) -> int:
+    """
+    Compress eligible files at maximum level. Returns the number of files written.
+    Variants that don't come out smaller are skipped.
+    """
+    written = 0
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix in (".br", ".gz"):
+            continue
+        if mimetypes.guess_type(path.name)[0] not in COMPRESSIBLE_TYPES:
+            continue
+        data = path.read_bytes()
+        if len(data) < min_bytes:
+            continue
+        for encoding in available_encodings():
+            packed = compress(data, encoding, 9)
+            if len(packed) < len(data):
+                path.with_name(path.name + SUFFIXES[encoding]).write_bytes(packed)
+                written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompress static assets")
+    parser.add_argument("--dir", type=Path, default=DEFAULT_DIR)
+    args = parser.parse_args()
+
+    written = precompress(args.dir)
+    print(f"✅ Wrote {written} precompressed files under {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,26 @@ import os
 from datetime import datetime, timedelta
 from sqlalchemy import text
 
+import src.utils.config as config
 from src.services.token_service import get_valid_token
 from src.db.dao.split_dao import upsert_splits
+from src.db.dao.best_effort_dao import upsert_best_efforts
+from src.db.dao.route_dao import build_route, upsert_routes
+from src.services.route_cluster_service import cluster_routes
+from src.services.training_load_service import update_training_load
 from src.db.dao.activity_dao import ActivityDAO
+from src.db.dao.athlete_dao import get_hr_zone_settings, get_pace_zone_bounds
+from src.db.dao.best_effort_dao import get_recent_best_times
 from src.services.strava_access_service import StravaClient
 from src.utils.logger import get_logger
 from src.utils.conversions import convert_metrics
-from src.db.models.activities import Activity
+from src.utils.best_efforts import compute_best_efforts
+from src.utils.hr_zones import resolve_bounds, zone_percentages
+from src.utils import pace_zones
+from src.utils.timing import span, timed_job
+from src.utils.metrics import ENRICHMENT_QUEUE_DEPTH
+from src.utils.stats_cache import bump_version
+from src.utils.ask_cache import invalidate_athlete
 
 log = get_logger(__name__)
 log.setLevel(logging.INFO)
@@ -54,9 +67,11 @@ def get_activities_to_enrich(session, athlete_id, limit):
     )
     return [row.activity_id for row in result.fetchall()]
 
-def enrich_one_activity(session, access_token, activity_id):
+def enrich_one_activity(session, access_token, activity_id, batch=None):
     """
     Enrich a single activity with streams, splits, zones.
+    With a batch, results are queued on it instead of written immediately.
+    Returns True when all soft fields are present, False if partially enriched.
     """
     try:
         client = StravaClient(access_token)
@@ -65,12 +80,14 @@ def enrich_one_activity(session, access_token, activity_id):
         soft_fields = ["average_heartrate", "suffer_score", "max_speed", "calories"]
 
         for attempt in range(retries):
-            activity_json = client.get_activity(activity_id)
-            zones_data = client.get_hr_zones(activity_id)
-            streams = client.get_streams(
-                activity_id,
-                keys=["distance", "time", "velocity_smooth", "heartrate"]
-            )
+            with span("strava_get_activity"):
+                activity_json = client.get_activity(activity_id)
+            zones_data = None
+            if config.HR_ZONES_SOURCE == "strava":
+                with span("strava_get_zones"):
+                    zones_data = client.get_hr_zones(activity_id)
+            with span("strava_get_streams"):
+                streams = client.get_streams(activity_id, keys=stream_keys())
 
             if all(activity_json.get(field) for field in required_fields):
                 break
@@ -79,14 +96,16 @@ def enrich_one_activity(session, access_token, activity_id):
                 "⚠️ Missing required fields for activity %s, retry %d/%d...",
                 activity_id, attempt + 1, retries
             )
-            time.sleep(1)
+            with span("sleep"):
+                time.sleep(1)
         else:
             raise ValueError(
                 f"❌ Critical data missing after retries for activity {activity_id}: "
                 f"{[(field, activity_json.get(field)) for field in required_fields]}"
             )
 
-        log_strava_payload(activity_id, activity_json, zones_data, streams)
+        with span("debug_dump"):
+            log_strava_payload(activity_id, activity_json, zones_data, streams)
 
         missing_soft = [f for f in soft_fields if activity_json.get(f) is None]
         if missing_soft:
@@ -100,37 +119,66 @@ def enrich_one_activity(session, access_token, activity_id):
             activity_id, activity_json.get("name")
         )
 
-        hr_zone_pcts = extract_hr_zone_percentages(zones_data) or [0.0] * 5
-        update_activity_enrichment(session, activity_id, activity_json, hr_zone_pcts)
-
-        splits = build_mile_splits(activity_id, streams)
+        athlete_id = _payload_athlete_id(activity_json)
+        with span("resolve_zone_bounds"):
+            if batch is not None:
+                hr_bounds, pace_bounds = batch.zone_bounds(athlete_id)
+            else:
+                hr_bounds, pace_bounds = resolve_zone_bounds(session, athlete_id)
+        if config.HR_ZONES_SOURCE == "strava":
+            hr_zone_pcts = extract_hr_zone_percentages(zones_data) or [0.0] * 5
+        else:
+            with span("compute_hr_zones"):
+                hr_zone_pcts = compute_hr_zone_percentages(streams, hr_bounds)
+        with span("build_splits"):
+            splits = build_splits(activity_id, streams)
+        if splits:
+            with span("assign_pace_zones"):
+                pace_zones.assign_pace_zones(splits, pace_bounds)
+        with span("compute_best_efforts"):
+            best_efforts = build_best_efforts(activity_id, activity_json, streams)
+        route = build_route(activity_id, athlete_id, streams.get("latlng"))
+
+        if batch is not None:
+            batch.add(activity_id, activity_json, hr_zone_pcts, splits, best_efforts, route)
+            return not missing_soft
+
+        # Activity fields and splits share one transaction
+        with span("update_activity_enrichment"):
+            update_activity_enrichment(session, activity_id, activity_json, hr_zone_pcts, commit=False)
+        if splits:
+            with span("upsert_splits"):
+                upsert_splits(session, splits, commit=False)
+        if best_efforts:
+            with span("upsert_best_efforts"):
+                upsert_best_efforts(session, best_efforts, commit=False)
+        if route:
+            with span("upsert_routes"):
+                upsert_routes(session, [route], commit=False)
+        with span("commit"):
+            session.commit()
         if splits:
-            upsert_splits(session, splits)
             log.info("✅ Synced %d splits for activity %s", len(splits), activity_id)
 
-        return True
+        return not missing_soft
     except Exception as e:  # pylint: disable=broad-exception-caught
         log.error("🔥 Exception while enriching %s: %s", activity_id, e)
         raise
 
-def enrich_one_activity_with_refresh(session, athlete_id, activity_id, max_retries=2):
+def enrich_one_activity_with_refresh(session, athlete_id, activity_id, max_retries=2, batch=None):
     """
     Attempt enrichment with token refresh and retries.
+    Completeness is judged from the fetched payload, so no re-query is needed.
     """
     for attempt in range(1, max_retries + 1):
         try:
-            access_token = get_valid_token(session, athlete_id)
-            enrich_one_activity(session, access_token, activity_id)
-            session.expire_all()
-
-            enriched = session.query(Activity).filter(
-                Activity.activity_id == activity_id,
-                Activity.average_speed.isnot(None),
-                Activity.suffer_score.isnot(None),
-                Activity.average_heartrate.isnot(None),
-                Activity.max_speed.isnot(None),
-                Activity.calories.isnot(None)
-            ).first()
+            access_token = batch.access_token if batch is not None else None
+            if not access_token:
+                with span("token_refresh"):
+                    access_token = get_valid_token(session, athlete_id)
+                if batch is not None:
+                    batch.access_token = access_token
+            enriched = enrich_one_activity(session, access_token, activity_id, batch=batch)
 
             if enriched:
                 log.info(
@@ -143,22 +191,63 @@ def enrich_one_activity_with_refresh(session, athlete_id, activity_id, max_retri
                 "⚠️ Enrichment fields missing on attempt %d for %s. Retrying in 5s...",
                 attempt, activity_id
             )
-            time.sleep(1)
+            with span("sleep"):
+                time.sleep(1)
 
         except Exception as e:  # pylint: disable=broad-exception-caught
             log.error(
                 "🔥 Enrichment error on attempt %d for %s: %s",
                 attempt, activity_id, e
             )
-            time.sleep(1)
+            if batch is not None:
+                # Force a fresh token lookup in case it expired mid-batch
+                batch.access_token = None
+            with span("sleep"):
+                time.sleep(1)
 
     log.error("❌ All retries failed — Activity %s has incomplete enrichment.", activity_id)
     raise RuntimeError(f"Enrichment failed for activity {activity_id}")
 
 
-def update_activity_enrichment(session, activity_id, activity_json, hr_zone_pcts):
+# (activities column, bind parameter, Postgres type) for enrichment writes
+_ENRICHMENT_COLUMNS = [
+    ("name", "name", "TEXT"),
+    ("distance", "distance", "DOUBLE PRECISION"),
+    ("moving_time", "moving_time", "INTEGER"),
+    ("elapsed_time", "elapsed_time", "INTEGER"),
+    ("total_elevation_gain", "elevation", "DOUBLE PRECISION"),
+    ("type", "type", "TEXT"),
+    ("average_speed", "avg_speed", "DOUBLE PRECISION"),
+    ("max_speed", "max_speed", "DOUBLE PRECISION"),
+    ("suffer_score", "suffer_score", "DOUBLE PRECISION"),
+    ("average_heartrate", "average_heartrate", "DOUBLE PRECISION"),
+    ("max_heartrate", "max_heartrate", "DOUBLE PRECISION"),
+    ("calories", "calories", "DOUBLE PRECISION"),
+    ("conv_distance", "conv_distance", "DOUBLE PRECISION"),
+    ("conv_elevation_feet", "conv_elevation_feet", "DOUBLE PRECISION"),
+    ("conv_avg_speed", "conv_avg_speed", "DOUBLE PRECISION"),
+    ("conv_max_speed", "conv_max_speed", "DOUBLE PRECISION"),
+    ("conv_moving_time", "conv_moving_time", "TEXT"),
+    ("conv_elapsed_time", "conv_elapsed_time", "TEXT"),
+    ("hr_zone_1", "hr_zone_1", "DOUBLE PRECISION"),
+    ("hr_zone_2", "hr_zone_2", "DOUBLE PRECISION"),
+    ("hr_zone_3", "hr_zone_3", "DOUBLE PRECISION"),
+    ("hr_zone_4", "hr_zone_4", "DOUBLE PRECISION"),
+    ("hr_zone_5", "hr_zone_5", "DOUBLE PRECISION"),
+]
+
+def stream_keys():
     """
-    Update enriched fields on activity.
+    Streams fetched per activity; latlng only when FETCH_LATLNG is on.
+    """
+    keys = ["distance", "time", "velocity_smooth", "heartrate"]
+    if config.FETCH_LATLNG:
+        keys.append("latlng")
+    return keys
+
+def build_enrichment_params(activity_id, activity_json, hr_zone_pcts):
+    """
+    Map a Strava activity payload to bind parameters for the enrichment UPDATE.
     """
     conv = convert_metrics({
         "distance": activity_json.get("distance"),
@@ -173,7 +262,7 @@ def update_activity_enrichment(session, activity_id, activity_json, hr_zone_pcts
         if activity_json.get(key) is None:
             log.warning("⚠️ %s missing from activity %s", key, activity_id)
 
-    params = {
+    return {
         "activity_id": activity_id,
         "name": activity_json.get("name"),
         "distance": activity_json.get("distance"),
@@ -195,37 +284,186 @@ def update_activity_enrichment(session, activity_id, activity_json, hr_zone_pcts
         **conv
     }
 
+def update_activity_enrichment(session, activity_id, activity_json, hr_zone_pcts, commit=True):
+    """
+    Update enriched fields on activity.
+    """
+    params = build_enrichment_params(activity_id, activity_json, hr_zone_pcts)
+    set_clause = ",\n                ".join(f"{col} = :{key}" for col, key, _ in _ENRICHMENT_COLUMNS)
+
     session.execute(
-        text("""
+        text(f"""
             UPDATE activities SET
-                name = :name,
-                distance = :distance,
-                moving_time = :moving_time,
-                elapsed_time = :elapsed_time,
-                total_elevation_gain = :elevation,
-                type = :type,
-                average_speed = :avg_speed,
-                max_speed = :max_speed,
-                suffer_score = :suffer_score,
-                average_heartrate = :average_heartrate,
-                max_heartrate = :max_heartrate,
-                calories = :calories,
-                conv_distance = :conv_distance,
-                conv_elevation_feet = :conv_elevation_feet,
-                conv_avg_speed = :conv_avg_speed,
-                conv_max_speed = :conv_max_speed,
-                conv_moving_time = :conv_moving_time,
-                conv_elapsed_time = :conv_elapsed_time,
-                hr_zone_1 = :hr_zone_1,
-                hr_zone_2 = :hr_zone_2,
-                hr_zone_3 = :hr_zone_3,
-                hr_zone_4 = :hr_zone_4,
-                hr_zone_5 = :hr_zone_5
+                {set_clause}
             WHERE activity_id = :activity_id
         """),
         params
     )
-    session.commit()
+    refresh_training_load(session, [activity_json])
+    bump_stats_versions(session, [activity_json])
+    if commit:
+        session.commit()
+        invalidate_ask_answers([activity_json])
+
+def _payload_athlete_id(activity_json):
+    return (activity_json.get("athlete") or {}).get("id")
+
+def refresh_training_load(session, activity_jsons):
+    """
+    Recompute training load from the earliest changed day, per athlete.
+    Payloads without an athlete or start date are skipped.
+    """
+    earliest = {}
+    for activity_json in activity_jsons:
+        athlete_id = _payload_athlete_id(activity_json)
+        start = activity_json.get("start_date")
+        if not athlete_id or not start:
+            continue
+        day = datetime.fromisoformat(str(start).replace("Z", "+00:00")).date()
+        earliest[athlete_id] = min(day, earliest.get(athlete_id, day))
+
+    for athlete_id, day in earliest.items():
+        update_training_load(session, athlete_id, day, commit=False)
+
+def bump_stats_versions(session, activity_jsons):
+    """
+    Invalidate cached /stats for every athlete in the enriched payloads.
+    """
+    for athlete_id in {_payload_athlete_id(a) for a in activity_jsons} - {None}:
+        bump_version(session, athlete_id)
+
+def invalidate_ask_answers(activity_jsons):
+    """
+    Drop this process's cached /ask answers for the athletes in the payloads.
+    Call after the write commits.
+    """
+    for athlete_id in {_payload_athlete_id(a) for a in activity_jsons} - {None}:
+        invalidate_athlete(athlete_id)
+
+def bulk_update_activity_enrichment(session, params_list):
+    """
+    Apply many enrichment updates in one UPDATE ... FROM (VALUES ...) statement.
+    Values are cast explicitly so all-NULL columns still type-check in Postgres.
+    Does not commit.
+    """
+    if not params_list:
+        return 0
+
+    binds = {}
+    rows = []
+    for i, params in enumerate(params_list):
+        binds[f"activity_id_{i}"] = params["activity_id"]
+        placeholders = [f"CAST(:activity_id_{i} AS BIGINT)"]
+        for _, key, pg_type in _ENRICHMENT_COLUMNS:
+            binds[f"{key}_{i}"] = params.get(key)
+            placeholders.append(f"CAST(:{key}_{i} AS {pg_type})")
+        rows.append(f"({', '.join(placeholders)})")
+
+    set_clause = ", ".join(f"{col} = v.{key}" for col, key, _ in _ENRICHMENT_COLUMNS)
+    value_cols = ", ".join(["activity_id"] + [key for _, key, _ in _ENRICHMENT_COLUMNS])
+
+    result = session.execute(
+        text(f"""
+            UPDATE activities AS a SET {set_clause}
+            FROM (VALUES {", ".join(rows)}) AS v({value_cols})
+            WHERE a.activity_id = v.activity_id
+        """),
+        binds
+    )
+    return result.rowcount
+
+class EnrichmentBatch:
+    """
+    Accumulates enrichment results and writes them together: one bulk UPDATE
+    for activity fields, one upsert each for splits, best efforts and routes,
+    one training-load recompute per athlete and one commit per `commit_every`
+    activities. Re-adding an activity replaces its pending result.
+
+    Zone bounds are looked up once per athlete and reused until the next
+    flush, whose best efforts can move the pace threshold.
+
+    With manual=True nothing is written until flush() is called, so the
+    caller can put its own writes in the same transaction.
+    """
+    def __init__(self, session, commit_every=None, manual=False):
+        self.session = session
+        self.commit_every = max(1, commit_every or config.ENRICH_COMMIT_EVERY)
+        self.manual = manual
+        self.access_token = None
+        self._activities = {}
+        self._splits = {}
+        self._best_efforts = {}
+        self._routes = {}
+        self._payloads = {}
+        self._zone_bounds = {}
+        # Activities written by successful flushes so far
+        self.flushed = 0
+
+    def __len__(self):
+        return len(self._activities)
+
+    @property
+    def pending_ids(self):
+        return sorted(self._activities)
+
+    def zone_bounds(self, athlete_id):
+        """
+        (HR zone bounds, pace zone bounds) for the athlete, cached per batch.
+        """
+        if athlete_id not in self._zone_bounds:
+            self._zone_bounds[athlete_id] = resolve_zone_bounds(self.session, athlete_id)
+        return self._zone_bounds[athlete_id]
+
+    def add(self, activity_id, activity_json, hr_zone_pcts, splits, best_efforts=None, route=None):
+        self._activities[activity_id] = build_enrichment_params(activity_id, activity_json, hr_zone_pcts)
+        self._splits[activity_id] = splits or []
+        self._best_efforts[activity_id] = best_efforts or []
+        self._routes[activity_id] = route
+        self._payloads[activity_id] = activity_json
+        if not self.manual and len(self._activities) >= self.commit_every:
+            self.flush()
+
+    def flush(self):
+        """
+        Write all pending results in a single transaction. Returns the number
+        of activities written. On failure the transaction is rolled back and
+        every result stays pending.
+        """
+        if not self._activities:
+            return 0
+
+        params_list = list(self._activities.values())
+        splits = [s for group in self._splits.values() for s in group]
+        best_efforts = [e for group in self._best_efforts.values() for e in group]
+        routes = [r for r in self._routes.values() if r]
+        try:
+            with span("flush_enrichment_batch"):
+                bulk_update_activity_enrichment(self.session, params_list)
+                if splits:
+                    upsert_splits(self.session, splits, commit=False)
+                if best_efforts:
+                    upsert_best_efforts(self.session, best_efforts, commit=False)
+                if routes:
+                    upsert_routes(self.session, routes, commit=False)
+                refresh_training_load(self.session, self._payloads.values())
+                bump_stats_versions(self.session, self._payloads.values())
+                self.session.commit()
+        except Exception as e:
+            # Pending results stay queued so the next flush retries them
+            self.session.rollback()
+            log.error("❌ Enrichment flush failed, activities %s still pending: %s", self.pending_ids, e)
+            raise
+        invalidate_ask_answers(self._payloads.values())
+        self._zone_bounds.clear()
+        self._activities.clear()
+        self._splits.clear()
+        self._best_efforts.clear()
+        self._routes.clear()
+        self._payloads.clear()
+
+        self.flushed += len(params_list)
+        log.info("✅ Flushed enrichment for %d activities (%d splits)", len(params_list), len(splits))
+        return len(params_list)
 
 def extract_hr_zone_percentages(zones_data):
     """
@@ -243,68 +481,158 @@ def extract_hr_zone_percentages(zones_data):
         log.warning("⚠️ HR zone extraction failed: %s", e)
     return [0.0] * 5
 
-def build_mile_splits(activity_id, streams):
+def resolve_hr_zone_bounds(session, athlete_id):
     """
-    Build mile splits from stream data.
+    Athlete's stored HR zone boundaries, else zones from their max HR, else
+    HR_ZONE_BOUNDS.
+    """
+    bounds, max_hr = get_hr_zone_settings(session, athlete_id) if athlete_id else (None, None)
+    try:
+        return resolve_bounds(bounds, max_hr)
+    except ValueError as e:
+        log.warning("⚠️ Invalid HR zones for athlete %s (%s); using defaults", athlete_id, e)
+        return resolve_bounds()
+
+def compute_hr_zone_percentages(streams, hr_bounds):
+    """
+    Time-in-zone percentages from the heartrate/time streams.
+    Replaces the per-activity Strava /zones call.
+    """
+    return zone_percentages(streams.get("heartrate"), streams.get("time"), hr_bounds) or [0.0] * 5
+
+def resolve_pace_zone_bounds(session, athlete_id):
+    """
+    Athlete's configured pace zones, else zones derived from their recent
+    best efforts, else PACE_ZONE_BOUNDS.
     """
+    if not athlete_id:
+        return pace_zones.resolve_bounds()
+    try:
+        return pace_zones.resolve_bounds(
+            get_pace_zone_bounds(session, athlete_id),
+            get_recent_best_times(session, athlete_id, config.PACE_ZONE_EFFORT_DAYS),
+        )
+    except ValueError as e:
+        log.warning("⚠️ Invalid pace zones for athlete %s (%s); using defaults", athlete_id, e)
+        return pace_zones.resolve_bounds()
+
+def resolve_zone_bounds(session, athlete_id):
+    """
+    (HR zone bounds, pace zone bounds) for an athlete.
+    """
+    return resolve_hr_zone_bounds(session, athlete_id), resolve_pace_zone_bounds(session, athlete_id)
+
+SPLIT_SCHEME_DISTANCES = {"km": 1000.0, "mi": 1609.344}
+
+def parse_split_schemes(spec):
+    """
+    Parse a scheme list like "km,mi,400m" into [(scheme, meters), ...].
+    Custom schemes are a distance in meters with an "m" suffix.
+    """
+    schemes = []
+    for name in (part.strip() for part in spec.split(",")):
+        if not name:
+            continue
+        if name in SPLIT_SCHEME_DISTANCES:
+            meters = SPLIT_SCHEME_DISTANCES[name]
+        elif name.endswith("m") and name[:-1].replace(".", "", 1).isdigit() and float(name[:-1]) > 0:
+            meters = float(name[:-1])
+        else:
+            raise ValueError(f"Unknown split scheme: {name!r}")
+        schemes.append((name, meters))
+    return schemes
+
+class _SplitAccumulator:
+    """
+    Running totals for the open split of one scheme.
+    """
+    def __init__(self, scheme, threshold):
+        self.scheme = scheme
+        self.threshold = threshold
+        self.lap_index = 1
+        self.reset(0)
+
+    def reset(self, start_index):
+        self.start_index = start_index
+        self.moving_time = 0
+        self.speed_sum = 0
+        self.hr_sum = 0
+        self.max_speed = None
+
+def build_splits(activity_id, streams, schemes=None):
+    """
+    Build splits for every scheme (default SPLIT_SCHEMES) in one pass over the streams.
+    conv_* fields are filled in once, column-wise, by upsert_splits.
+    """
+    if schemes is None:
+        schemes = parse_split_schemes(config.SPLIT_SCHEMES)
+
     distances = streams.get("distance", [])
     times = streams.get("time", [])
     paces = streams.get("velocity_smooth", [])
     hrs = streams.get("heartrate", [])
 
     splits = []
-    mile_threshold = 1609.344
-    mile_index = 1
-    start_index = 0
     speed_threshold = 0.5
+    open_splits = [_SplitAccumulator(name, meters) for name, meters in schemes]
 
     for i, d in enumerate(distances):
-        if float(d) < mile_index * mile_threshold - 1e-6:
-            continue
+        d = float(d)
+        for acc in open_splits:
+            # Each sample feeds every scheme's open split
+            if i > acc.start_index and i < len(paces) and float(paces[i]) > speed_threshold:
+                acc.moving_time += float(times[i]) - float(times[i - 1])
+            if i < len(paces):
+                acc.speed_sum += paces[i]
+                acc.max_speed = paces[i] if acc.max_speed is None else max(acc.max_speed, paces[i])
+            if i < len(hrs):
+                acc.hr_sum += hrs[i]
+
+            if d < acc.lap_index * acc.threshold - 1e-6:
+                continue
+
+            start_index = acc.start_index
+            count = i + 1 - start_index
+            avg_speed = acc.speed_sum / count if paces else 0
+            avg_hr = acc.hr_sum / count if hrs else None
+
+            splits.append({
+                "activity_id": activity_id,
+                "scheme": acc.scheme,
+                "lap_index": acc.lap_index,
+                "distance": round(d - float(distances[start_index]), 2),
+                "elapsed_time": float(times[i]) - float(times[start_index]),
+                "moving_time": acc.moving_time,
+                "average_speed": round(avg_speed, 2),
+                "max_speed": round(acc.max_speed, 2) if paces and acc.max_speed is not None else None,
+                "start_index": start_index,
+                "end_index": i,
+                "split": acc.lap_index,
+                "average_heartrate": round(avg_hr, 2) if avg_hr else None,
+                "pace_zone": None,
+            })
+
+            acc.lap_index += 1
+            acc.reset(i + 1)
 
-        segment_distance = float(d) - float(distances[start_index])
-        elapsed_time = float(times[i]) - float(times[start_index])
-        moving_time = sum(
-            float(times[j]) - float(times[j - 1])
-            for j in range(start_index + 1, i + 1)
-            if j < len(paces) and float(paces[j]) > speed_threshold
-        )
+    return splits
 
-        avg_speed = sum(paces[start_index:i + 1]) / (i + 1 - start_index) if paces else 0
-        avg_hr = sum(hrs[start_index:i + 1]) / (i + 1 - start_index) if hrs else None
-
-        segment_distance = round(segment_distance, 2)
-        avg_speed = round(avg_speed, 2)
-        max_speed_val = round(max(paces[start_index:i + 1]), 2) if paces else None
-        avg_hr = round(avg_hr, 2) if avg_hr else None
-
-        conv_data = convert_metrics({
-            "distance": segment_distance,
-            "average_speed": avg_speed,
-            "moving_time": moving_time,
-            "elapsed_time": elapsed_time
-        }, ["distance", "average_speed", "moving_time", "elapsed_time"])
-
-        splits.append({
-            "activity_id": activity_id,
-            "lap_index": mile_index,
-            "distance": segment_distance,
-            "elapsed_time": elapsed_time,
-            "moving_time": moving_time,
-            "average_speed": avg_speed,
-            "max_speed": max_speed_val,
-            "start_index": start_index,
-            "end_index": i,
-            "split": mile_index,
-            "average_heartrate": avg_hr,
-            "pace_zone": None,
-            **conv_data
-        })
-
-        start_index = i + 1
-        mile_index += 1
+def build_mile_splits(activity_id, streams):
+    """
+    Build mile splits from stream data.
+    """
+    return build_splits(activity_id, streams, schemes=[("mi", SPLIT_SCHEME_DISTANCES["mi"])])
 
-    return splits
+def build_best_efforts(activity_id, activity_json, streams):
+    """
+    Fastest standard-distance efforts from the activity's distance/time streams.
+    The athlete comes from the activity payload; without it nothing is stored.
+    """
+    athlete_id = (activity_json.get("athlete") or {}).get("id")
+    if not athlete_id:
+        log.warning("⚠️ No athlete on activity %s payload; skipping best efforts", activity_id)
+        return []
+    return compute_best_efforts(activity_id, athlete_id, streams, start_date=activity_json.get("start_date"))
 
 class ActivityIngestionService:
     """
@@ -316,7 +644,8 @@ class ActivityIngestionService:
         self._refresh_client()
 
     def _refresh_client(self):
-        access_token = get_valid_token(self.session, self.athlete_id)
+        with span("token_refresh"):
+            access_token = get_valid_token(self.session, self.athlete_id)
         self.client = StravaClient(access_token)
 
     def ingest_recent(self, lookback_days, max_activities=None, per_page=200):
@@ -325,16 +654,19 @@ class ActivityIngestionService:
         """
         self._refresh_client()
         after = int((datetime.utcnow() - timedelta(days=lookback_days)).timestamp())
-        activities = self.client.get_activities(after=after, per_page=per_page, limit=max_activities)
+        with span("strava_get_activities"):
+            activities = self.client.get_activities(after=after, per_page=per_page, limit=max_activities)
         activities = [a for a in activities if a.get("type") == "Run"]
-        return ActivityDAO.upsert_activities(self.session, self.athlete_id, activities)
+        with span("upsert_activities"):
+            return ActivityDAO.upsert_activities(self.session, self.athlete_id, activities)
 
     def ingest_full_history(self, lookback_days=None, max_activities=None, per_page=200, dry_run=False):
         """
         Ingest full history with optional filters.
         """
         after = int((datetime.utcnow() - timedelta(days=lookback_days)).timestamp()) if lookback_days else None
-        all_activities = self.client.get_activities(after=after, per_page=per_page, limit=max_activities)
+        with span("strava_get_activities"):
+            all_activities = self.client.get_activities(after=after, per_page=per_page, limit=max_activities)
         all_activities = [a for a in all_activities if a.get("type") == "Run"]
 
         if dry_run:
@@ -343,7 +675,8 @@ class ActivityIngestionService:
         if not all_activities:
             return 0
 
-        ActivityDAO.upsert_activities(self.session, self.athlete_id, all_activities)
+        with span("upsert_activities"):
+            ActivityDAO.upsert_activities(self.session, self.athlete_id, all_activities)
         return len(all_activities)
 
     def ingest_between(self, start_date, end_date, max_activities=None, per_page=200):
@@ -353,15 +686,46 @@ class ActivityIngestionService:
         self._refresh_client()
         after = int(start_date.timestamp())
         before = int(end_date.timestamp())
-        activities = self.client.get_activities(after=after, before=before, per_page=per_page, limit=max_activities)
+        with span("strava_get_activities"):
+            activities = self.client.get_activities(after=after, before=before, per_page=per_page, limit=max_activities)
         activities = [a for a in activities if a.get("type") == "Run"]
-        return ActivityDAO.upsert_activities(self.session, self.athlete_id, activities)
+        with span("upsert_activities"):
+            return ActivityDAO.upsert_activities(self.session, self.athlete_id, activities)
 
-def run_enrichment_batch(session, athlete_id, batch_size=10):
+@timed_job("enrichment_batch", "athlete_id")
+def run_enrichment_batch(session, athlete_id, batch_size=10, commit_every=None):
     """
     Batch enrichment job for activities.
+    Writes are grouped into one transaction per `commit_every` activities
+    (default config.ENRICH_COMMIT_EVERY). Returns the number processed.
     """
-    activity_ids = get_activities_to_enrich(session, athlete_id, batch_size)
-    for aid in activity_ids:
-        enrich_one_activity_with_refresh(session, athlete_id, aid)
-        time.sleep(1)
+    with span("select_activities_to_enrich"):
+        activity_ids = get_activities_to_enrich(session, athlete_id, batch_size)
+    batch = EnrichmentBatch(session, commit_every=commit_every)
+    pending = len(activity_ids)
+    ENRICHMENT_QUEUE_DEPTH.inc(pending)
+    try:
+        for aid in activity_ids:
+            with span("enrich_activity"):
+                enrich_one_activity_with_refresh(session, athlete_id, aid, batch=batch)
+            pending -= 1
+            ENRICHMENT_QUEUE_DEPTH.dec()
+            with span("sleep"):
+                time.sleep(1)
+    except Exception:
+        # Persist whatever was enriched, without masking the original error
+        try:
+            batch.flush()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass  # flush() logged the unwritten ids
+        raise
+    finally:
+        ENRICHMENT_QUEUE_DEPTH.dec(pending)
+    batch.flush()
+    if config.FETCH_LATLNG and activity_ids:
+        try:
+            cluster_routes(session, athlete_id)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            session.rollback()
+            log.warning("⚠️ Route clustering failed for athlete %s: %s", athlete_id, e)
+    return len(activity_ids) - pending
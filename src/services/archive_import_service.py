@@ -0,0 +1,284 @@
+"""
+Offline import of a Strava bulk archive export (Settings → My Account →
+Download or Delete Your Account), as a directory or the downloaded zip.
+
+activities.csv lists every activity with its recorded file (GPX/TCX/FIT,
+optionally gzipped). Run files are parsed in a process pool into the stream
+shape enrichment gets from the API, and each worker derives the activity
+fields, splits, pace zones, best efforts, HR zone percentages and route
+with the same functions enrichment uses. The parent writes results in chunks through
+ActivityDAO.upsert_activities and EnrichmentBatch, so a full history costs
+no API calls. Activity ids match Strava's, so re-importing or a later API
+sync updates rows in place.
+"""
+
+import csv
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import PurePosixPath
+
+from src.db.dao.activity_dao import ActivityDAO
+from src.db.dao.route_dao import build_route
+from src.db.dao.split_dao import bulk_assign_pace_zones
+from src.db.db_session import dispose_engines
+from src.services.route_cluster_service import cluster_routes
+from src.services.activity_service import (
+    EnrichmentBatch, build_best_efforts, build_splits, compute_hr_zone_percentages, resolve_pace_zone_bounds,
+    resolve_zone_bounds,
+)
+from src.utils import pace_zones
+from src.utils.activity_files import file_format, parse_activity_file, stream_summary, trackpoints_to_streams
+from src.utils.logger import get_logger
+from src.utils.stats_cache import bump_version
+
+log = get_logger(__name__)
+
+ACTIVITIES_CSV = "activities.csv"
+IMPORT_CHUNK_SIZE = 200
+CSV_DATE_FORMAT = "%b %d, %Y, %I:%M:%S %p"
+
+
+class ArchiveReader:
+    """
+    Reads members of an export directory or zip. Zips may nest everything
+    under one top-level folder; member names are relative to activities.csv.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._zip = zipfile.ZipFile(self.path) if zipfile.is_zipfile(self.path) else None
+        self._prefix = ""
+        if self._zip is not None:
+            index = min(
+                (n for n in self._zip.namelist() if PurePosixPath(n).name == ACTIVITIES_CSV),
+                key=lambda n: n.count("/"),
+                default=None,
+            )
+            if index is None:
+                raise FileNotFoundError(f"No {ACTIVITIES_CSV} in {self.path}")
+            self._prefix = index[: -len(ACTIVITIES_CSV)]
+
+    def read(self, name: str) -> bytes:
+        if self._zip is not None:
+            return self._zip.read(self._prefix + name)
+        with open(os.path.join(self.path, name), "rb") as f:
+            return f.read()
+
+    def activities(self) -> list[dict]:
+        return read_activities_csv(self.read(ACTIVITIES_CSV))
+
+
+def _number(value):
+    try:
+        return float(value.replace(",", "")) if value and value.strip() else None
+    except ValueError:
+        return None
+
+
+def read_activities_csv(data: bytes) -> list[dict]:
+    """
+    Rows of activities.csv as entries for process_archive_activity.
+
+    Strava repeats some headers (Distance, Elapsed Time): the later columns
+    hold raw units (meters, seconds), so the last occurrence wins.
+    """
+    reader = csv.reader(io.StringIO(data.decode("utf-8-sig")))
+    header = next(reader, [])
+    entries = []
+    for values in reader:
+        row = dict(zip(header, values))
+        if not row.get("Activity ID"):
+            continue
+        entries.append({
+            "id": int(row["Activity ID"]),
+            "name": row.get("Activity Name") or None,
+            "type": row.get("Activity Type") or None,
+            "date": row.get("Activity Date") or None,
+            "filename": row.get("Filename") or None,
+            "distance": _number(row.get("Distance")),
+            "elapsed_time": _number(row.get("Elapsed Time")),
+            "moving_time": _number(row.get("Moving Time")),
+            "total_elevation_gain": _number(row.get("Elevation Gain")),
+            "max_heartrate": _number(row.get("Max Heart Rate")),
+            "average_heartrate": _number(row.get("Average Heart Rate")),
+            "calories": _number(row.get("Calories")),
+        })
+    return entries
+
+
+def _csv_start_date(value):
+    try:
+        return datetime.strptime(value, CSV_DATE_FORMAT).replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+def _iso(ts: datetime) -> str:
+    return ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_activity_json(entry: dict, athlete_id: int, streams: dict, file_start=None) -> dict:
+    """
+    Strava-shaped activity payload: CSV values where the export has them,
+    otherwise derived from the streams.
+    """
+    derived = stream_summary(streams) if streams else {}
+    start = file_start or _csv_start_date(entry["date"])
+
+    def pick(key):
+        value = entry.get(key)
+        return value if value is not None else derived.get(key)
+
+    moving_time = pick("moving_time")
+    elapsed_time = pick("elapsed_time")
+    return {
+        "id": entry["id"],
+        "athlete": {"id": athlete_id},
+        "name": entry["name"],
+        "type": entry["type"],
+        "start_date": _iso(start) if start else None,
+        "timezone": None,
+        "external_id": PurePosixPath(entry["filename"]).name if entry["filename"] else None,
+        # Streams measure what the file recorded; the CSV can round these
+        "distance": derived.get("distance", entry["distance"]),
+        "elapsed_time": int(elapsed_time) if elapsed_time is not None else None,
+        "moving_time": int(moving_time) if moving_time is not None else None,
+        "average_speed": derived.get("average_speed"),
+        "max_speed": derived.get("max_speed"),
+        "total_elevation_gain": pick("total_elevation_gain"),
+        "average_heartrate": pick("average_heartrate"),
+        "max_heartrate": pick("max_heartrate"),
+        "calories": entry["calories"],
+        "suffer_score": None,
+    }
+
+
+_readers = {}
+
+
+def _reader(path):
+    # One open archive per worker process, reused across tasks
+    if path not in _readers:
+        _readers[path] = ArchiveReader(path)
+    return _readers[path]
+
+
+def process_archive_activity(task) -> dict:
+    """
+    Parse one activity's file and derive everything enrichment would store.
+    Runs in a worker process; returns plain data for the parent to write.
+    """
+    archive_path, entry, athlete_id, hr_bounds, pace_bounds = task
+    try:
+        streams, file_start = {}, None
+        if entry["filename"] and file_format(entry["filename"]):
+            points = parse_activity_file(entry["filename"], _reader(archive_path).read(entry["filename"]))
+            streams = trackpoints_to_streams(points)
+            file_start = points["time"][0] if streams else None
+
+        activity_json = build_activity_json(entry, athlete_id, streams, file_start)
+        activity_id = entry["id"]
+        splits = build_splits(activity_id, streams) if streams else []
+        if splits:
+            pace_zones.assign_pace_zones(splits, pace_bounds)
+        hr_zone_pcts = compute_hr_zone_percentages(streams, hr_bounds)
+        best_efforts = build_best_efforts(activity_id, activity_json, streams) if streams else []
+        return {
+            "activity_json": activity_json,
+            "hr_zone_pcts": hr_zone_pcts,
+            "splits": splits,
+            "best_efforts": best_efforts,
+            "route": build_route(activity_id, athlete_id, streams.get("latlng")),
+            "error": None,
+        }
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return {"activity_json": {"id": entry["id"]}, "error": f"{entry['filename']}: {e}"}
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_results(session, athlete_id, results, counts):
+    """
+    Write one chunk of parsed activities and their enrichment in a single
+    transaction, so a failed chunk leaves nothing half-imported.
+    """
+    kept = []
+    for result in results:
+        if result["error"]:
+            log.warning("⚠️ Archive activity %s failed: %s", result["activity_json"]["id"], result["error"])
+            counts["failed"] += 1
+            continue
+        missing = ActivityDAO.missing_required_fields(result["activity_json"])
+        if missing:
+            log.warning("⚠️ Skipping archive activity %s — missing %s", result["activity_json"]["id"], missing)
+            counts["skipped"] += 1
+            continue
+        kept.append(result)
+    if not kept:
+        return
+
+    ActivityDAO.upsert_activities(session, athlete_id, [r["activity_json"] for r in kept], commit=False)
+    batch = EnrichmentBatch(session, manual=True)
+    for r in kept:
+        batch.add(
+            r["activity_json"]["id"], r["activity_json"], r["hr_zone_pcts"], r["splits"], r["best_efforts"], r["route"],
+        )
+    batch.flush()
+    counts["imported"] += len(kept)
+    counts["splits"] += sum(len(r["splits"]) for r in kept)
+
+
+def import_archive(session, athlete_id: int, path, workers: int | None = None, chunk_size: int = IMPORT_CHUNK_SIZE):
+    """
+    Import every run in the archive at `path`. `workers` parser processes
+    (default: CPU count; 1 parses inline). Returns counts of imported,
+    skipped (not a run or missing fields), failed (unparseable) and splits,
+    then clusters the new routes into courses.
+    """
+    reader = ArchiveReader(path)
+    entries = reader.activities()
+    runs = [e for e in entries if e["type"] == "Run"]
+    counts = {"imported": 0, "skipped": len(entries) - len(runs), "failed": 0, "splits": 0}
+
+    hr_bounds, pace_bounds = resolve_zone_bounds(session, athlete_id)
+    tasks = [(reader.path, entry, athlete_id, hr_bounds, pace_bounds) for entry in runs]
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1:
+        results = map(process_archive_activity, tasks)
+        for chunk in _chunks(results, chunk_size):
+            write_results(session, athlete_id, chunk, counts)
+    else:
+        # Workers never touch the database; drop pooled connections inherited by fork
+        with ProcessPoolExecutor(max_workers=workers, initializer=dispose_engines) as pool:
+            results = pool.map(process_archive_activity, tasks, chunksize=8)
+            for chunk in _chunks(results, chunk_size):
+                write_results(session, athlete_id, chunk, counts)
+
+    # Best efforts from the import can change threshold-derived pace zones
+    new_bounds = resolve_pace_zone_bounds(session, athlete_id)
+    if counts["imported"] and new_bounds != pace_bounds:
+        # Reclassified splits and the stats version commit together
+        bulk_assign_pace_zones(session, athlete_id, new_bounds, commit=False)
+        bump_version(session, athlete_id)
+        session.commit()
+    if counts["imported"]:
+        counts["clustered"] = cluster_routes(session, athlete_id)
+
+    log.info(
+        "✅ Archive import for athlete %s: %d imported, %d skipped, %d failed, %d splits",
+        athlete_id, counts["imported"], counts["skipped"], counts["failed"], counts["splits"],
+    )
+    return counts
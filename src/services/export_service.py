@@ -0,0 +1,183 @@
+"""
+Streaming export of an athlete's activities and splits.
+
+Rows come from one activities LEFT JOIN splits query read through a
+server-side cursor (yield_per), and each format writer turns them into byte
+chunks as they arrive, so memory stays flat regardless of history size and
+the first bytes go out after the first batch. One row per split, carrying
+its activity's columns; activities without splits appear once with empty
+split columns.
+
+Parquet needs the optional `pyarrow` package; each batch becomes a row group.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+
+from src.db.models.activities import Activity
+from src.db.models.splits import Split
+
+EXPORT_BATCH_SIZE = 1000
+CHUNK_BYTES = 64 * 1024
+
+ACTIVITY_COLUMNS = [
+    "activity_id", "name", "type", "start_date", "timezone", "distance", "moving_time",
+    "elapsed_time", "total_elevation_gain", "average_speed", "max_speed",
+    "average_heartrate", "max_heartrate", "suffer_score", "calories",
+    "hr_zone_1", "hr_zone_2", "hr_zone_3", "hr_zone_4", "hr_zone_5",
+]
+SPLIT_COLUMNS = [
+    "scheme", "lap_index", "distance", "elapsed_time", "moving_time",
+    "average_speed", "max_speed", "average_heartrate", "pace_zone",
+]
+FIELDNAMES = ACTIVITY_COLUMNS + [f"split_{c}" for c in SPLIT_COLUMNS]
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def export_columns():
+    """
+    (field name, model column) pairs in export order.
+    """
+    return (
+        [(c, getattr(Activity, c)) for c in ACTIVITY_COLUMNS]
+        + [(f"split_{c}", getattr(Split, c)) for c in SPLIT_COLUMNS]
+    )
+
+
+def export_query(athlete_id: int, scheme: str | None = None):
+    join_on = Split.activity_id == Activity.activity_id
+    if scheme:
+        join_on &= Split.scheme == scheme
+    return (
+        select(*[column.label(name) for name, column in export_columns()])
+        .outerjoin(Split, join_on)
+        .where(Activity.athlete_id == athlete_id)
+        .order_by(Activity.start_date.desc(), Activity.activity_id.desc(), Split.scheme, Split.lap_index)
+    )
+
+
+def iter_export_rows(session, athlete_id: int, scheme: str | None = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Yield export rows as dicts, fetched batch_size at a time from a server-side cursor.
+    """
+    result = session.execute(export_query(athlete_id, scheme).execution_options(yield_per=batch_size))
+    for row in result.mappings():
+        yield dict(row)
+
+
+def _jsonable(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_csv(rows):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=FIELDNAMES, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({k: _jsonable(v) for k, v in row.items()})
+        if buf.tell() >= CHUNK_BYTES:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+
+def iter_ndjson(rows):
+    lines, size = [], 0
+    for row in rows:
+        line = json.dumps({k: _jsonable(v) for k, v in row.items()}, separators=(",", ":")) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield "".join(lines).encode("utf-8")
+            lines, size = [], 0
+    if lines:
+        yield "".join(lines).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file that hands written bytes back to the caller, while
+    reporting the absolute position the Parquet writer needs for offsets.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401  pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        return False
+    return True
+
+
+def iter_parquet(rows, batch_size: int = EXPORT_BATCH_SIZE):
+    # Imported here: pyarrow is optional and slow to import
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+    import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+    arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string(), datetime: pa.timestamp("us")}
+    schema = pa.schema([(name, arrow_types[column.type.python_type]) for name, column in export_columns()])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in _batches(rows, batch_size):
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+WRITERS = {"csv": iter_csv, "ndjson": iter_ndjson, "parquet": iter_parquet}
+
+
+def stream_export(session_factory, athlete_id: int, fmt: str, scheme: str | None = None):
+    """
+    Yield the export as byte chunks. The session is opened on first iteration
+    and closed when the stream ends or the consumer stops early.
+    """
+    session = session_factory()
+    try:
+        for chunk in WRITERS[fmt](iter_export_rows(session, athlete_id, scheme)):
+            if chunk:
+                yield chunk
+    finally:
+        session.close()
@@ -9,8 +9,10 @@ sys.path.append(str(Path(__file__).resolve().parents[2]))  # adds project root
 
 from src.db.dao.activity_dao import ActivityDAO
 from src.utils.logger import get_logger
+from src.utils.timing import span, timed_job
 from src.services.activity_service import (
     ActivityIngestionService,
+    EnrichmentBatch,
     enrich_one_activity_with_refresh,
     run_enrichment_batch,
 )
@@ -22,6 +24,7 @@ from src.utils.seeder import seed_sample_activity
 
 logger = get_logger(__name__)
 
+@timed_job("full_sync", "athlete_id")
 def run_full_ingestion_and_enrichment(
     session,
     athlete_id,
@@ -58,7 +61,8 @@ def run_full_ingestion_and_enrichment(
             logger.info(f"✅ Seeded mock activity for athlete {athlete_id}")
             return {"synced": 1, "enriched": 0}
 
-    access_token = get_valid_token(session, athlete_id)
+    with span("token_refresh"):
+        access_token = get_valid_token(session, athlete_id)
     logger.info(f"🟢 Retrieved valid access token for athlete {athlete_id}")
 
     logger.info(f"🗖️ Fetching recent activities from Strava...")
@@ -69,11 +73,12 @@ def run_full_ingestion_and_enrichment(
     if lookback_days:
         after_ts = int((datetime.utcnow() - timedelta(days=lookback_days)).timestamp())
 
-    all_fetched = service.client.get_activities(
-        after=after_ts,
-        per_page=per_page,
-        limit=max_activities
-    )
+    with span("strava_get_activities"):
+        all_fetched = service.client.get_activities(
+            after=after_ts,
+            per_page=per_page,
+            limit=max_activities
+        )
 
     all_fetched = [a for a in all_fetched if a.get("type") == "Run"]
 
@@ -82,10 +87,11 @@ def run_full_ingestion_and_enrichment(
         return {"synced": 0, "enriched": 0}
 
     fetched_ids = [a["id"] for a in all_fetched]
-    existing_ids = {
-        r[0]
-        for r in session.query(Activity.activity_id).filter(Activity.activity_id.in_(fetched_ids)).all()
-    }
+    with span("select_existing_ids"):
+        existing_ids = {
+            r[0]
+            for r in session.query(Activity.activity_id).filter(Activity.activity_id.in_(fetched_ids)).all()
+        }
     new_activities = [a for a in all_fetched if a["id"] not in existing_ids]
 
     if not new_activities:
@@ -93,7 +99,8 @@ def run_full_ingestion_and_enrichment(
         return {"synced": 0, "enriched": 0}
 
     logger.info(f"⬇️ Ingesting {len(new_activities)} new activities...")
-    ActivityDAO.upsert_activities(session, athlete_id, new_activities)
+    with span("upsert_activities"):
+        ActivityDAO.upsert_activities(session, athlete_id, new_activities)
     logger.info(f"✅ Synced {len(new_activities)} activities")
 
     enriched = run_enrichment_batch(session, athlete_id, batch_size=batch_size)
@@ -102,15 +109,18 @@ def run_full_ingestion_and_enrichment(
     logger.info(f"🎯 Ingestion + enrichment complete for athlete {athlete_id}")
     return {"synced": len(new_activities), "enriched": enriched}
 
+@timed_job("single_activity_sync", "athlete_id", "activity_id")
 def ingest_specific_activity(session, athlete_id, activity_id):
     logger.info(f"⏳ Ingesting specific activity {activity_id} for athlete {athlete_id}")
     service = ActivityIngestionService(session, athlete_id)
-    activity_data = service.client.get_activity(activity_id)
+    with span("strava_get_activity"):
+        activity_data = service.client.get_activity(activity_id)
     if not activity_data:
         logger.warning(f"Activity {activity_id} not found for athlete {athlete_id}")
         return 0
 
-    ActivityDAO.upsert_activities(session, athlete_id, [activity_data])
+    with span("upsert_activities"):
+        ActivityDAO.upsert_activities(session, athlete_id, [activity_data])
     logger.info(f"✅ Activity {activity_id} upserted")
 
     try:
@@ -121,15 +131,17 @@ def ingest_specific_activity(session, athlete_id, activity_id):
 
     return 1
 
+@timed_job("date_range_sync", "athlete_id")
 def ingest_between_dates(session, athlete_id, start_date: datetime, end_date: datetime, batch_size=10, max_activities=None, per_page=200):
     logger.info(f"⏳ Ingesting activities for athlete {athlete_id} between {start_date} and {end_date}")
     service = ActivityIngestionService(session, athlete_id)
-    activities = service.client.get_activities(
-        after=int(start_date.timestamp()),
-        before=int(end_date.timestamp()),
-        per_page=per_page,
-        limit=max_activities
-    )
+    with span("strava_get_activities"):
+        activities = service.client.get_activities(
+            after=int(start_date.timestamp()),
+            before=int(end_date.timestamp()),
+            per_page=per_page,
+            limit=max_activities
+        )
 
     activities = [a for a in activities if a.get("type") == "Run"]
 
@@ -137,21 +149,33 @@ def ingest_between_dates(session, athlete_id, start_date: datetime, end_date: da
         logger.warning(f"No Run activities found between dates for athlete {athlete_id}")
         return 0
 
-    ActivityDAO.upsert_activities(session, athlete_id, activities)
+    with span("upsert_activities"):
+        ActivityDAO.upsert_activities(session, athlete_id, activities)
     logger.info(f"✅ Upserted {len(activities)} activities")
 
-    count = 0
-    for act in activities:
+    queued = 0
+    batch = EnrichmentBatch(session)
+    try:
+        for act in activities:
+            try:
+                with span("enrich_activity"):
+                    enrich_one_activity_with_refresh(session, athlete_id, act["id"], batch=batch)
+                queued += 1
+                if queued % batch_size == 0:
+                    logger.info(f"Processed {queued} activities for enrichment")
+            except Exception:
+                continue
+    except BaseException:
+        # Persist whatever was enriched, without masking the original error
         try:
-            enrich_one_activity_with_refresh(session, athlete_id, act["id"])
-            count += 1
-            if count % batch_size == 0:
-                logger.info(f"Processed {count} activities for enrichment")
-        except Exception:
-            continue
-
-    logger.info(f"✅ Enriched {count} activities")
-    return count
+            batch.flush()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass  # flush() logged the unwritten ids
+        raise
+    batch.flush()
+
+    logger.info(f"✅ Enriched {batch.flushed} activities")
+    return batch.flushed
 
 def ingest_today(session, athlete_id):
     today = datetime.utcnow()
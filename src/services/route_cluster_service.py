@@ -0,0 +1,170 @@
+"""
+Similar-run search and incremental course clustering over activity_routes.
+
+Matching uses the route fingerprint index (see utils/route_fingerprint):
+candidates come from an index range scan on start cell and length, then
+shapes are compared exactly. Clustering is leader-based and incremental:
+each unclustered route, oldest first, joins the cluster of its closest
+already-clustered match within ROUTE_MATCH_METERS, or starts a new cluster
+named after itself. Existing assignments never move, so the job only does
+work for routes added since its last run. It reads the athlete's
+fingerprints once, matches in memory and writes all assignments in one
+bulk UPDATE, so a large archive import costs a fixed number of queries.
+"""
+
+from collections import defaultdict
+
+import src.utils.config as config
+from src.db.dao.route_dao import (
+    bulk_assign_clusters, fingerprint_columns, get_candidate_routes, get_cluster_runs, get_cluster_summaries,
+    get_comparable_routes, get_route_fingerprint, get_routes_without_fingerprint, get_runs, update_route_columns,
+)
+from src.utils import polyline
+from src.utils.logger import get_logger
+from src.utils.route_fingerprint import candidate_cells, distance_range, shape_deviation
+from src.utils.stats_cache import bump_version
+from src.utils.timing import track_job
+
+log = get_logger(__name__)
+
+
+def _shape(encoded):
+    shape = polyline.decode(encoded) if encoded else None
+    return shape if shape is not None and len(shape) == config.ROUTE_SHAPE_POINTS else None
+
+
+def _closest(shape, candidates, shapes) -> list[tuple[float, object]]:
+    """
+    (deviation, candidate) within ROUTE_MATCH_METERS, closest first.
+    `shapes(candidate)` returns its decoded shape or None.
+    """
+    matches = []
+    for candidate in candidates:
+        other = shapes(candidate)
+        if other is None:
+            continue
+        deviation = shape_deviation(shape, other)
+        if deviation <= config.ROUTE_MATCH_METERS:
+            matches.append((deviation, candidate))
+    matches.sort(key=lambda m: m[0])
+    return matches
+
+
+def find_matches(session, athlete_id, route) -> list[tuple[float, object]]:
+    """
+    (deviation in meters, candidate row) for routes on the same course as
+    `route` (a row with activity_id, distance, start_cell, end_cell, shape),
+    closest first.
+    """
+    shape = _shape(route.shape)
+    if shape is None:
+        return []
+    min_distance, max_distance = distance_range(route.distance)
+    candidates = get_candidate_routes(
+        session, athlete_id, candidate_cells(route.start_cell, route.end_cell),
+        min_distance, max_distance, exclude_id=route.activity_id,
+    )
+    return _closest(shape, candidates, lambda c: _shape(c.shape))
+
+
+def backfill_fingerprints(session, athlete_id) -> int:
+    """
+    Fingerprint routes stored before fingerprints existed. Does not commit.
+    """
+    rows = get_routes_without_fingerprint(session, athlete_id)
+    for activity_id, encoded in rows:
+        update_route_columns(session, activity_id, fingerprint_columns(polyline.decode(encoded)))
+    return len(rows)
+
+
+def assign_clusters(routes) -> dict:
+    """
+    {activity_id: cluster_id} for the unclustered routes among `routes`
+    (rows with activity_id, distance, start_cell, end_cell, shape,
+    cluster_id, oldest first), matched against the clustered ones and those
+    assigned earlier in the same pass.
+    """
+    by_start = defaultdict(list)
+    clusters, shapes, assignments = {}, {}, {}
+    for route in routes:
+        shapes[route.activity_id] = _shape(route.shape)
+        if route.cluster_id is not None:
+            clusters[route.activity_id] = route.cluster_id
+            by_start[route.start_cell].append(route)
+
+    for route in routes:
+        shape = shapes[route.activity_id]
+        if route.cluster_id is not None or shape is None:
+            continue
+        min_distance, max_distance = distance_range(route.distance)
+        candidates = [
+            c for cell in candidate_cells(route.start_cell, route.end_cell) for c in by_start.get(cell, ())
+            if min_distance <= c.distance <= max_distance
+        ]
+        matches = _closest(shape, candidates, lambda c: shapes[c.activity_id])
+        cluster_id = clusters[matches[0][1].activity_id] if matches else route.activity_id
+        clusters[route.activity_id] = assignments[route.activity_id] = cluster_id
+        by_start[route.start_cell].append(route)
+    return assignments
+
+
+def cluster_routes(session, athlete_id) -> int:
+    """
+    Assign every unclustered route of the athlete to a course cluster and
+    commit. Returns the number of routes assigned.
+    """
+    with track_job("cluster_routes", athlete_id=athlete_id):
+        backfill_fingerprints(session, athlete_id)
+        assignments = assign_clusters(get_comparable_routes(session, athlete_id))
+        if assignments:
+            bulk_assign_clusters(session, assignments)
+            bump_version(session, athlete_id)
+        session.commit()
+    log.info("✅ Clustered %d routes for athlete %s", len(assignments), athlete_id)
+    return len(assignments)
+
+
+def _run_dict(row, deviation=None) -> dict:
+    run = {
+        "activity_id": row.activity_id,
+        "name": row.name,
+        "start_date": row.start_date.isoformat() if row.start_date else None,
+        "distance": row.distance,
+        "moving_time": row.moving_time,
+        "average_speed": row.average_speed,
+        "average_heartrate": row.average_heartrate,
+    }
+    if deviation is not None:
+        run["deviation_m"] = round(deviation, 1)
+    return run
+
+
+def similar_runs(session, athlete_id, activity_id, limit=20) -> list[dict] | None:
+    """
+    Runs on the same course as an activity, closest shape first; None when
+    the activity has no comparable route.
+    """
+    route = get_route_fingerprint(session, athlete_id, activity_id)
+    if route is None or route.shape is None:
+        return None
+    matches = find_matches(session, athlete_id, route)[:limit]
+    runs = {r.activity_id: r for r in get_runs(session, [m.activity_id for _, m in matches])}
+    return [_run_dict(runs[m.activity_id], deviation) for deviation, m in matches if m.activity_id in runs]
+
+
+def list_clusters(session, athlete_id, min_runs=2) -> list[dict]:
+    return [
+        {
+            "cluster_id": row.cluster_id,
+            "runs": row.runs,
+            "distance": round(row.distance, 1) if row.distance is not None else None,
+            "first_run": row.first_run.isoformat() if row.first_run else None,
+            "last_run": row.last_run.isoformat() if row.last_run else None,
+            "best_moving_time": row.best_moving_time,
+        }
+        for row in get_cluster_summaries(session, athlete_id, min_runs)
+    ]
+
+
+def cluster_detail(session, athlete_id, cluster_id) -> list[dict]:
+    return [_run_dict(row) for row in get_cluster_runs(session, athlete_id, cluster_id)]
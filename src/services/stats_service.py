@@ -0,0 +1,105 @@
+"""
+JSON-ready views over ActivityStatsDAO, shared by the /stats routes and
+activity_query_cli.
+
+Each stat is registered with the query parameters it accepts; cached_stat()
+serves it through the per-athlete stats cache.
+"""
+
+from datetime import datetime, timedelta
+
+from src.db.dao.activity_stats_dao import ActivityStatsDAO
+from src.utils.stats_cache import stats_cache
+
+
+# Activity columns trend_metric may average
+TREND_METRICS = (
+    "distance", "moving_time", "elapsed_time", "total_elevation_gain",
+    "average_speed", "max_speed", "average_heartrate", "max_heartrate", "suffer_score", "calories",
+)
+
+
+def activity_summary(a) -> dict | None:
+    if a is None:
+        return None
+    pace = a.moving_time / (a.distance / 1000) / 60 if a.distance and a.moving_time else None
+    return {
+        "activity_id": a.activity_id,
+        "name": a.name,
+        "start_date": a.start_date.isoformat() if a.start_date else None,
+        "distance_km": round((a.distance or 0) / 1000, 2),
+        "moving_time": a.moving_time,
+        "pace": round(pace, 2) if pace else None,  # min/km
+    }
+
+
+def _recent_activities(session, athlete_id, days):
+    return [activity_summary(a) for a in ActivityStatsDAO.get_recent_activities(session, athlete_id, days)]
+
+
+def _total_distance(session, athlete_id, days):
+    end = datetime.utcnow()
+    meters = ActivityStatsDAO.get_total_distance(session, athlete_id, end - timedelta(days=days), end)
+    return {"distance_km": round(meters / 1000, 2)}
+
+
+def _average_pace(session, athlete_id, days):
+    seconds_per_km = ActivityStatsDAO.get_average_pace(session, athlete_id, days)
+    return {"pace": round(seconds_per_km / 60, 2) if seconds_per_km else None}  # min/km
+
+
+def _weekly_summary(session, athlete_id, weeks):
+    return [
+        {
+            "year": int(r["year"]),
+            "week": int(r["week"]),
+            "total_distance_km": round((r["total_distance"] or 0) / 1000, 2),
+            "total_time_hr": round((r["total_time"] or 0) / 3600, 2),
+        }
+        for r in ActivityStatsDAO.get_weekly_summary(session, athlete_id, weeks)
+    ]
+
+
+def _trend_metric(session, athlete_id, metric, window):
+    return [
+        {"period": r["week"].date().isoformat(), "value": r["avg_metric"]}
+        for r in ActivityStatsDAO.get_trend_metrics(session, athlete_id, metric, window)
+    ]
+
+
+# name -> (function, accepted query parameters)
+STATS = {
+    "recent_activities": (_recent_activities, ("days",)),
+    "total_distance": (_total_distance, ("days",)),
+    "average_pace": (_average_pace, ("days",)),
+    "longest_run": (lambda s, a, days: activity_summary(ActivityStatsDAO.get_longest_run(s, a, days)), ("days",)),
+    "fastest_run": (lambda s, a, days: activity_summary(ActivityStatsDAO.get_fastest_run(s, a, days)), ("days",)),
+    "weekly_summary": (_weekly_summary, ("weeks",)),
+    "hr_zone_summary": (ActivityStatsDAO.get_hr_zone_summary, ("days",)),
+    "treadmill_stats": (ActivityStatsDAO.get_treadmill_vs_outdoor_stats, ("days",)),
+    "weekday_pattern": (ActivityStatsDAO.get_runs_by_weekday, ("days",)),
+    "time_of_day": (ActivityStatsDAO.get_time_of_day_stats, ("days",)),
+    "trend_metric": (_trend_metric, ("metric", "window")),
+}
+
+
+def compute_stat(session, athlete_id: int, name: str, params: dict):
+    """
+    Run stat `name` with the parameters it accepts. Raises KeyError for
+    unknown stats and ValueError for invalid parameters.
+    """
+    fn, accepted = STATS[name]
+    if "metric" in accepted and params["metric"] not in TREND_METRICS:
+        raise ValueError(f"metric must be one of {', '.join(TREND_METRICS)}")
+    return fn(session, athlete_id, *(params[p] for p in accepted))
+
+
+def cached_stat(session, athlete_id: int, name: str, params: dict):
+    """
+    compute_stat() through the stats cache. Returns (value, cache_hit).
+    """
+    _, accepted = STATS[name]
+    query = (name, tuple(params[p] for p in accepted))
+    return stats_cache.get_or_compute(
+        session, athlete_id, query, lambda: compute_stat(session, athlete_id, name, params)
+    )
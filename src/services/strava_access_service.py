@@ -1,6 +1,11 @@
 import requests
 import time
 from src.utils.config import STRAVA_API_BASE_URL
+from src.utils.metrics import observe_strava_response
+from src.utils.logger import get_logger
+
+# Per-request debug lines are hot-path noise during a full sync; keep 1 in 10
+logger = get_logger(__name__, debug_sample_rate=0.1)
 
 
 class StravaClient:
@@ -13,27 +18,26 @@ class StravaClient:
 
         headers = {"Authorization": f"Bearer {self.access_token}"}
 
-        print(f"📤 Strava Request: {method} {url}")
-        print(f"📤 Headers: {headers}")
-        if "params" in kwargs:
-            print(f"📤 Params: {kwargs['params']}")
+        logger.debug("📤 Strava Request: %s %s params=%s", method, url, kwargs.get("params"))
 
         for attempt in range(max_retries):
+            start = time.perf_counter()
             response = requests.request(
                 method,
                 url,
                 headers=headers,
                 **kwargs
             )
+            observe_strava_response(url, response, time.perf_counter() - start)
 
             if response.status_code == 429:
-                print(f"⚠️ Rate limit hit (429). Backing off {backoff} seconds...")
+                logger.warning("⚠️ Rate limit hit (429) on %s. Backing off %d seconds...", url, backoff)
                 time.sleep(backoff)
                 backoff *= 2
                 continue
 
             if response.status_code == 401:
-                print(f"❌ Unauthorized! Token: {self.access_token}")
+                logger.error("❌ Unauthorized (401) for %s %s", method, url)
 
             response.raise_for_status()
             return response.json()
@@ -99,14 +103,20 @@ class StravaClient:
         streams = {}
         for key in keys:
             raw = resp.get(key)
-            if isinstance(raw, dict) and "data" in raw:
+            if isinstance(raw, dict) and "data" in raw and key == "latlng":
+                # [lat, lng] pairs; coordinates can be negative
+                streams[key] = [
+                    [float(p[0]), float(p[1])] for p in raw["data"]
+                    if isinstance(p, (list, tuple)) and len(p) == 2
+                ]
+            elif isinstance(raw, dict) and "data" in raw:
                 try:
                     streams[key] = [
                         float(x) for x in raw["data"]
                         if isinstance(x, (int, float, str)) and str(x).replace('.', '', 1).isdigit()
                     ]
                 except Exception as e:
-                    print(f"Failed to convert stream {key}: {e}")
+                    logger.warning("⚠️ Failed to convert stream %s: %s", key, e)
                     streams[key] = []
             else:
                 streams[key] = []
@@ -140,13 +140,16 @@ def login_user(data):
     access_token = jwt.encode(token_payload, config.SECRET_KEY, algorithm="HS256")
     refresh_token = jwt.encode({"sub": "admin", "type": "refresh"}, config.JWT_SECRET, algorithm="HS256")
 
-    insert_token_sa(
-        session=session,
-        athlete_id=0,
-        access_token=access_token,
-        refresh_token=refresh_token,
-        expires_at=int(datetime.utcnow().timestamp()) + 3600,
-    )
+    try:
+        insert_token_sa(
+            session=session,
+            athlete_id=0,
+            access_token=access_token,
+            refresh_token=refresh_token,
+            expires_at=int(datetime.utcnow().timestamp()) + 3600,
+        )
+    finally:
+        session.close()
 
     return access_token, refresh_token
 
@@ -160,19 +163,22 @@ def refresh_token(encoded_refresh_token):
         raise PermissionError("Invalid or expired refresh token")
 
     session = get_session()
-    token_data = get_tokens_sa(session, config.ADMIN_ATHLETE_ID)
-    if not token_data:
-        raise PermissionError("No refresh token found")
-
-    new_tokens = refresh_token_static(token_data["refresh_token"])
-    insert_token_sa(
-        session=session,
-        athlete_id=config.ADMIN_ATHLETE_ID,
-        access_token=new_tokens["access_token"],
-        refresh_token=new_tokens["refresh_token"],
-        expires_at=new_tokens["expires_at"]
-    )
-    return new_tokens["access_token"]
+    try:
+        token_data = get_tokens_sa(session, config.ADMIN_ATHLETE_ID)
+        if not token_data:
+            raise PermissionError("No refresh token found")
+
+        new_tokens = refresh_token_static(token_data["refresh_token"])
+        insert_token_sa(
+            session=session,
+            athlete_id=config.ADMIN_ATHLETE_ID,
+            access_token=new_tokens["access_token"],
+            refresh_token=new_tokens["refresh_token"],
+            expires_at=new_tokens["expires_at"]
+        )
+        return new_tokens["access_token"]
+    finally:
+        session.close()
 
 
 def exchange_code_for_token(code):
@@ -0,0 +1,78 @@
+"""
+Maintains the per-athlete daily training_load table.
+
+update_training_load() recomputes from the day before the changed day
+forward, so enriching one activity costs O(days since that activity), not
+O(history). training_load_series() reads only the requested days.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select, func
+
+from src.db.dao.activity_stats_dao import ActivityStatsDAO
+from src.db.dao.training_load_dao import get_day_before, upsert_training_load
+from src.db.models.activities import Activity
+from src.utils.logger import get_logger
+from src.utils.timing import span
+from src.utils.training_load import LoadDay, activity_load, decay, roll_forward
+
+log = get_logger(__name__)
+
+
+def update_training_load(session, athlete_id: int, from_day: date, today: date | None = None, commit: bool = False) -> int:
+    """
+    Recompute daily load and CTL/ATL/TSB for `athlete_id` from `from_day`
+    through today, seeded from the last stored day before it. With no stored
+    history the sweep starts at the athlete's first activity.
+    Returns the number of days written.
+    """
+    today = today or date.today()
+    with span("training_load_update"):
+        seed = get_day_before(session, athlete_id, from_day)
+        if seed is not None:
+            start_day, prev_ctl, prev_atl = seed.day + timedelta(days=1), seed.ctl, seed.atl
+        else:
+            first = session.scalar(
+                select(func.min(Activity.start_date)).where(Activity.athlete_id == athlete_id)
+            )
+            if first is None:
+                return 0
+            start_day = first.date()
+            prev_ctl = prev_atl = 0.0
+
+        activities = session.scalars(
+            select(Activity).where(
+                Activity.athlete_id == athlete_id,
+                Activity.start_date >= datetime.combine(start_day, datetime.min.time())
+            )
+        ).all()
+
+        daily = defaultdict(float)
+        for a in activities:
+            daily[a.start_date.date()] += activity_load(a)
+
+        end_day = max([today, *daily.keys()])
+        days = roll_forward(start_day, prev_ctl, prev_atl, daily, end_day)
+        written = upsert_training_load(session, athlete_id, days, commit=commit)
+
+    log.info("📈 Training load for athlete %s recomputed from %s (%d days)", athlete_id, start_day, len(days))
+    return written
+
+
+def training_load_series(session, athlete_id: int, start_date: date, end_date: date) -> list[LoadDay]:
+    """
+    Daily series for [start_date, end_date]. Days after the last stored row
+    (no training since) are decayed forward in memory rather than stored.
+    """
+    rows = ActivityStatsDAO.get_training_load(session, athlete_id, start_date, end_date)
+    series = [LoadDay(r.day, r.load, r.ctl, r.atl, r.tsb) for r in rows]
+
+    last = series[-1] if series else get_day_before(session, athlete_id, start_date)
+    if last is not None and last.day < end_date:
+        fill_from = max(last.day + timedelta(days=1), start_date)
+        # Jump over any rest days before the window in closed form
+        ctl, atl = decay(last.ctl, last.atl, (fill_from - last.day).days - 1)
+        series.extend(roll_forward(fill_from, ctl, atl, {}, end_date))
+    return series
@@ -0,0 +1,236 @@
+"""
+Parsers for recorded activity files (GPX, TCX, FIT, optionally gzipped) as
+found in a Strava bulk archive export.
+
+Each parser returns trackpoints as parallel lists, and
+`trackpoints_to_streams` turns them into the same stream dict the Strava
+streams API gives enrichment ("time", "distance", "velocity_smooth",
+"heartrate", plus "latlng" and "altitude"), so splits, best efforts and zones
+are computed by the same code for both sources.
+
+FIT needs the optional `fitparse` package.
+"""
+
+import gzip
+import io
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+SEMICIRCLE_TO_DEG = 180 / 2 ** 31
+# Samples in the centered moving average used for velocity_smooth
+SMOOTHING_WINDOW = 5
+# Same moving threshold (m/s) build_splits uses
+MOVING_SPEED = 0.5
+
+FILE_FORMATS = ("gpx", "tcx", "fit")
+
+
+def file_format(name: str) -> str | None:
+    """
+    "gpx", "tcx" or "fit" for names like 123.gpx or 123.fit.gz, else None.
+    """
+    parts = name.lower().split(".")
+    if parts and parts[-1] == "gz":
+        parts = parts[:-1]
+    return parts[-1] if len(parts) > 1 and parts[-1] in FILE_FORMATS else None
+
+
+def _parse_time(value: str) -> datetime:
+    ts = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _children(elem, name):
+    return [c for c in elem if _local(c.tag) == name]
+
+
+def _find(elem, *path):
+    for name in path:
+        found = _children(elem, name)
+        if not found:
+            return None
+        elem = found[0]
+    return elem
+
+
+def _float(elem):
+    try:
+        return float(elem.text) if elem is not None and elem.text else None
+    except ValueError:
+        return None
+
+
+def _empty_points():
+    return {"time": [], "lat": [], "lng": [], "distance": [], "altitude": [], "heartrate": []}
+
+
+def parse_gpx(data: bytes) -> dict:
+    points = _empty_points()
+    for trkpt in ET.fromstring(data).iter():
+        if _local(trkpt.tag) != "trkpt":
+            continue
+        when = _find(trkpt, "time")
+        if when is None or not when.text:
+            continue
+        points["time"].append(_parse_time(when.text))
+        points["lat"].append(float(trkpt.get("lat")))
+        points["lng"].append(float(trkpt.get("lon")))
+        points["distance"].append(None)
+        points["altitude"].append(_float(_find(trkpt, "ele")))
+        hr = next((e for e in trkpt.iter() if _local(e.tag) == "hr"), None)
+        points["heartrate"].append(_float(hr))
+    return points
+
+
+def parse_tcx(data: bytes) -> dict:
+    points = _empty_points()
+    for tp in ET.fromstring(data).iter():
+        if _local(tp.tag) != "Trackpoint":
+            continue
+        when = _find(tp, "Time")
+        if when is None or not when.text:
+            continue
+        points["time"].append(_parse_time(when.text))
+        points["lat"].append(_float(_find(tp, "Position", "LatitudeDegrees")))
+        points["lng"].append(_float(_find(tp, "Position", "LongitudeDegrees")))
+        points["distance"].append(_float(_find(tp, "DistanceMeters")))
+        points["altitude"].append(_float(_find(tp, "AltitudeMeters")))
+        points["heartrate"].append(_float(_find(tp, "HeartRateBpm", "Value")))
+    return points
+
+
+def parse_fit(data: bytes) -> dict:
+    # Imported here: fitparse is optional
+    from fitparse import FitFile  # pylint: disable=import-outside-toplevel
+
+    points = _empty_points()
+    for record in FitFile(io.BytesIO(data)).get_messages("record"):
+        values = record.get_values()
+        when = values.get("timestamp")
+        if when is None:
+            continue
+        lat, lng = values.get("position_lat"), values.get("position_long")
+        points["time"].append(when if when.tzinfo else when.replace(tzinfo=timezone.utc))
+        points["lat"].append(lat * SEMICIRCLE_TO_DEG if lat is not None else None)
+        points["lng"].append(lng * SEMICIRCLE_TO_DEG if lng is not None else None)
+        points["distance"].append(values.get("distance"))
+        points["altitude"].append(values.get("enhanced_altitude", values.get("altitude")))
+        points["heartrate"].append(values.get("heart_rate"))
+    return points
+
+
+PARSERS = {"gpx": parse_gpx, "tcx": parse_tcx, "fit": parse_fit}
+
+
+def parse_activity_file(name: str, data: bytes) -> dict:
+    """
+    Trackpoints from a file's bytes; the format comes from its name.
+    """
+    fmt = file_format(name)
+    if fmt is None:
+        raise ValueError(f"Unsupported activity file: {name}")
+    if name.lower().endswith(".gz"):
+        data = gzip.decompress(data)
+    # Some exporters pad XML files with leading whitespace, which expat rejects
+    return PARSERS[fmt](data.lstrip() if fmt != "fit" else data)
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def _column(values) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _cumulative_distance(points) -> np.ndarray:
+    recorded = _column(points["distance"])
+    if len(recorded) and not np.isnan(recorded).all():
+        # Device distance: carry the last value over gaps, never decrease
+        filled = np.where(np.isnan(recorded), -np.inf, recorded)
+        return np.maximum(np.maximum.accumulate(filled), 0.0)
+    lat, lng = _column(points["lat"]), _column(points["lng"])
+    steps = np.nan_to_num(haversine(lat[:-1], lng[:-1], lat[1:], lng[1:]))
+    return np.concatenate([[0.0], np.cumsum(steps)])
+
+
+def trackpoints_to_streams(points: dict) -> dict:
+    """
+    Stream dict in Strava's shape. Empty when there are fewer than two points.
+    """
+    if len(points["time"]) < 2:
+        return {}
+    start = points["time"][0]
+    time = np.array([(t - start).total_seconds() for t in points["time"]])
+    distance = _cumulative_distance(points)
+
+    dt = np.diff(time)
+    raw_speed = np.divide(np.diff(distance), dt, out=np.zeros_like(dt), where=dt > 0)
+    raw_speed = np.concatenate([[0.0], raw_speed])
+    kernel = np.ones(SMOOTHING_WINDOW) / SMOOTHING_WINDOW
+    padded = np.pad(raw_speed, SMOOTHING_WINDOW // 2, mode="edge")
+    velocity = np.convolve(padded, kernel, mode="valid")
+
+    streams = {
+        "time": time.tolist(),
+        "distance": np.round(distance, 1).tolist(),
+        "velocity_smooth": np.round(velocity, 3).tolist(),
+    }
+    hr = _column(points["heartrate"])
+    if not np.isnan(hr).all():
+        # Fill dropouts from the previous reading so stream lengths line up
+        idx = np.where(np.isnan(hr), 0, np.arange(len(hr)))
+        hr = hr[np.maximum.accumulate(idx)]
+        streams["heartrate"] = np.nan_to_num(hr).tolist()
+    altitude = _column(points["altitude"])
+    if not np.isnan(altitude).all():
+        streams["altitude"] = altitude.tolist()
+    if any(lat is not None for lat in points["lat"]):
+        streams["latlng"] = [
+            [lat, lng] if lat is not None and lng is not None else None
+            for lat, lng in zip(points["lat"], points["lng"])
+        ]
+    return streams
+
+
+def stream_summary(streams: dict) -> dict:
+    """
+    Activity-level fields derivable from streams, keyed like a Strava activity payload.
+    """
+    time = np.asarray(streams["time"], dtype=float)
+    distance = np.asarray(streams["distance"], dtype=float)
+    velocity = np.asarray(streams["velocity_smooth"], dtype=float)
+    dt = np.diff(time)
+    moving_time = float(dt[velocity[1:] > MOVING_SPEED].sum())
+
+    summary = {
+        "distance": float(distance[-1]),
+        "elapsed_time": int(round(time[-1])),
+        "moving_time": int(round(moving_time)),
+        "average_speed": round(float(distance[-1]) / moving_time, 3) if moving_time > 0 else None,
+        "max_speed": round(float(velocity.max()), 3),
+        "average_heartrate": None,
+        "max_heartrate": None,
+        "total_elevation_gain": None,
+    }
+    if "heartrate" in streams:
+        hr = np.asarray(streams["heartrate"], dtype=float)
+        hr = hr[hr > 0]
+        if hr.size:
+            summary["average_heartrate"] = round(float(hr.mean()), 1)
+            summary["max_heartrate"] = float(hr.max())
+    if "altitude" in streams:
+        altitude = _column(streams["altitude"])
+        altitude = altitude[~np.isnan(altitude)]
+        if altitude.size > 1:
+            summary["total_elevation_gain"] = round(float(np.clip(np.diff(altitude), 0, None).sum()), 1)
+    return summary
@@ -0,0 +1,325 @@
+"""
+Per-athlete retrieval index over activity history for /ask.
+
+Each activity, and each ISO week of activities, is turned into a bag of
+descriptive tokens (name words, type, year, month, season, weekday,
+distance and pace buckets) hashed into a fixed-size vector. Questions are
+tokenised the same way, with "this/last year" resolved to actual years, and
+the top-k entries by cosine similarity are returned for the prompt.
+
+Indexes live in memory per worker and are built from the athlete's
+activities on first use. When ACTIVITY_INDEX_DIR is set they are also
+persisted as one .npz matrix per athlete, so other workers and restarts
+pick them up without rebuilding. ActivityDAO.upsert_activities keeps
+existing indexes current via update_index(); a query only loads the full
+history when the index's activity count disagrees with the database.
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from datetime import date, datetime
+
+import numpy as np
+
+import src.utils.config as config
+
+DIM = 512
+
+ACTIVITY = 0
+WEEK = 1
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SEASONS = {12: "winter", 1: "winter", 2: "winter", 3: "spring", 4: "spring", 5: "spring",
+            6: "summer", 7: "summer", 8: "summer", 9: "autumn", 10: "autumn", 11: "autumn"}
+_SYNONYMS = {"fall": "autumn", "runs": "run", "races": "race", "weeks": "week", "weekly": "week",
+             "longest": "long", "fastest": "fast", "mileage": "volume"}
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+# ---------- features ----------
+
+def _token_slot(token):
+    # crc32 rather than hash(): str hashes are salted per process
+    return zlib.crc32(token.encode("utf-8")) % DIM
+
+
+def featurize(tokens) -> np.ndarray:
+    """
+    L2-normalised hashed bag-of-tokens vector.
+    """
+    vec = np.zeros(DIM, dtype=np.float32)
+    for token in set(tokens):
+        vec[_token_slot(token)] = 1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def _words(text):
+    return [_SYNONYMS.get(w, w) for w in _WORD.findall(str(text or "").lower())]
+
+
+def _date_tokens(d: date):
+    return [str(d.year), d.strftime("%B").lower(), _SEASONS[d.month]]
+
+
+def _distance_bucket(km):
+    if km >= 40:
+        return ["long", "marathon"]
+    if km >= 20:
+        return ["long", "half"]
+    if km >= 15:
+        return ["long"]
+    if km >= 8:
+        return ["medium"]
+    return ["short"]
+
+
+def _pace_bucket(km, minutes):
+    if not km or not minutes:
+        return []
+    pace = minutes / km  # min/km
+    if pace < 4.5:
+        return ["fast"]
+    if pace < 6.0:
+        return ["steady"]
+    return ["easy"]
+
+
+def activity_tokens(meta: dict):
+    d = date.fromisoformat(meta["date"])
+    return (
+        ["run"] + _words(meta.get("name")) + _words(meta.get("type"))
+        + _date_tokens(d) + [d.strftime("%A").lower()]
+        + _distance_bucket(meta["distance_km"]) + _pace_bucket(meta["distance_km"], meta["duration_min"])
+    )
+
+
+def week_tokens(meta: dict):
+    monday = date.fromisocalendar(int(meta["year"]), int(meta["week"]), 1)
+    km = (meta["total_distance"] or 0) / 1000
+    return ["week", "volume", "total"] + _date_tokens(monday) + (["high"] if km >= 60 else [])
+
+
+def query_tokens(question: str, today: date | None = None):
+    today = today or date.today()
+    text = question.lower()
+    text = re.sub(r"\blast year\b", str(today.year - 1), text)
+    text = re.sub(r"\bthis year\b", str(today.year), text)
+    text = re.sub(r"\bthis (spring|summer|autumn|fall|winter)\b", rf"\1 {today.year}", text)
+    return _words(text)
+
+
+# ---------- records ----------
+
+def _field(obj, name):
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+
+
+def activity_meta(record) -> dict | None:
+    """
+    Prompt-ready dict from an Activity row or upsert dict; None if undatable.
+    """
+    start = _field(record, "start_date")
+    if not start:
+        return None
+    return {
+        "activity_id": int(_field(record, "activity_id")),
+        "date": _as_date(start).isoformat(),
+        "distance_km": round(float(_field(record, "distance") or 0) / 1000, 2),
+        "duration_min": round(float(_field(record, "moving_time") or 0) / 60),
+        "name": _field(record, "name"),
+        "type": _field(record, "type"),
+    }
+
+
+# ---------- index ----------
+
+class ActivityIndex:
+    """
+    Row-per-entry vector matrix with activity and weekly-summary entries.
+    """
+
+    def __init__(self):
+        self._keys = []          # (kind, id)
+        self._meta = []          # parallel to _keys
+        self._rows = {}          # (kind, id) -> row
+        self._vectors = np.zeros((0, DIM), dtype=np.float32)
+        self.activity_count = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def activity_ids(self):
+        return {key for kind, key in self._keys if kind == ACTIVITY}
+
+    def _set_rows(self, entries):
+        new_vectors = []
+        for key, meta, vec in entries:
+            row = self._rows.get(key)
+            if row is None:
+                self._rows[key] = len(self._keys)
+                self._keys.append(key)
+                self.activity_count += key[0] == ACTIVITY
+                self._meta.append(meta)
+                new_vectors.append(vec)
+            else:
+                self._meta[row] = meta
+                self._vectors[row] = vec
+        if new_vectors:
+            self._vectors = np.vstack([self._vectors, np.stack(new_vectors)])
+
+    def upsert(self, records):
+        """
+        Add or replace activities, then recompute the weekly entries they touch.
+        """
+        # Last write wins if a page repeats an activity
+        metas = list({m["activity_id"]: m for m in (activity_meta(r) for r in records) if m}.values())
+        if not metas:
+            return 0
+        self._set_rows([((ACTIVITY, m["activity_id"]), m, featurize(activity_tokens(m))) for m in metas])
+
+        weeks = {date.fromisoformat(m["date"]).isocalendar()[:2] for m in metas}
+        totals = {w: {"year": w[0], "week": w[1], "total_distance": 0.0, "total_time": 0, "runs": 0} for w in weeks}
+        for (kind, _), meta in zip(self._keys, self._meta):
+            if kind != ACTIVITY:
+                continue
+            w = date.fromisoformat(meta["date"]).isocalendar()[:2]
+            if w in totals:
+                totals[w]["total_distance"] += meta["distance_km"] * 1000
+                totals[w]["total_time"] += meta["duration_min"] * 60
+                totals[w]["runs"] += 1
+        self._set_rows([
+            ((WEEK, w[0] * 100 + w[1]), t, featurize(week_tokens(t))) for w, t in totals.items()
+        ])
+        return len(metas)
+
+    def search(self, question: str, k: int = 10, today: date | None = None):
+        """
+        Top-k entries for `question`, best first. Each result is the stored
+        meta plus "kind" ("activity"/"week") and "score"; zero-score entries are dropped.
+        """
+        if not self._keys or k <= 0:
+            return []
+        scores = self._vectors @ featurize(query_tokens(question, today))
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {**self._meta[i], "kind": "week" if self._keys[i][0] == WEEK else "activity", "score": float(scores[i])}
+            for i in top if scores[i] > 0
+        ]
+
+    def save(self, path):
+        # Per-process name: workers may save the same athlete at once
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp,
+            kinds=np.array([k for k, _ in self._keys], dtype=np.int8),
+            ids=np.array([i for _, i in self._keys], dtype=np.int64),
+            vectors=self._vectors,
+            meta=np.array(json.dumps(self._meta)),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with np.load(path, allow_pickle=False) as data:
+            index._keys = list(zip(data["kinds"].tolist(), data["ids"].tolist()))
+            index._meta = json.loads(str(data["meta"]))
+            index._vectors = data["vectors"].astype(np.float32)
+        index._rows = {key: row for row, key in enumerate(index._keys)}
+        index.activity_count = sum(1 for kind, _ in index._keys if kind == ACTIVITY)
+        return index
+
+
+# ---------- per-athlete registry ----------
+
+def _index_path(athlete_id):
+    if not config.ACTIVITY_INDEX_DIR:
+        return None
+    return os.path.join(config.ACTIVITY_INDEX_DIR, f"{athlete_id}.npz")
+
+
+def _persist(athlete_id, index):
+    path = _index_path(athlete_id)
+    if path is None:
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    index.save(path)
+    return os.path.getmtime(path)
+
+
+def get_index(athlete_id):
+    """
+    Cached index for an athlete, reloading if another worker rewrote it on disk.
+    """
+    path = _index_path(athlete_id)
+    mtime = os.path.getmtime(path) if path and os.path.exists(path) else None
+    with _registry_lock:
+        cached = _registry.get(athlete_id)
+        if cached is not None and (mtime is None or cached[1] == mtime):
+            return cached[0]
+        if mtime is None:
+            return None
+        index = ActivityIndex.load(path)
+        _registry[athlete_id] = (index, mtime)
+        return index
+
+
+def update_index(athlete_id, records):
+    """
+    Incrementally add upserted activities to an athlete's index if one exists.
+    Athletes without an index are built on their next query instead.
+    """
+    index = get_index(athlete_id)
+    if index is None:
+        return 0
+    with _registry_lock:
+        count = index.upsert(records)
+        _registry[athlete_id] = (index, _persist(athlete_id, index))
+    return count
+
+
+def search(athlete_id, question, activity_count, load_activities, k=None, today=None):
+    """
+    Top-k retrieval for /ask. `activity_count` is the athlete's number of
+    activities in the database; only when the index disagrees (first query,
+    or writes this worker never saw) is `load_activities()` called for the
+    full history, and the index rebuilt or topped up from it.
+    """
+    k = config.ASK_RETRIEVAL_TOP_K if k is None else k
+    if k <= 0:
+        return []
+    index = get_index(athlete_id)
+    if index is None or index.activity_count != activity_count:
+        activities = load_activities()
+        with _registry_lock:
+            if index is None or index.activity_count > activity_count:
+                # Deleted activities can't be dropped in place
+                index = ActivityIndex()
+            indexed = index.activity_ids()
+            missing = [a for a in activities if int(_field(a, "activity_id")) not in indexed]
+            index.upsert(missing)
+            _registry[athlete_id] = (index, _persist(athlete_id, index))
+    # Under the lock so a concurrent update_index never shows a half-applied upsert
+    with _registry_lock:
+        return index.search(question, k, today)
+
+
+def clear():
+    with _registry_lock:
+        _registry.clear()
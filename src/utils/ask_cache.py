@@ -0,0 +1,123 @@
+"""
+In-process response cache for /ask.
+
+Entries are keyed on (athlete_id, normalised question, hash of the activity
+context and aggregates sent to the model), so any change to the athlete's
+data produces a new key even in workers that never saw the write.
+invalidate_athlete() is called after ActivityDAO.upsert_activities and
+enrichment writes commit, to drop stale entries early.
+
+An optional near-duplicate matcher reuses an answer for a differently
+worded question when word-set Jaccard similarity >= ASK_CACHE_FUZZY_THRESHOLD
+and the activity context is identical.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import src.utils.config as config
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalise_question(question: str) -> str:
+    """
+    Lowercase, drop punctuation and collapse whitespace.
+    """
+    return " ".join(_NON_WORD.sub(" ", question.lower()).split())
+
+
+def context_hash(activity_data) -> str:
+    """
+    Stable hash of the context included in the prompt.
+    """
+    payload = json.dumps(activity_data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class AskResponseCache:
+    """
+    Thread-safe LRU with TTL and per-athlete invalidation.
+    """
+
+    def __init__(self, ttl_seconds=3600, max_entries=1024, fuzzy_threshold=0.0, clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.fuzzy_threshold = fuzzy_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (athlete_id, question, ctx_hash) -> (expires_at, response)
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, athlete_id, question, ctx_hash):
+        """
+        Return a cached response, or None. `question` must already be normalised.
+        """
+        key = (athlete_id, question, ctx_hash)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+            if self.fuzzy_threshold > 0:
+                return self._get_similar(athlete_id, question, ctx_hash, now)
+        return None
+
+    def _get_similar(self, athlete_id, question, ctx_hash, now):
+        words = frozenset(question.split())
+        best_key, best_score = None, self.fuzzy_threshold
+        for key, (expires_at, _) in self._entries.items():
+            if key[0] != athlete_id or key[2] != ctx_hash or expires_at <= now:
+                continue
+            score = _jaccard(words, frozenset(key[1].split()))
+            if score >= best_score:
+                best_key, best_score = key, score
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][1]
+
+    def put(self, athlete_id, question, ctx_hash, response):
+        key = (athlete_id, question, ctx_hash)
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_athlete(self, athlete_id):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == athlete_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+ask_cache = AskResponseCache(
+    ttl_seconds=config.ASK_CACHE_TTL,
+    max_entries=config.ASK_CACHE_MAX_ENTRIES,
+    fuzzy_threshold=config.ASK_CACHE_FUZZY_THRESHOLD,
+)
+
+
+def invalidate_athlete(athlete_id):
+    ask_cache.invalidate_athlete(athlete_id)
@@ -0,0 +1,86 @@
+"""
+Fastest-effort computation over activity streams.
+
+For each standard distance, a two-pointer sweep over the cumulative
+distance/time streams finds the quickest window covering that distance in
+O(n). The start of each window is interpolated between samples so efforts
+are timed over exactly the target distance.
+"""
+
+from datetime import datetime
+
+# (label, meters)
+STANDARD_DISTANCES = [
+    ("400m", 400.0),
+    ("1k", 1000.0),
+    ("1 mile", 1609.344),
+    ("5k", 5000.0),
+    ("10k", 10000.0),
+    ("Half-Marathon", 21097.5),
+    ("Marathon", 42195.0),
+]
+
+
+def fastest_effort(distances, times, target):
+    """
+    Fastest time to cover `target` meters.
+    Returns (elapsed_seconds, start_index, end_index) or None if the stream is shorter.
+    """
+    n = min(len(distances), len(times))
+    if n < 2 or distances[n - 1] - distances[0] < target:
+        return None
+
+    best = None
+    i = 0
+    for j in range(1, n):
+        # Advance the start while the window would still cover the target
+        while i + 1 < j and distances[j] - distances[i + 1] >= target:
+            i += 1
+        covered = distances[j] - distances[i]
+        if covered < target:
+            continue
+
+        # Interpolate where, between samples i and i+1, exactly `target` remains
+        step = distances[i + 1] - distances[i]
+        frac = (covered - target) / step if step > 0 else 0.0
+        start_time = times[i] + frac * (times[i + 1] - times[i])
+        elapsed = times[j] - start_time
+        if best is None or elapsed < best[0]:
+            best = (elapsed, i, j)
+    return best
+
+
+def compute_best_efforts(activity_id, athlete_id, streams, start_date=None, distances=STANDARD_DISTANCES):
+    """
+    Best effort rows for one activity, ready for upsert_best_efforts.
+    """
+    raw_distance = streams.get("distance") or []
+    times = [float(t) for t in streams.get("time") or []]
+
+    # GPS distance can dip slightly; a running max keeps the sweep monotonic
+    cumulative = []
+    running = 0.0
+    for d in raw_distance:
+        running = max(running, float(d))
+        cumulative.append(running)
+
+    if isinstance(start_date, str):
+        start_date = datetime.fromisoformat(start_date.replace("Z", "+00:00")).replace(tzinfo=None)
+
+    efforts = []
+    for name, meters in distances:
+        result = fastest_effort(cumulative, times, meters)
+        if result is None:
+            continue
+        elapsed, start_index, end_index = result
+        efforts.append({
+            "athlete_id": athlete_id,
+            "activity_id": activity_id,
+            "name": name,
+            "distance": meters,
+            "elapsed_time": round(elapsed, 1),
+            "start_index": start_index,
+            "end_index": end_index,
+            "start_date": start_date,
+        })
+    return efforts
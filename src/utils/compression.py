@@ -0,0 +1,79 @@
+"""
+On-the-fly response compression for dynamic responses (JSON, HTML, text).
+
+Brotli is used when the optional `brotli` package is installed and the
+client prefers it, otherwise gzip. Skipped for small bodies, streamed
+responses (SSE from /ask/stream, send_file passthrough), bodies that are
+already encoded (precompressed static assets) and 304s.
+"""
+
+import gzip
+
+from flask import request
+
+import src.utils.config as config
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+
+
+def available_encodings() -> list[str]:
+    return ["br", "gzip"] if brotli else ["gzip"]
+
+
+def negotiate_encoding(available=None) -> str | None:
+    """
+    Best Accept-Encoding match among the encodings we can produce, or None.
+    """
+    return request.accept_encodings.best_match(available or available_encodings())
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=min(11, round(level * 11 / 9)))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def init_app(app):
+    """
+    Register the compression hook. Must run after other after_request hooks
+    that read the body, so register it before them (Flask runs them in reverse).
+    """
+    @app.after_request
+    def _compress(response):
+        if (
+            response.status_code < 200 or response.status_code >= 300 or response.status_code == 204
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        data = response.get_data()
+        if len(data) < config.COMPRESS_MIN_BYTES:
+            return response
+        encoding = negotiate_encoding()
+        if not encoding:
+            return response
+
+        response.set_data(compress(data, encoding, config.COMPRESS_LEVEL))
+        response.headers["Content-Encoding"] = encoding
+        # The encoded bytes differ from what a strong validator described
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
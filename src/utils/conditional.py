@@ -0,0 +1,95 @@
+"""
+Conditional GET for per-athlete data endpoints.
+
+The ETag is derived from the athlete's data version, today's date (windows
+like "last 30 days" move daily) and the request path, and Last-Modified from
+when that version last changed. A client whose copy is current gets a 304
+before the view runs, so none of its queries execute.
+
+The version comes from a shared stats version backend (postgres or redis),
+or with the in-process memory backend from the stats_versions watermark
+row, which writers bump in their own transaction. Only views without an
+athlete fall back to hashing the response body.
+"""
+
+import hashlib
+from datetime import datetime, time, timezone
+from functools import wraps
+
+from flask import make_response, request
+
+from src.db.db_session import get_session
+from src.utils.stats_cache import data_state
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def data_validators(session, athlete_id: int) -> tuple[str, datetime]:
+    """
+    (ETag, Last-Modified) for the current request and athlete data version.
+    """
+    version, updated_at = data_state(athlete_id, session)
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    path = hashlib.sha1(request.full_path.encode("utf-8")).hexdigest()[:12]
+    etag = f"a{athlete_id}-v{version}-{today.isoformat()}-{path}"
+
+    # Day rollover changes responses too, so Last-Modified is never before midnight
+    last_modified = datetime.combine(today, time.min, tzinfo=timezone.utc)
+    if updated_at is not None:
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        last_modified = max(last_modified, updated_at)
+    return etag, min(last_modified, now)
+
+
+def _client_is_current(etag: str, last_modified: datetime) -> bool:
+    # If-None-Match takes precedence; Last-Modified only has one-second resolution
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return since is not None and last_modified.replace(microsecond=0) <= since
+
+
+def conditional_athlete_get(get_athlete_id):
+    """
+    Decorate a GET view whose response depends only on one athlete's data.
+    `get_athlete_id(view_kwargs)` returns that athlete, or None to skip.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            athlete_id = get_athlete_id(kwargs)
+            validators = None
+            if athlete_id is not None:
+                session = get_session()
+                try:
+                    validators = data_validators(session, athlete_id)
+                finally:
+                    session.close()
+                if _client_is_current(*validators):
+                    resp = make_response("", 304)
+                    resp.set_etag(validators[0], weak=True)
+                    resp.headers["Cache-Control"] = CACHE_CONTROL
+                    return resp
+
+            resp = make_response(view(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+            if validators:
+                resp.set_etag(validators[0], weak=True)
+                resp.last_modified = validators[1]
+            else:
+                resp.add_etag()
+            resp.headers["Cache-Control"] = CACHE_CONTROL
+            return resp.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+def athlete_from_path(view_kwargs):
+    return view_kwargs.get("athlete_id")
+
+
+def athlete_from_query(view_kwargs):
+    return request.args.get("athlete_id", type=int)
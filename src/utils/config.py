@@ -27,11 +27,72 @@ ADMIN_ATHLETE_ID = 0
 
 # ----- Database -----
 DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))  # persistent connections per process
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 5))  # extra connections under burst, per process
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", 50))  # Postgres connections the web service may hold in total
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))  # seconds to wait for a pooled connection
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 5))  # seconds to establish a new Postgres connection
 
 # ----- Internal API / Jobs -----
 CRON_SECRET_KEY = os.getenv("CRON_SECRET_KEY")
 INTERNAL_API_KEY = os.getenv("INTERNAL_API_KEY")
 
+# ----- Enrichment -----
+ENRICH_COMMIT_EVERY = int(os.getenv("ENRICH_COMMIT_EVERY", 10))  # activities per transaction
+SPLIT_SCHEMES = os.getenv("SPLIT_SCHEMES", "km,mi")  # split distances: km, mi and/or custom meters like 400m
+HR_ZONES_SOURCE = os.getenv("HR_ZONES_SOURCE", "local")  # "local" (from streams) or "strava" (/zones endpoint)
+HR_ZONE_BOUNDS = os.getenv("HR_ZONE_BOUNDS", "114,133,152,171")  # default lower edges of zones 2-5, bpm
+PACE_ZONE_BOUNDS = os.getenv("PACE_ZONE_BOUNDS", "2.6,2.93,3.16,3.43")  # default lower edges of zones 2-5, m/s
+PACE_ZONE_EFFORT_DAYS = int(os.getenv("PACE_ZONE_EFFORT_DAYS", 180))  # best efforts used to derive thresholds
+
+# ----- Training load -----
+LOAD_THRESHOLD_SPEED = float(os.getenv("LOAD_THRESHOLD_SPEED", 3.33))  # m/s, ~5:00/km; pace-based load fallback
+
+# ----- /ask -----
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")  # "stub" for local/offline testing
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. a local fake LLM server
+ASK_CACHE_TTL = int(os.getenv("ASK_CACHE_TTL", 3600))  # seconds
+ASK_CACHE_MAX_ENTRIES = int(os.getenv("ASK_CACHE_MAX_ENTRIES", 1024))
+ASK_CACHE_FUZZY_THRESHOLD = float(os.getenv("ASK_CACHE_FUZZY_THRESHOLD", 0))  # 0 disables near-duplicate matching
+ASK_CONTEXT_TOKEN_BUDGET = int(os.getenv("ASK_CONTEXT_TOKEN_BUDGET", 1500))  # estimated prompt tokens
+ASK_CONTEXT_DAYS = int(os.getenv("ASK_CONTEXT_DAYS", 28))  # window for aggregates in the prompt
+ASK_RETRIEVAL_TOP_K = int(os.getenv("ASK_RETRIEVAL_TOP_K", 20))  # history entries retrieved per question; 0 disables
+ACTIVITY_INDEX_DIR = os.getenv("ACTIVITY_INDEX_DIR")  # persist retrieval indexes as .npz here; unset keeps them in memory
+
+# ----- Routes / heatmap -----
+FETCH_LATLNG = os.getenv("FETCH_LATLNG", "false").lower() == "true"  # fetch latlng streams during enrichment and store routes
+HEATMAP_MIN_ZOOM = int(os.getenv("HEATMAP_MIN_ZOOM", 3))
+HEATMAP_MAX_ZOOM = int(os.getenv("HEATMAP_MAX_ZOOM", 17))
+HEATMAP_SATURATION = int(os.getenv("HEATMAP_SATURATION", 20))  # runs through a pixel for full intensity
+HEATMAP_CACHE_TILES = int(os.getenv("HEATMAP_CACHE_TILES", 2048))  # in-memory tiles per worker
+HEATMAP_TILE_DIR = os.getenv("HEATMAP_TILE_DIR")  # persist tile counts as .npz here; unset keeps them in memory
+ROUTE_CELL_PRECISION = int(os.getenv("ROUTE_CELL_PRECISION", 6))  # geohash length for start/finish cells (6 is ~1.2 x 0.6 km)
+ROUTE_SHAPE_POINTS = int(os.getenv("ROUTE_SHAPE_POINTS", 32))  # points kept per route shape
+ROUTE_DISTANCE_TOLERANCE = float(os.getenv("ROUTE_DISTANCE_TOLERANCE", 0.1))  # fraction of length two runs of a course may differ by
+ROUTE_MATCH_METERS = float(os.getenv("ROUTE_MATCH_METERS", 100))  # max mean shape deviation for the same course
+ROUTE_MIN_DISTANCE = float(os.getenv("ROUTE_MIN_DISTANCE", 500))  # routes shorter than this (m) are not clustered or matched
+
+# ----- /stats -----
+STATS_CACHE_BACKEND = os.getenv("STATS_CACHE_BACKEND", "memory")  # where version counters live: memory, postgres or redis
+STATS_CACHE_REDIS_URL = os.getenv("STATS_CACHE_REDIS_URL")  # required for the redis backend
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", 300))  # seconds; bounds staleness from other processes with the memory backend
+STATS_CACHE_MAX_ENTRIES = int(os.getenv("STATS_CACHE_MAX_ENTRIES", 2048))
+
+# ----- HTTP -----
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", 1024))  # smaller responses are sent uncompressed
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", 6))  # gzip 1-9; brotli quality is mapped to 0-11
+
+# ----- Health checks -----
+READYZ_TIMEOUT_MS = int(os.getenv("READYZ_TIMEOUT_MS", 2000))  # pool checkout and query budget for /readyz
+READYZ_CACHE_SECONDS = float(os.getenv("READYZ_CACHE_SECONDS", 5))  # probes within this window reuse the last result
+
+# ----- Gunicorn (see gunicorn.conf.py) -----
+GUNICORN_WORKER_CLASS = os.getenv("GUNICORN_WORKER_CLASS", "gthread")  # sync, gthread or gevent
+GUNICORN_WORKERS = int(os.getenv("WEB_CONCURRENCY", 0))  # 0 derives from CPU count and DB_MAX_CONNECTIONS
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", 0))  # gthread only; 0 means DB_POOL_SIZE
+GUNICORN_TIMEOUT = int(os.getenv("GUNICORN_TIMEOUT", 120))  # seconds; covers a full non-streamed /ask completion
+GUNICORN_MAX_REQUESTS = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))  # recycle workers; 0 disables
+
 # ----- Misc -----
 PORT = int(os.getenv("PORT", 5000))
 IS_LOCAL = os.getenv("IS_LOCAL", "false").lower() == "true"
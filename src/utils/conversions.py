@@ -1,3 +1,5 @@
+import numpy as np
+
 def meters_to_miles(meters):
     return round(meters / 1609.344, 2) if meters is not None else None
 
@@ -45,3 +47,96 @@ def convert_metrics(data: dict, fields: list[str]) -> dict:
     if "elapsed_time" in fields:
         conversions["conv_elapsed_time"] = format_seconds_to_hms(safe_int(data.get("elapsed_time")))
     return conversions
+
+
+# ----- Batch (column-wise) conversions -----
+
+_METERS_PER_MILE = 1609.344
+_FEET_PER_METER = 3.28084
+_MPS_MIN_PER_MILE = 26.8224
+
+
+def _float_column(values):
+    """
+    Column -> float64 array with NaN for missing/invalid entries.
+    Falls back to safe_float per element only when the fast cast fails.
+    """
+    try:
+        return np.asarray(values).astype(np.float64)
+    except (ValueError, TypeError):
+        return np.array([np.nan if (f := safe_float(v)) is None else f for v in values], dtype=np.float64)
+
+
+def _int_column(values):
+    """
+    Column -> (int64 array, valid mask), truncating floats like int() does.
+    Strings go through safe_int so '12.5' stays invalid, as in the scalar path.
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iub":
+        return arr.astype(np.int64), np.ones(len(arr), dtype=bool)
+    if arr.dtype.kind == "f":
+        valid = np.isfinite(arr)
+        return np.where(valid, np.trunc(arr), 0).astype(np.int64), valid
+    ints = [safe_int(v) for v in values]
+    valid = np.array([i is not None for i in ints], dtype=bool)
+    return np.array([i if i is not None else 0 for i in ints], dtype=np.int64), valid
+
+
+def _round_like_python(arr, ndigits):
+    """
+    np.round, except values that sit on a rounding tie after scaling are
+    re-rounded with Python's round() so results match the scalar helpers exactly.
+    """
+    scale = 10.0 ** ndigits
+    scaled = arr * scale
+    out = np.round(scaled) / scale
+    with np.errstate(invalid="ignore"):
+        ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(ties):
+        out[i] = round(float(arr[i]), ndigits)
+    return out
+
+
+def _to_list(arr, valid):
+    out = arr.astype(object)
+    out[~valid] = None
+    return out.tolist()
+
+
+def _format_hms_column(values):
+    seconds, valid = _int_column(values)
+    minutes, sec = np.divmod(seconds, 60)
+    hours, minutes = np.divmod(minutes, 60)
+    return [
+        (f"{h}:{m:02}:{s:02}" if h > 0 else f"{m}:{s:02}") if ok else None
+        for h, m, s, ok in zip(hours.tolist(), minutes.tolist(), sec.tolist(), valid.tolist())
+    ]
+
+
+def convert_metrics_batch(columns: dict, fields: list[str]) -> dict:
+    """
+    Column-wise convert_metrics: `columns` maps the same input keys as
+    convert_metrics ('distance', 'elevation', ...) to equal-length sequences.
+    Returns conv_* keys mapped to lists, element-for-element identical to
+    calling convert_metrics on each row (NaN inputs are treated as missing).
+    """
+    conversions = {}
+    if "distance" in fields:
+        arr = _float_column(columns["distance"])
+        conversions["conv_distance"] = _to_list(_round_like_python(arr / _METERS_PER_MILE, 2), ~np.isnan(arr))
+    if "elevation" in fields:
+        arr = _float_column(columns["elevation"])
+        conversions["conv_elevation_feet"] = _to_list(_round_like_python(arr * _FEET_PER_METER, 1), ~np.isnan(arr))
+    for src, dst in (("average_speed", "conv_avg_speed"), ("max_speed", "conv_max_speed")):
+        if src in fields:
+            arr = _float_column(columns[src])
+            with np.errstate(invalid="ignore"):
+                positive = arr > 0
+            pace = np.divide(_MPS_MIN_PER_MILE, arr, out=np.zeros_like(arr), where=positive)
+            conversions[dst] = _to_list(_round_like_python(pace, 2), positive)
+    if "moving_time" in fields:
+        conversions["conv_moving_time"] = _format_hms_column(columns["moving_time"])
+    if "elapsed_time" in fields:
+        conversions["conv_elapsed_time"] = _format_hms_column(columns["elapsed_time"])
+    return conversions
@@ -0,0 +1,25 @@
+"""
+.env loading for the web entry points (src.app, gunicorn.conf.py).
+
+src.utils.config reads os.environ at import time, so this must run before
+config is first imported.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+ENV_FILES = {
+    "test": ".env.test",
+    "staging": ".env.staging",
+    "production": ".env.prod",
+}
+
+
+def load_environment() -> str:
+    """
+    Load the .env file for FLASK_ENV and return its name.
+    """
+    env_path = ENV_FILES.get(os.environ.get("FLASK_ENV", "production"), ".env")
+    load_dotenv(env_path, override=True)
+    return env_path
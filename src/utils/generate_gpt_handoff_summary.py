@@ -1,6 +1,3 @@
-from docx import Document
-from docx.shared import Pt
-
 OUTPUT_DOCX = "SmartCoach_GPT_Handoff_Summary_CLEAN.docx"
 
 def add_heading(doc, text, level):
@@ -10,6 +7,8 @@ def add_paragraph(doc, text):
     doc.add_paragraph(text)
 
 def generate_gpt_handoff_summary():
+    from docx import Document  # python-docx only loads when a summary is written
+
     doc = Document()
 
     add_heading(doc, "✅ SmartCoach – GPT Handoff Summary", level=1)
@@ -1,8 +1,22 @@
-import openai
 import os
+import time
 from datetime import datetime
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
+import src.utils.config as config
+from src.utils.logger import get_logger
+from src.utils.metrics import observe_openai_call
+from src.utils.prompt_context import build_prompt
+
+logger = get_logger(__name__)
+
+
+def _openai():
+    """
+    Import the OpenAI SDK on first use; it is the slowest import in the app
+    and only /ask needs it.
+    """
+    import openai
+    return openai
 
 
 def parse_date_safe(date_str: str) -> datetime:
@@ -18,30 +32,46 @@ def parse_date_safe(date_str: str) -> datetime:
     raise ValueError(f"Unsupported date format: {date_str}")
 
 
-def format_prompt(user_question: str, activities: list[dict]) -> str:
+def format_prompt(user_question: str, activities: list[dict], aggregates: dict | None = None,
+                  token_budget: int | None = None) -> str:
     """
     Format a prompt string for GPT using the user's question and a list of activity records.
     Always returns structured prompt for coaching assistant, even if empty input.
+    Context is packed into ASK_CONTEXT_TOKEN_BUDGET; see src.utils.prompt_context.
     """
-    prompt = "You are a smart coaching assistant helping a runner improve.\n\n"
-    prompt += "ACTIVITIES:\n"
+    return build_prompt(user_question, activities, aggregates, token_budget).prompt
 
-    if not activities:
-        prompt += "[No activities available]\n"
-    else:
-        for i, a in enumerate(activities, start=1):
-            prompt += f"[{i}] date: {a['date']}, distance_km: {a['distance_km']}, duration_min: {a['duration_min']}\n"
 
-    prompt += "\nUSER QUESTION:\n"
-    prompt += user_question.strip()
+def stub_gpt_response(prompt: str) -> str:
+    """
+    Deterministic offline stand-in for the model (LLM_BACKEND=stub).
+    """
+    question = prompt.rsplit("USER QUESTION:", 1)[-1].strip()
+    return f"[stub] {question}"
+
 
-    return prompt
+_client = None
+
+
+def _get_client():
+    """
+    Shared OpenAI 1.x client; OPENAI_BASE_URL points it at a local/fake server.
+    """
+    global _client
+    if _client is None:
+        _client = _openai().OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=config.OPENAI_BASE_URL)
+    return _client
 
 
 def get_gpt_response(prompt: str) -> str:
+    if config.LLM_BACKEND == "stub":
+        return stub_gpt_response(prompt)
+
+    model = "gpt-4o"
+    start = time.perf_counter()
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o",
+        response = _get_client().chat.completions.create(
+            model=model,
             messages=[
                 {"role": "system", "content": "You are a helpful fitness assistant."},
                 {"role": "user", "content": prompt}
@@ -49,9 +79,52 @@ def get_gpt_response(prompt: str) -> str:
             temperature=0.7,
             max_tokens=2000
         )
-        return response['choices'][0]['message']['content'].strip()
+        usage = response.usage.model_dump() if response.usage else None
+        observe_openai_call(model, time.perf_counter() - start, usage=usage)
+        return (response.choices[0].message.content or "").strip()
     except Exception as e:
-        import traceback
-        print("GPT API call failed:", e)
-        traceback.print_exc()
+        observe_openai_call(model, time.perf_counter() - start, outcome="error")
+        logger.exception("❌ GPT API call failed: %s", e)
         return f"❌ GPT error: {e}"
+
+
+def stream_gpt_response(prompt: str):
+    """
+    Yield completion text chunks as they arrive.
+    Closing the generator (e.g. on client disconnect) closes the upstream HTTP stream.
+    """
+    if config.LLM_BACKEND == "stub":
+        for i, word in enumerate(stub_gpt_response(prompt).split(" ")):
+            yield word if i == 0 else f" {word}"
+        return
+
+    model = "gpt-4o"
+    start = time.perf_counter()
+    usage = None
+    outcome = "ok"
+    stream = _get_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": "You are a helpful fitness assistant."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        max_tokens=2000,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    try:
+        for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage.model_dump()
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    except GeneratorExit:
+        outcome = "cancelled"
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        stream.close()
+        observe_openai_call(model, time.perf_counter() - start, usage=usage, outcome=outcome)
@@ -0,0 +1,258 @@
+"""
+Per-athlete route heatmap tiles (256px Web Mercator, XYZ scheme).
+
+A tile keeps a per-pixel count of how many of the athlete's routes cross
+it, plus the version of each route already drawn. Serving a tile compares
+those with the routes overlapping the tile now: only new routes are
+decoded and rasterised into the existing counts (a removed or re-uploaded
+route forces a rebuild), and the PNG is re-encoded only when the counts
+changed. Each route adds at most 1 per pixel, so the colour scale is
+"number of runs".
+
+Tiles live in memory per worker (LRU of HEATMAP_CACHE_TILES). When
+HEATMAP_TILE_DIR is set tiles with something drawn are also persisted as
+.npz so other workers and restarts start from them instead of from
+scratch. Tiles no route overlaps are never stored.
+"""
+
+import math
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+import src.utils.config as config
+from src.utils import polyline
+
+TILE_SIZE = 256
+MAX_LAT = 85.05112878
+# Bounds work for segments across GPS gaps at high zoom
+MAX_SEGMENT_SAMPLES = 4 * TILE_SIZE
+# Colour ramp from few runs (orange, translucent) to many (pale yellow, opaque)
+LOW_RGBA = np.array([255, 80, 0, 110], dtype=float)
+HIGH_RGBA = np.array([255, 255, 170, 255], dtype=float)
+
+_tiles = OrderedDict()
+_tiles_lock = threading.Lock()
+
+
+def project(latlng, zoom: int) -> np.ndarray:
+    """
+    Global pixel coordinates (x, y) at `zoom` for an (n, 2) array of [lat, lng].
+    """
+    latlng = np.asarray(latlng, dtype=float).reshape(-1, 2)
+    lat = np.radians(np.clip(latlng[:, 0], -MAX_LAT, MAX_LAT))
+    world = TILE_SIZE * 2 ** zoom
+    x = (latlng[:, 1] + 180.0) / 360.0 * world
+    y = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / math.pi) / 2.0 * world
+    return np.column_stack([x, y])
+
+
+def tile_bbox(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """
+    (min_lat, min_lng, max_lat, max_lng) covered by a tile.
+    """
+    n = 2 ** z
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat(y + 1), x / n * 360.0 - 180.0, lat(y), (x + 1) / n * 360.0 - 180.0
+
+
+def route_pixels(latlng, z: int, x: int, y: int) -> np.ndarray:
+    """
+    Flat indices (row * 256 + col) of the tile pixels a route passes through,
+    each once. Segments are sampled at least once per pixel step.
+    """
+    points = project(latlng, z) - np.array([x * TILE_SIZE, y * TILE_SIZE])
+    if len(points) < 2:
+        return np.empty(0, dtype=np.int64)
+    a, b = points[:-1], points[1:]
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    near = (hi[:, 0] >= 0) & (lo[:, 0] < TILE_SIZE) & (hi[:, 1] >= 0) & (lo[:, 1] < TILE_SIZE)
+    a, b = a[near], b[near]
+    if not len(a):
+        return np.empty(0, dtype=np.int64)
+
+    delta = b - a
+    steps = np.clip(np.ceil(np.abs(delta).max(axis=1)).astype(np.int64), 1, MAX_SEGMENT_SAMPLES)
+    segment = np.repeat(np.arange(len(a)), steps)
+    t = (np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)) / steps[segment]
+    samples = np.vstack([a[segment] + delta[segment] * t[:, None], b])
+
+    px = np.floor(samples).astype(np.int64)
+    inside = (px[:, 0] >= 0) & (px[:, 0] < TILE_SIZE) & (px[:, 1] >= 0) & (px[:, 1] < TILE_SIZE)
+    return np.unique(px[inside, 1] * TILE_SIZE + px[inside, 0])
+
+
+def encode_png(rgba: np.ndarray) -> bytes:
+    """
+    Minimal RGBA PNG encoder (8-bit, no filtering).
+    """
+    height, width, _ = rgba.shape
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), rgba.reshape(height, width * 4)]).tobytes()
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def render_png(counts: np.ndarray, saturation: int | None = None) -> bytes:
+    """
+    Colour a count grid on a log scale that tops out at `saturation` runs
+    (default HEATMAP_SATURATION); pixels no route crosses are transparent.
+    """
+    saturation = saturation or config.HEATMAP_SATURATION
+    grid = counts.reshape(TILE_SIZE, TILE_SIZE).astype(float)
+    level = np.clip(np.log1p(grid) / math.log1p(saturation), 0.0, 1.0)[..., None]
+    rgba = LOW_RGBA + (HIGH_RGBA - LOW_RGBA) * level
+    rgba[grid == 0] = 0
+    return encode_png(np.round(rgba).astype(np.uint8))
+
+
+class HeatmapTile:
+    def __init__(self, counts=None, routes=None):
+        self.counts = counts if counts is not None else np.zeros(TILE_SIZE * TILE_SIZE, dtype=np.uint16)
+        # {activity_id: version} of the routes drawn into counts
+        self.routes = dict(routes or {})
+        self._png = None
+
+    def copy(self):
+        return HeatmapTile(self.counts.copy(), self.routes)
+
+    def add(self, activity_id, version, latlng, z, x, y):
+        if activity_id in self.routes:
+            return
+        pixels = route_pixels(latlng, z, x, y)
+        # Indices are unique, so plain fancy-index increment is safe
+        self.counts[pixels] = np.minimum(self.counts[pixels].astype(np.int64) + 1, np.iinfo(np.uint16).max)
+        self.routes[activity_id] = version
+        self._png = None
+
+    def extends(self, routes) -> bool:
+        """
+        True when every route drawn here is still in `routes` at the same
+        version, so only the missing ones need adding.
+        """
+        return all(routes.get(activity_id) == version for activity_id, version in self.routes.items())
+
+    @property
+    def png(self) -> bytes:
+        if self._png is None:
+            self._png = render_png(self.counts)
+        return self._png
+
+
+# Served for tiles no route overlaps; never cached or persisted
+_EMPTY_TILE = HeatmapTile()
+
+
+def _tile_path(key):
+    if not config.HEATMAP_TILE_DIR:
+        return None
+    athlete_id, z, x, y = key
+    return os.path.join(config.HEATMAP_TILE_DIR, str(athlete_id), str(z), str(x), f"{y}.npz")
+
+
+def _remember(key, tile):
+    _tiles[key] = tile
+    _tiles.move_to_end(key)
+    while len(_tiles) > config.HEATMAP_CACHE_TILES:
+        _tiles.popitem(last=False)
+
+
+def _load(key):
+    tile = _tiles.get(key)
+    if tile is not None:
+        _tiles.move_to_end(key)
+        return tile
+    path = _tile_path(key)
+    if path and os.path.exists(path):
+        with np.load(path) as data:
+            # Files written before versions were tracked rebuild on first use
+            versions = data["versions"].tolist() if "versions" in data.files else [-1] * len(data["activity_ids"])
+            tile = HeatmapTile(data["counts"], zip(data["activity_ids"].tolist(), versions))
+        _remember(key, tile)
+        return tile
+    return None
+
+
+def _store(key, tile):
+    _remember(key, tile)
+    path = _tile_path(key)
+    if not path:
+        return
+    if not tile.counts.any():
+        # Overlapping bboxes but nothing drawn: not worth a file
+        _remove_file(path)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    ids = sorted(tile.routes)
+    np.savez_compressed(
+        tmp,
+        counts=tile.counts,
+        activity_ids=np.array(ids, dtype=np.int64),
+        versions=np.array([tile.routes[i] for i in ids], dtype=np.int64),
+    )
+    os.replace(tmp, path)
+
+
+def _forget(key):
+    _tiles.pop(key, None)
+    path = _tile_path(key)
+    if path:
+        _remove_file(path)
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def get_tile(athlete_id, z, x, y, routes, load_polylines) -> HeatmapTile:
+    """
+    The tile, brought up to date with `routes` ({activity_id: version} of
+    the athlete's routes overlapping it now). `load_polylines(ids)` returns
+    {activity_id: encoded} and is called only for routes the tile hasn't
+    drawn at their current version.
+    """
+    key = (athlete_id, z, x, y)
+    routes = dict(routes)
+    if not routes:
+        with _tiles_lock:
+            _forget(key)
+        return _EMPTY_TILE
+    with _tiles_lock:
+        tile = _load(key)
+    if tile is not None and tile.routes == routes:
+        return tile
+
+    # Copy so concurrent readers of the cached tile never see partial updates
+    tile = tile.copy() if tile is not None and tile.extends(routes) else HeatmapTile()
+    missing = routes.keys() - tile.routes.keys()
+    for activity_id, encoded in load_polylines(missing).items():
+        tile.add(activity_id, routes[activity_id], polyline.decode(encoded), z, x, y)
+    # A route deleted between the two queries counts as drawn; the next
+    # request no longer lists it, which forces a rebuild
+    tile.routes.update((activity_id, routes[activity_id]) for activity_id in missing)
+    with _tiles_lock:
+        _store(key, tile)
+    return tile
+
+
+def clear():
+    with _tiles_lock:
+        _tiles.clear()
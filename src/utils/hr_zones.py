@@ -0,0 +1,79 @@
+"""
+Local heart-rate zone computation from activity streams.
+
+Zones are defined by four ascending boundaries: a sample at or above
+bounds[k] and below bounds[k + 1] is in zone k + 2; anything below bounds[0]
+is zone 1. Each interval between consecutive time samples is credited to
+the zone of the heart rate at its end, matching how the recording device
+reports the sample.
+"""
+
+import numpy as np
+
+import src.utils.config as config
+
+ZONE_COUNT = 5
+# Lower edges of zones 2-5 as a fraction of max HR (60/70/80/90%)
+MAX_HR_FRACTIONS = (0.6, 0.7, 0.8, 0.9)
+
+
+def parse_bounds(spec: str) -> list[float]:
+    """
+    Parse "114,133,152,171" into validated zone boundaries.
+    """
+    return validate_bounds([float(v) for v in spec.split(",") if v.strip()])
+
+
+def validate_bounds(bounds) -> list[float]:
+    bounds = [float(b) for b in bounds]
+    if len(bounds) != ZONE_COUNT - 1:
+        raise ValueError(f"Expected {ZONE_COUNT - 1} zone boundaries, got {len(bounds)}")
+    if any(b <= 0 for b in bounds) or any(a >= b for a, b in zip(bounds, bounds[1:])):
+        raise ValueError("Zone boundaries must be positive and strictly increasing")
+    return bounds
+
+
+def bounds_from_max_hr(max_heartrate: float) -> list[float]:
+    return [round(max_heartrate * f) for f in MAX_HR_FRACTIONS]
+
+
+def resolve_bounds(hr_zone_bounds=None, max_heartrate=None) -> list[float]:
+    """
+    Athlete's explicit boundaries, else derived from their max HR, else HR_ZONE_BOUNDS.
+    """
+    if hr_zone_bounds:
+        return validate_bounds(hr_zone_bounds)
+    if max_heartrate:
+        return bounds_from_max_hr(max_heartrate)
+    return parse_bounds(config.HR_ZONE_BOUNDS)
+
+
+def time_in_zones(heartrate, time, bounds) -> np.ndarray:
+    """
+    Seconds spent in each zone.
+    """
+    n = min(len(heartrate), len(time))
+    if n < 2:
+        return np.zeros(ZONE_COUNT)
+    hr = np.asarray(heartrate[:n], dtype=float)
+    t = np.asarray(time[:n], dtype=float)
+
+    dt = np.diff(t)
+    zones = np.searchsorted(np.asarray(bounds, dtype=float), hr[1:], side="right")
+    valid = (dt > 0) & ~np.isnan(hr[1:])
+    return np.bincount(zones[valid], weights=dt[valid], minlength=ZONE_COUNT)
+
+
+def zone_percentages(heartrate, time, bounds):
+    """
+    Time-in-zone percentages rounded to 2 places, or None without usable HR data.
+    """
+    seconds = time_in_zones(
+        heartrate if heartrate is not None else [],
+        time if time is not None else [],
+        bounds,
+    )
+    total = seconds.sum()
+    if total <= 0:
+        return None
+    return [round(float(s) / total * 100, 2) for s in seconds]
@@ -1,23 +1,215 @@
+"""
+Shared logging setup.
+
+Every logger returned by get_logger() enqueues records through a
+QueueHandler; a single background QueueListener does the actual console and
+file I/O so hot paths never block on stdout or disk.
+
+Environment:
+    LOG_LEVEL              minimum level for app loggers (default INFO; unknown names fall back to INFO)
+    LOG_FORMAT             "text" (default) or "json"
+    LOG_DEBUG_SAMPLE_RATE  fraction of DEBUG records kept per logger (default 1.0)
+    LOG_FILE               error log path (default activity_ingestion.log)
+"""
+
+import atexit
+import json
 import logging
+import os
+import queue
+import re
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 
-def get_logger(name=__name__):
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+_TEXT_FORMAT = "%(asctime)s %(levelname)s %(message)s"
+
+_REDACTIONS = [
+    (re.compile(r"(Bearer\s+)[A-Za-z0-9._\-]+", re.IGNORECASE), r"\1[REDACTED]"),
+    (
+        re.compile(r"""(['"]?\b(?:access_token|refresh_token|client_secret|Authorization)['"]?\s*[:=]\s*['"]?)[^'",\s}&]+""",
+                   re.IGNORECASE),
+        r"\1[REDACTED]",
+    ),
+    # OAuth authorization code, only as a query/form parameter or quoted key:
+    # a bare "status code: 500" must survive
+    (
+        re.compile(r"""((?:^|(?<=[?&]))code=|['"]code['"]\s*:\s*['"]?)[^'",\s}&]+"""),
+        r"\1[REDACTED]",
+    ),
+]
+
+_listener = None
+_listener_lock = threading.Lock()
+_log_queue = queue.SimpleQueue()
+_reported_levels = set()
+
+
+def redact(text):
+    """
+    Mask bearer tokens, OAuth secrets and codes in a log line.
+    """
+    for pattern, replacement in _REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line with timestamp, level, logger, message and any
+    structured fields passed via extra={"fields": {...}}.
+    """
+
+    def format(self, record):
+        payload = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class RedactingFilter(logging.Filter):
+    """
+    Render the message once, scrub secrets, and drop args so the queued
+    record carries only the redacted text.
+    """
+
+    def filter(self, record):
+        record.msg = redact(record.getMessage())
+        record.args = None
+        fields = getattr(record, "fields", None)
+        if fields:
+            record.fields = {k: redact(v) if isinstance(v, str) else v for k, v in fields.items()}
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Keep roughly `rate` of DEBUG records for a logger; other levels always pass.
+    Sampling is deterministic (every Nth record) so it needs no RNG on the hot path.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._seen = 0
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        if not self.every:
+            return False
+        self._seen += 1
+        return (self._seen - 1) % self.every == 0
+
+
+class StdoutHandler(logging.StreamHandler):
+    """
+    StreamHandler bound to whatever sys.stdout is at emit time, so the
+    background listener survives stdout being swapped (pytest capture, reloads).
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _build_formatter():
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        return JsonFormatter()
+    return logging.Formatter(_TEXT_FORMAT)
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        formatter = _build_formatter()
 
-    if not logger.handlers:
         # Console handler with UTF-8 support
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
-        console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
-
-        # File handler with UTF-8 encoding
-        file_handler = logging.FileHandler("activity_ingestion.log", encoding="utf-8")
+        console_handler = StdoutHandler()
+        console_handler.setLevel(logging.DEBUG)
+        console_handler.setFormatter(formatter)
+
+        # File handler with UTF-8 encoding, errors only
+        file_handler = logging.FileHandler(os.getenv("LOG_FILE", "activity_ingestion.log"), encoding="utf-8", delay=True)
         file_handler.setLevel(logging.ERROR)
-        file_formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        file_handler.setFormatter(formatter)
+
+        _listener = QueueListener(_log_queue, console_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+
+
+def stop_logging():
+    """
+    Flush queued records and stop the background listener.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def _restart_listener_in_child():
+    # The listener thread does not survive fork (gunicorn preload_app, process
+    # pools); without a new one the child's records pile up in the queue
+    global _listener, _listener_lock
+    _listener_lock = threading.Lock()
+    if _listener is not None:
+        _listener = None
+        _start_listener()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
+def _log_level():
+    """
+    LOG_LEVEL as a logging level, falling back to INFO (with a warning on
+    stderr) for names logging doesn't know.
+    """
+    name = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+    level = logging.getLevelName(name)
+    if isinstance(level, int):
+        return level
+    if name not in _reported_levels:
+        _reported_levels.add(name)
+        print(f"⚠️ Unknown LOG_LEVEL {name!r}; using INFO", file=sys.stderr)
+    return logging.INFO
+
+
+def get_logger(name=__name__, debug_sample_rate=None):
+    logger = logging.getLogger(name)
+    logger.setLevel(_log_level())
+
+    if not logger.handlers:
+        _start_listener()
+
+        handler = QueueHandler(_log_queue)
+        handler.addFilter(RedactingFilter())
+        logger.addHandler(handler)
+
+        if debug_sample_rate is None:
+            debug_sample_rate = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+        if debug_sample_rate < 1.0:
+            logger.addFilter(DebugSamplingFilter(debug_sample_rate))
 
     return logger
@@ -1,7 +1,6 @@
 import os
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.oxml.ns import qn
+
+# python-docx is imported inside the writers so importing this module stays cheap
 
 ROOT_DIR = r"C:\Users\andre\projects\railway-pg-test"
 OUTPUT_DOCX = "final_project_map.docx"
@@ -63,6 +62,9 @@ def read_file_content(filepath):
         return None
 
 def add_code_block(doc, lines):
+    from docx.oxml.ns import qn
+    from docx.shared import Pt, RGBColor
+
     para = doc.add_paragraph()
     para.paragraph_format.line_spacing = 1.0
     para.paragraph_format.space_before = Pt(0)
@@ -76,6 +78,9 @@ def add_code_block(doc, lines):
         run._element.rPr.rFonts.set(qn('w:eastAsia'), 'Consolas')
 
 def apply_folder_style(paragraph):
+    from docx.oxml.ns import qn
+    from docx.shared import Pt, RGBColor
+
     if not paragraph.runs:
         return
     run = paragraph.runs[0]
@@ -88,6 +93,8 @@ def apply_folder_style(paragraph):
     paragraph.paragraph_format.line_spacing = 1.0
 
 def write_project_map(root_dir, output_docx):
+    from docx import Document
+
     doc = Document()
     doc.add_heading("📁 Folder & File Structure", level=1)
 
@@ -0,0 +1,209 @@
+"""
+Prometheus metrics shared by the Flask app, Strava client, DB layer and GPT calls.
+
+When PROMETHEUS_MULTIPROC_DIR is set (gunicorn with several workers), each
+worker writes its samples to that directory and /metrics aggregates them with
+a MultiProcessCollector. The directory must exist and be emptied before the
+server starts; call child_exit() from the gunicorn hook of the same name.
+"""
+
+import os
+import re
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+from src.utils.timing import add_sink
+
+# ----- HTTP -----
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Flask request latency by endpoint",
+    ["endpoint", "method", "status"],
+)
+
+# ----- Database pool -----
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Connections currently checked out of the SQLAlchemy pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTS = Counter(
+    "db_pool_connects_total",
+    "New DBAPI connections opened by the SQLAlchemy pool",
+)
+
+# ----- Strava API -----
+STRAVA_REQUESTS = Counter(
+    "strava_requests_total",
+    "Strava API calls by endpoint and HTTP status",
+    ["endpoint", "status"],
+)
+STRAVA_LATENCY = Histogram(
+    "strava_request_duration_seconds",
+    "Strava API call latency by endpoint",
+    ["endpoint"],
+)
+STRAVA_RATELIMIT_REMAINING = Gauge(
+    "strava_ratelimit_remaining",
+    "Remaining Strava requests in the current rate-limit window",
+    ["window"],
+    multiprocess_mode="mostrecent",
+)
+
+# ----- Enrichment -----
+ENRICHMENT_QUEUE_DEPTH = Gauge(
+    "enrichment_queue_depth",
+    "Activities selected for enrichment and not yet processed",
+    multiprocess_mode="livesum",
+)
+
+# ----- Ingestion stage timings (fed by src.utils.timing) -----
+INGESTION_JOB_LATENCY = Histogram(
+    "ingestion_job_duration_seconds",
+    "Wall time of an ingestion/enrichment job",
+    ["job"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, float("inf")),
+)
+INGESTION_STAGE_SECONDS = Counter(
+    "ingestion_stage_seconds_total",
+    "Cumulative seconds spent per ingestion stage",
+    ["job", "stage"],
+)
+INGESTION_STAGE_CALLS = Counter(
+    "ingestion_stage_calls_total",
+    "Number of times each ingestion stage ran",
+    ["job", "stage"],
+)
+
+# ----- OpenAI -----
+OPENAI_LATENCY = Histogram(
+    "openai_request_duration_seconds",
+    "OpenAI chat completion latency",
+    ["model", "outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120, float("inf")),
+)
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total",
+    "OpenAI tokens used by kind (prompt/completion)",
+    ["model", "kind"],
+)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def strava_endpoint_label(url):
+    """
+    Collapse numeric path segments so each Strava endpoint is one label value.
+    '/api/v3/activities/123/streams' -> '/activities/{id}/streams'
+    """
+    path = re.sub(r"^https?://[^/]+", "", url).split("?")[0]
+    path = path.replace("/api/v3", "", 1)
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def observe_strava_response(url, response, seconds):
+    endpoint = strava_endpoint_label(url)
+    STRAVA_REQUESTS.labels(endpoint=endpoint, status=str(response.status_code)).inc()
+    STRAVA_LATENCY.labels(endpoint=endpoint).observe(seconds)
+
+    limits = (response.headers or {}).get("X-RateLimit-Limit")
+    usage = (response.headers or {}).get("X-RateLimit-Usage")
+    if not limits or not usage:
+        return
+    try:
+        limit_15m, limit_daily = (int(x) for x in limits.split(","))
+        used_15m, used_daily = (int(x) for x in usage.split(","))
+    except ValueError:
+        return
+    STRAVA_RATELIMIT_REMAINING.labels(window="15min").set(limit_15m - used_15m)
+    STRAVA_RATELIMIT_REMAINING.labels(window="daily").set(limit_daily - used_daily)
+
+
+def observe_openai_call(model, seconds, usage=None, outcome="ok"):
+    OPENAI_LATENCY.labels(model=model, outcome=outcome).observe(seconds)
+    if usage:
+        OPENAI_TOKENS.labels(model=model, kind="prompt").inc(usage.get("prompt_tokens", 0) or 0)
+        OPENAI_TOKENS.labels(model=model, kind="completion").inc(usage.get("completion_tokens", 0) or 0)
+
+
+def _record_job_timings(timer):
+    INGESTION_JOB_LATENCY.labels(job=timer.job).observe(timer.elapsed or 0.0)
+    for stage, stats in timer.stages.items():
+        INGESTION_STAGE_SECONDS.labels(job=timer.job, stage=stage).inc(stats.total)
+        INGESTION_STAGE_CALLS.labels(job=timer.job, stage=stage).inc(stats.count)
+
+
+add_sink(_record_job_timings)
+
+
+def instrument_engine(engine):
+    """
+    Track pool checkouts/checkins and new connections for an engine.
+    """
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, conn_record):  # pylint: disable=unused-argument
+        DB_POOL_CONNECTS.inc()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):  # pylint: disable=unused-argument
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, conn_record):  # pylint: disable=unused-argument
+        DB_POOL_CHECKED_OUT.dec()
+
+    return engine
+
+
+def init_app(app):
+    """
+    Register request timing hooks on the Flask app.
+    """
+    # Imported here so CLI jobs that only touch the DB metrics don't load Flask
+    from flask import request, g
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_latency(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            HTTP_REQUEST_LATENCY.labels(
+                endpoint=request.endpoint or "unmatched",
+                method=request.method,
+                status=str(response.status_code),
+            ).observe(time.perf_counter() - start)
+        return response
+
+
+def render_latest():
+    """
+    Return (body, content_type) for the /metrics endpoint.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def child_exit(server, worker):  # pylint: disable=unused-argument
+    """
+    Gunicorn hook: drop live gauges owned by a worker that has exited.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
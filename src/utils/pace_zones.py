@@ -0,0 +1,102 @@
+"""
+Pace-zone classification for splits.
+
+Zones are defined by four ascending speed boundaries (m/s): a split at or
+above bounds[k] and below bounds[k + 1] is zone k + 2; slower is zone 1.
+Boundaries come from the athlete's configured pace_zone_bounds, else from a
+threshold speed estimated from recent best efforts, else PACE_ZONE_BOUNDS.
+
+The threshold estimate projects each best effort from 5k to half marathon
+to a one-hour race with Riegel's formula (t2 = t1 * (d2 / d1) ** 1.06) and
+takes the fastest. Shorter efforts are mostly anaerobic and would
+overestimate it; longer ones are rarely all-out.
+"""
+
+import numpy as np
+
+import src.utils.config as config
+
+ZONE_COUNT = 5
+# Lower edges of zones 2-5 as a fraction of threshold speed
+THRESHOLD_FRACTIONS = (0.78, 0.88, 0.95, 1.03)
+RIEGEL_EXPONENT = 1.06
+# Best-effort distances (m) the threshold is projected from
+THRESHOLD_MIN_DISTANCE = 5000.0
+THRESHOLD_MAX_DISTANCE = 21097.5
+
+
+def validate_bounds(bounds) -> list[float]:
+    bounds = [float(b) for b in bounds]
+    if len(bounds) != ZONE_COUNT - 1:
+        raise ValueError(f"Expected {ZONE_COUNT - 1} pace zone boundaries, got {len(bounds)}")
+    if any(b <= 0 for b in bounds) or any(a >= b for a, b in zip(bounds, bounds[1:])):
+        raise ValueError("Pace zone boundaries must be positive and strictly increasing")
+    return bounds
+
+
+def bounds_from_threshold(threshold_speed: float) -> list[float]:
+    return [round(threshold_speed * f, 3) for f in THRESHOLD_FRACTIONS]
+
+
+def hour_speed(distance: float, elapsed_time: float) -> float | None:
+    """
+    Speed (m/s) sustainable for one hour, projected from a single effort.
+    """
+    if not distance or not elapsed_time or elapsed_time <= 0:
+        return None
+    hour_distance = distance * (3600 / elapsed_time) ** (1 / RIEGEL_EXPONENT)
+    return hour_distance / 3600
+
+
+def threshold_from_efforts(efforts) -> float | None:
+    """
+    Fastest projected one-hour speed across (distance, elapsed_time) pairs
+    between THRESHOLD_MIN_DISTANCE and THRESHOLD_MAX_DISTANCE; None when no
+    effort is in range.
+    """
+    speeds = [
+        s for s in (
+            hour_speed(d, t) for d, t in efforts
+            if d and THRESHOLD_MIN_DISTANCE <= d <= THRESHOLD_MAX_DISTANCE
+        ) if s
+    ]
+    return max(speeds) if speeds else None
+
+
+def resolve_bounds(pace_zone_bounds=None, efforts=None) -> list[float]:
+    if pace_zone_bounds:
+        return validate_bounds(pace_zone_bounds)
+    threshold = threshold_from_efforts(efforts or [])
+    if threshold:
+        return bounds_from_threshold(threshold)
+    return validate_bounds(config.PACE_ZONE_BOUNDS.split(","))
+
+
+def split_speed(split: dict) -> float | None:
+    """
+    Moving speed of a split; falls back to the stream-average speed.
+    Kept in step with SPLIT_SPEED_SQL in split_dao.
+    """
+    distance, moving_time = split.get("distance"), split.get("moving_time")
+    if distance and moving_time and moving_time > 0:
+        return distance / moving_time
+    return split.get("average_speed")
+
+
+def classify(speeds, bounds) -> list[int | None]:
+    """
+    Zone (1-5) for each speed; None for missing or non-positive speeds.
+    """
+    arr = np.array([s if s is not None else np.nan for s in speeds], dtype=float)
+    zones = np.searchsorted(np.asarray(bounds, dtype=float), arr, side="right") + 1
+    valid = arr > 0
+    return [int(z) if ok else None for z, ok in zip(zones, valid)]
+
+
+def assign_pace_zones(splits: list[dict], bounds) -> list[dict]:
+    """
+    Set pace_zone on every split in place, in one vectorized pass.
+    """
+    for split, zone in zip(splits, classify([split_speed(s) for s in splits], bounds)):
+        split["pace_zone"] = zone
+    return splits
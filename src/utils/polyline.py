@@ -0,0 +1,55 @@
+"""
+Google encoded polyline format: coordinates rounded to 1e-5 degrees (~1 m),
+delta-encoded against the previous point and packed five bits per printable
+character. A run's latlng stream shrinks to roughly 4-6 bytes per point.
+"""
+
+import numpy as np
+
+PRECISION = 5
+
+
+def _encode_value(value: int, out: list):
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+def encode(latlng, precision: int = PRECISION) -> str:
+    """
+    Encode [lat, lng] pairs, skipping missing points and repeats of the
+    previous point at this precision.
+    """
+    factor = 10 ** precision
+    out = []
+    prev_lat = prev_lng = 0
+    first = True
+    for point in latlng:
+        if point is None or point[0] is None or point[1] is None:
+            continue
+        lat, lng = int(round(point[0] * factor)), int(round(point[1] * factor))
+        if not first and lat == prev_lat and lng == prev_lng:
+            continue
+        _encode_value(lat - prev_lat, out)
+        _encode_value(lng - prev_lng, out)
+        prev_lat, prev_lng, first = lat, lng, False
+    return "".join(out)
+
+
+def decode(encoded: str, precision: int = PRECISION) -> np.ndarray:
+    """
+    (n, 2) array of [lat, lng] degrees.
+    """
+    values = []
+    value = shift = 0
+    for char in encoded:
+        b = ord(char) - 63
+        value |= (b & 0x1F) << shift
+        shift += 5
+        if b < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    deltas = np.array(values[: len(values) // 2 * 2], dtype=np.int64).reshape(-1, 2)
+    return np.cumsum(deltas, axis=0) / 10 ** precision
@@ -0,0 +1,194 @@
+"""
+Token-budgeted context builder for /ask prompts.
+
+The prompt is packed in priority order until ASK_CONTEXT_TOKEN_BUDGET is
+reached: instructions and the question always go in, then pre-computed
+aggregates (weekly totals, HR zones, longest/fastest runs), then activity
+lines ranked by relevance to the question. Activities that do not fit are
+summarised in a single "omitted" line instead of being sent verbatim.
+
+Token counts are estimated at ~4 characters per token, which is close
+enough for budgeting without pulling a tokenizer into the request path.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+
+import src.utils.config as config
+from src.db.dao.activity_stats_dao import ActivityStatsDAO
+
+CHARS_PER_TOKEN = 4
+
+HEADER = "You are a smart coaching assistant helping a runner improve.\n\n"
+
+_WORD = re.compile(r"[a-z0-9]+")
+_DISTANCE_WORDS = {"long", "longest", "far", "distance", "km", "mile", "miles", "mileage", "volume"}
+_SPEED_WORDS = {"fast", "fastest", "pace", "speed", "tempo", "quick", "interval", "intervals", "race"}
+
+
+@dataclass
+class PromptContext:
+    prompt: str
+    tokens: int
+    activities_included: int
+    activities_omitted: int
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for budgeting (~4 chars/token).
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _words(text) -> set:
+    return set(_WORD.findall(str(text or "").lower()))
+
+
+def _activity_line(i: int, a: dict) -> str:
+    line = f"[{i}] date: {a['date']}, distance_km: {a['distance_km']}, duration_min: {a['duration_min']}"
+    for key in ("name", "avg_hr"):
+        if a.get(key) is not None:
+            line += f", {key}: {a[key]}"
+    return line + "\n"
+
+
+def rank_activities(question: str, activities: list[dict]) -> list[int]:
+    """
+    Indexes of `activities` ordered most-relevant first.
+
+    Recency is the base score; words shared between the question and the
+    activity name/type add to it, and distance/speed questions favour the
+    longest/fastest runs.
+    """
+    q_words = _words(question)
+    wants_distance = bool(q_words & _DISTANCE_WORDS)
+    wants_speed = bool(q_words & _SPEED_WORDS)
+
+    by_date = sorted(range(len(activities)), key=lambda i: str(activities[i].get("date")), reverse=True)
+    recency = {idx: 1.0 / (1 + rank) for rank, idx in enumerate(by_date)}
+
+    max_km = max((a.get("distance_km") or 0 for a in activities), default=0) or 1
+    speeds = [
+        (a.get("distance_km") or 0) / a["duration_min"] if a.get("duration_min") else 0
+        for a in activities
+    ]
+    max_speed = max(speeds, default=0) or 1
+
+    def score(i):
+        a = activities[i]
+        s = recency[i]
+        s += len(q_words & (_words(a.get("name")) | _words(a.get("type"))))
+        if wants_distance:
+            s += (a.get("distance_km") or 0) / max_km
+        if wants_speed:
+            s += speeds[i] / max_speed
+        return s
+
+    return sorted(range(len(activities)), key=score, reverse=True)
+
+
+def format_aggregates(aggregates: dict | None) -> list[str]:
+    """
+    Render pre-computed aggregates as prompt lines, most useful first.
+    """
+    if not aggregates:
+        return []
+    lines = []
+    for week in aggregates.get("weekly") or []:
+        lines.append(
+            f"week {int(week['year'])}-W{int(week['week']):02d}: "
+            f"{(week['total_distance'] or 0) / 1000:.1f} km, {round((week['total_time'] or 0) / 60)} min\n"
+        )
+    zones = aggregates.get("hr_zones")
+    if zones and any(zones.values()):
+        lines.append("hr_zones_pct: " + ", ".join(f"{k}={v:.0f}" for k, v in zones.items()) + "\n")
+    for label in ("longest_run", "fastest_run"):
+        run = aggregates.get(label)
+        if run:
+            lines.append(f"{label}: {_activity_line(0, run)[4:]}")
+    return lines
+
+
+def build_prompt(user_question: str, activities: list[dict], aggregates: dict | None = None,
+                 token_budget: int | None = None) -> PromptContext:
+    """
+    Pack aggregates and the most relevant activities into `token_budget`
+    (default ASK_CONTEXT_TOKEN_BUDGET) and report the tokens used.
+    """
+    budget = config.ASK_CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+    question = user_question.strip()
+    footer = "\nUSER QUESTION:\n" + question
+    used = estimate_tokens(HEADER) + estimate_tokens(footer)
+
+    summary_lines = []
+    for line in format_aggregates(aggregates):
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        summary_lines.append(line)
+        used += cost
+    if summary_lines:
+        used += estimate_tokens("SUMMARY:\n\n")
+
+    activities = activities or []
+    used += estimate_tokens("ACTIVITIES:\n")
+    # Reserve room for the omitted-count line so packing never overshoots
+    omitted_reserve = estimate_tokens(f"[{len(activities)} more activities omitted]\n") if activities else 0
+
+    chosen = []
+    for idx in rank_activities(question, activities):
+        cost = estimate_tokens(_activity_line(len(activities), activities[idx]))
+        if used + cost + omitted_reserve > budget:
+            continue
+        chosen.append(idx)
+        used += cost
+
+    parts = [HEADER]
+    if summary_lines:
+        parts.append("SUMMARY:\n")
+        parts.extend(summary_lines)
+        parts.append("\n")
+    parts.append("ACTIVITIES:\n")
+    if not activities:
+        parts.append("[No activities available]\n")
+    else:
+        # Render chronologically so the model sees a timeline
+        for i, idx in enumerate(sorted(chosen, key=lambda j: str(activities[j].get("date"))), start=1):
+            parts.append(_activity_line(i, activities[idx]))
+        omitted = len(activities) - len(chosen)
+        if omitted:
+            parts.append(f"[{omitted} more activities omitted]\n")
+    parts.append(footer)
+
+    prompt = "".join(parts)
+    return PromptContext(
+        prompt=prompt,
+        tokens=estimate_tokens(prompt),
+        activities_included=len(chosen),
+        activities_omitted=len(activities) - len(chosen),
+    )
+
+
+def _run_summary(activity) -> dict | None:
+    if activity is None:
+        return None
+    return {
+        "date": activity.start_date.strftime("%Y-%m-%d") if activity.start_date else None,
+        "distance_km": round((activity.distance or 0) / 1000, 2),
+        "duration_min": round((activity.moving_time or 0) / 60),
+        "name": activity.name,
+    }
+
+
+def load_aggregates(session, athlete_id: int, days: int = 28) -> dict:
+    """
+    Pre-computed context from ActivityStatsDAO for the last `days` days.
+    """
+    return {
+        "weekly": ActivityStatsDAO.get_weekly_summary(session, athlete_id, past_weeks=max(1, days // 7)),
+        "hr_zones": ActivityStatsDAO.get_hr_zone_summary(session, athlete_id, days),
+        "longest_run": _run_summary(ActivityStatsDAO.get_longest_run(session, athlete_id, days)),
+        "fastest_run": _run_summary(ActivityStatsDAO.get_fastest_run(session, athlete_id, days)),
+    }
@@ -0,0 +1,128 @@
+"""
+Route fingerprints for finding runs on the same course.
+
+A fingerprint is the geohash cell of the start and of the finish, the
+route length, and its shape: ROUTE_SHAPE_POINTS points spaced evenly along
+the track. Candidates are routes whose start falls in the same or a
+neighbouring cell (or, for the course run in reverse, whose start is near
+this finish) and whose length is within ROUTE_DISTANCE_TOLERANCE; that
+lookup is an index range scan, so the exact comparison (mean distance
+between corresponding shape points, in meters) only runs on a handful of
+routes instead of the whole history.
+"""
+
+import numpy as np
+
+import src.utils.config as config
+from src.utils.activity_files import haversine
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash(lat: float, lng: float, precision: int | None = None) -> str:
+    precision = precision or config.ROUTE_CELL_PRECISION
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """
+    (lat degrees, lng degrees) spanned by a geohash cell.
+    """
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def geohash_centre(cell: str) -> tuple[float, float]:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = _BASE32.index(char)
+        for bit in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> bit & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lng_range[0] + lng_range[1]) / 2
+
+
+def neighbour_cells(cell: str) -> set[str]:
+    """
+    The cell and the eight around it.
+    """
+    lat, lng = geohash_centre(cell)
+    dlat, dlng = cell_size(len(cell))
+    return {
+        geohash(max(-90.0, min(90.0, lat + i * dlat)), (lng + j * dlng + 180.0) % 360.0 - 180.0, len(cell))
+        for i in (-1, 0, 1)
+        for j in (-1, 0, 1)
+    }
+
+
+def candidate_cells(start_cell: str, end_cell: str) -> set[str]:
+    """
+    Start cells a run of the same course may have: near this start, or near
+    this finish when the course is run the other way.
+    """
+    return neighbour_cells(start_cell) | neighbour_cells(end_cell)
+
+
+def resample(latlng, count: int) -> np.ndarray:
+    """
+    `count` points evenly spaced by distance along the track.
+    """
+    points = np.asarray(latlng, dtype=float).reshape(-1, 2)
+    steps = haversine(points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1])
+    along = np.concatenate([[0.0], np.cumsum(steps)])
+    if along[-1] <= 0:
+        return np.repeat(points[:1], count, axis=0)
+    targets = np.linspace(0.0, along[-1], count)
+    return np.column_stack([np.interp(targets, along, points[:, 0]), np.interp(targets, along, points[:, 1])])
+
+
+def fingerprint(latlng) -> dict:
+    """
+    Fingerprint columns for activity_routes. `latlng` has at least two points.
+    """
+    points = np.asarray(latlng, dtype=float).reshape(-1, 2)
+    steps = haversine(points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1])
+    return {
+        "distance": round(float(steps.sum()), 1),
+        "start_cell": geohash(*points[0]),
+        "end_cell": geohash(*points[-1]),
+        "shape": resample(points, config.ROUTE_SHAPE_POINTS),
+    }
+
+
+def shape_deviation(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Mean distance (m) between corresponding shape points, taking the better
+    of the two directions so a loop run the other way still matches.
+    """
+    forward = haversine(a[:, 0], a[:, 1], b[:, 0], b[:, 1]).mean()
+    backward = haversine(a[:, 0], a[:, 1], b[::-1, 0], b[::-1, 1]).mean()
+    return float(min(forward, backward))
+
+
+def distance_range(distance: float) -> tuple[float, float]:
+    tolerance = config.ROUTE_DISTANCE_TOLERANCE
+    return distance * (1 - tolerance), distance * (1 + tolerance)
@@ -0,0 +1,72 @@
+"""
+Gunicorn sizing, kept out of gunicorn.conf.py so it can be unit tested.
+
+Each worker process has its own SQLAlchemy pool of DB_POOL_SIZE +
+DB_MAX_OVERFLOW connections, so the worker count is capped by
+DB_MAX_CONNECTIONS as well as by CPU:
+
+    sync     2 * CPU + 1 workers, one request each. /ask/stream holds a worker
+             for the whole answer, so only for tiny deployments.
+    gthread  CPU + 1 workers x DB_POOL_SIZE threads. Default: threads never
+             wait on the pool, and waiting on OpenAI releases the GIL.
+    gevent   CPU workers x 100 greenlets (needs the gevent package). Suits
+             many concurrent /ask streams; DB work is still bounded by the pool.
+"""
+
+import importlib.util
+from dataclasses import dataclass
+
+WORKER_CLASSES = {"sync": "sync", "gthread": "gthread", "gevent": "gevent"}
+GEVENT_CONNECTIONS = 100
+
+
+@dataclass
+class ServerProfile:
+    worker_class: str
+    workers: int
+    threads: int
+    worker_connections: int
+    timeout: int
+    graceful_timeout: int
+    max_requests: int
+    max_requests_jitter: int
+
+
+def compute_profile(
+    cpu_count: int,
+    worker_class: str = "gthread",
+    workers: int = 0,
+    threads: int = 0,
+    db_pool_size: int = 5,
+    db_max_overflow: int = 5,
+    db_max_connections: int = 50,
+    timeout: int = 120,
+    max_requests: int = 1000,
+) -> ServerProfile:
+    if worker_class not in WORKER_CLASSES:
+        raise ValueError(f"Unknown worker class {worker_class!r}; expected one of {', '.join(WORKER_CLASSES)}")
+    if worker_class == "gevent" and importlib.util.find_spec("gevent") is None:
+        raise RuntimeError("GUNICORN_WORKER_CLASS=gevent requires the gevent package")
+
+    cpu_count = max(1, cpu_count)
+    if not workers:
+        by_cpu = {"sync": 2 * cpu_count + 1, "gthread": cpu_count + 1, "gevent": cpu_count}[worker_class]
+        by_db = db_max_connections // max(1, db_pool_size + db_max_overflow)
+        workers = max(1, min(by_cpu, by_db))
+
+    if worker_class == "gthread":
+        threads = threads or max(1, db_pool_size)
+    else:
+        threads = 1
+
+    return ServerProfile(
+        worker_class=WORKER_CLASSES[worker_class],
+        workers=workers,
+        threads=threads,
+        worker_connections=GEVENT_CONNECTIONS,
+        timeout=timeout,
+        # Let an in-flight /ask finish when a worker is recycled or reloaded
+        graceful_timeout=timeout,
+        max_requests=max_requests,
+        max_requests_jitter=max_requests // 10,
+    )
@@ -0,0 +1,119 @@
+"""
+Serving the built SPA from the Flask static folder.
+
+Precompressed siblings (app.js.br, app.js.gz, written at build time by
+src/scripts/precompress_static.py) are sent when the client accepts them.
+Content-hashed files (Vite's assets/<name>-<hash>.js) never change under the
+same name, so they are cached for a year as immutable; everything else must
+revalidate. index.html is read once per process and served from memory by
+the SPA fallback instead of hitting the filesystem on every unknown path.
+"""
+
+import hashlib
+import mimetypes
+import os
+import threading
+
+from flask import Response, abort, request, send_from_directory
+from werkzeug.security import safe_join
+
+from src.utils.compression import negotiate_encoding
+
+# Vite writes every content-hashed file under assets/
+HASHED_DIR = "assets/"
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+PRECOMPRESSED = {"br": ".br", "gzip": ".gz"}
+
+
+def is_hashed(filename: str) -> bool:
+    return filename.startswith(HASHED_DIR)
+
+
+class PrecompressedLookup:
+    """
+    Remembers which encodings exist on disk for each asset, so repeated
+    requests don't stat the filesystem. Assets only change on deploy. Only
+    names that resolve to an existing file are remembered, so probes for
+    random paths can't grow the cache.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._encodings = {}
+
+    def encodings(self, filename: str) -> list[str]:
+        found = self._encodings.get(filename)
+        if found is None:
+            base = safe_join(self.root, filename)
+            if not base or not os.path.isfile(base):
+                return []
+            found = [enc for enc, suffix in PRECOMPRESSED.items() if os.path.isfile(base + suffix)]
+            with self._lock:
+                self._encodings[filename] = found
+        return found
+
+
+class IndexPage:
+    """
+    index.html cached in memory on first use, with a content ETag.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._loaded = False
+        self._body = None
+        self._etag = None
+
+    def _load(self):
+        path = os.path.join(self.root, "index.html") if self.root else None
+        if path and os.path.isfile(path):
+            with open(path, "rb") as f:
+                self._body = f.read()
+            self._etag = hashlib.sha1(self._body).hexdigest()
+        self._loaded = True
+
+    @property
+    def exists(self) -> bool:
+        if not self._loaded:
+            self._load()
+        return self._body is not None
+
+    def response(self):
+        resp = Response(self._body, mimetype="text/html")
+        resp.set_etag(self._etag)
+        resp.headers["Cache-Control"] = REVALIDATE
+        return resp.make_conditional(request)
+
+
+def init_app(app):
+    """
+    Replace Flask's static view with one that honours precompressed files
+    and cache headers, and attach the cached index page as app.extensions["spa_index"].
+    """
+    lookup = PrecompressedLookup(app.static_folder)
+    index = IndexPage(app.static_folder)
+    app.extensions["spa_index"] = index
+
+    def static(filename):
+        if filename in ("", "index.html"):
+            if not index.exists:
+                abort(404)
+            return index.response()
+
+        available = lookup.encodings(filename)
+        encoding = negotiate_encoding(available) if available else None
+        if encoding:
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            resp = send_from_directory(app.static_folder, filename + PRECOMPRESSED[encoding], mimetype=mimetype)
+            resp.headers["Content-Encoding"] = encoding
+        else:
+            resp = send_from_directory(app.static_folder, filename)
+        if available:
+            resp.vary.add("Accept-Encoding")
+        resp.headers["Cache-Control"] = IMMUTABLE if is_hashed(filename) else REVALIDATE
+        return resp
+
+    if "static" in app.view_functions:
+        app.view_functions["static"] = static
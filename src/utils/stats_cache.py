@@ -0,0 +1,213 @@
+"""
+Read-through cache for /stats responses.
+
+Entries are keyed on (athlete_id, data version, query), so bumping an
+athlete's version makes every older entry unreachable without scanning the
+cache. Versions are bumped from ActivityDAO.upsert_activities and the
+enrichment writers. Where they live depends on STATS_CACHE_BACKEND:
+
+    memory    per-process counter; other processes (the ingest CLI, other
+              gunicorn workers) are only caught up by STATS_CACHE_TTL
+    postgres  stats_versions row, bumped in the writer's own transaction
+    redis     INCR on stats_version:<athlete_id>; needs the redis package
+
+Memory and redis bumps cannot join the writer's transaction, so
+bump_version defers them until that session commits. Bumping earlier
+would let a concurrent read cache the old data under the new version.
+
+Shared backends also record when the version last changed, which the
+conditional-GET layer serves as Last-Modified. With the memory backend
+bump_version also bumps the stats_versions row in the writer's transaction,
+so conditional GETs still have a watermark every process agrees on.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+import src.utils.config as config
+from src.db.models.stats_versions import StatsVersion
+
+
+class MemoryVersions:
+    # Writers in other processes are invisible here, so versions can't vouch for freshness
+    shared = False
+    transactional = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+
+    def get(self, athlete_id, session=None) -> int:
+        return self._versions.get(athlete_id, 0)
+
+    def state(self, athlete_id, session=None) -> tuple[int, datetime | None]:
+        return self.get(athlete_id), None
+
+    def bump(self, athlete_id, session=None):
+        with self._lock:
+            self._versions[athlete_id] = self._versions.get(athlete_id, 0) + 1
+
+
+class PostgresVersions:
+    """
+    Versions in the stats_versions table. bump() does not commit, so the new
+    version becomes visible together with the data that caused it.
+    """
+    shared = True
+    transactional = True
+
+    def get(self, athlete_id, session=None) -> int:
+        return self.state(athlete_id, session)[0]
+
+    def state(self, athlete_id, session=None) -> tuple[int, datetime | None]:
+        row = session.execute(
+            select(StatsVersion.version, StatsVersion.updated_at).where(StatsVersion.athlete_id == athlete_id)
+        ).first()
+        return (row.version, row.updated_at) if row else (0, None)
+
+    def bump(self, athlete_id, session=None):
+        stmt = insert(StatsVersion).values(athlete_id=athlete_id, version=1, updated_at=func.now())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["athlete_id"],
+            set_={"version": StatsVersion.version + 1, "updated_at": func.now()}
+        )
+        session.execute(stmt)
+
+
+class RedisVersions:
+    shared = True
+    transactional = False
+
+    def __init__(self, url):
+        import redis  # optional dependency, only needed for this backend
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, athlete_id, session=None) -> int:
+        return int(self._client.get(f"stats_version:{athlete_id}") or 0)
+
+    def state(self, athlete_id, session=None) -> tuple[int, datetime | None]:
+        version, updated = self._client.mget(f"stats_version:{athlete_id}", f"stats_updated:{athlete_id}")
+        updated_at = datetime.fromtimestamp(float(updated), timezone.utc) if updated else None
+        return int(version or 0), updated_at
+
+    def bump(self, athlete_id, session=None):
+        pipe = self._client.pipeline()
+        pipe.incr(f"stats_version:{athlete_id}")
+        pipe.set(f"stats_updated:{athlete_id}", time.time())
+        pipe.execute()
+
+
+def make_versions(backend: str):
+    if backend == "memory":
+        return MemoryVersions()
+    if backend == "postgres":
+        return PostgresVersions()
+    if backend == "redis":
+        if not config.STATS_CACHE_REDIS_URL:
+            raise ValueError("STATS_CACHE_REDIS_URL is required for the redis stats cache backend")
+        return RedisVersions(config.STATS_CACHE_REDIS_URL)
+    raise ValueError(f"Unknown STATS_CACHE_BACKEND: {backend!r}")
+
+
+class StatsCache:
+    """
+    Thread-safe LRU with TTL over versioned keys.
+    """
+
+    def __init__(self, versions, ttl_seconds=300, max_entries=2048, clock=time.monotonic):
+        self.versions = versions
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (athlete_id, version, query) -> (expires_at, value)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, session, athlete_id, query, compute):
+        """
+        Cached value for `query` (a hashable description of the request), or
+        compute(), store and return it. Returns (value, hit).
+        """
+        key = (athlete_id, self.versions.get(athlete_id, session), query)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], True
+                del self._entries[key]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+stats_cache = StatsCache(
+    make_versions(config.STATS_CACHE_BACKEND),
+    ttl_seconds=config.STATS_CACHE_TTL,
+    max_entries=config.STATS_CACHE_MAX_ENTRIES,
+)
+
+# Data watermark for conditional GETs when the version backend isn't shared
+watermark = PostgresVersions()
+
+
+def data_state(athlete_id, session) -> tuple[int, datetime | None]:
+    """
+    (version, last change) of an athlete's data as every process sees it:
+    the shared backend's, else the stats_versions watermark. One row read.
+    """
+    versions = stats_cache.versions
+    return (versions if versions.shared else watermark).state(athlete_id, session)
+
+
+_PENDING_BUMPS = "stats_cache_pending_bumps"
+
+
+def bump_version(session, athlete_id):
+    """
+    Mark an athlete's stats stale. Called by every writer of activity data,
+    before it commits; non-transactional backends apply the bump once the
+    session's transaction has committed.
+    """
+    versions = stats_cache.versions
+    if isinstance(session, Session) and not versions.shared:
+        watermark.bump(athlete_id, session)
+    if versions.transactional or not isinstance(session, Session):
+        versions.bump(athlete_id, session)
+        return
+    session.info.setdefault(_PENDING_BUMPS, set()).add(athlete_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_bumps(session):
+    for athlete_id in session.info.pop(_PENDING_BUMPS, ()):
+        stats_cache.versions.bump(athlete_id, session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_bumps(session):
+    session.info.pop(_PENDING_BUMPS, None)
@@ -0,0 +1,191 @@
+"""
+Lightweight per-stage timing for ingestion/enrichment jobs.
+
+Usage:
+
+    with track_job("full_sync", athlete_id=42):
+        with span("strava_fetch"):
+            ...
+
+    @timed("upsert_splits")
+    def upsert_splits(...): ...
+
+    @timed_job("full_sync", "athlete_id")
+    def run_full_sync(session, athlete_id): ...
+
+Spans recorded outside an active job are no-ops, so instrumented helpers
+stay free to call from tests, routes and the CLI.
+"""
+
+import contextvars
+import inspect
+import json
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds (seconds) for latency histogram buckets; last bucket is +Inf
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_current_job = contextvars.ContextVar("current_job_timer", default=None)
+_sinks = []
+
+
+class StageStats:
+    """
+    Count, total, max and bucketed histogram for a single stage.
+    """
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 4),
+            "avg_s": round(self.total / self.count, 4) if self.count else 0.0,
+            "max_s": round(self.max, 4),
+            "histogram": {
+                **{f"le_{b}": n for b, n in zip(BUCKETS, self.buckets)},
+                "le_inf": self.buckets[-1],
+            },
+        }
+
+
+class JobTimer:
+    """
+    Aggregates stage timings for one job run (e.g. one athlete sync).
+    """
+
+    def __init__(self, job, **labels):
+        self.job = job
+        self.labels = labels
+        self.stages = {}
+        self.started_at = time.time()
+        self.elapsed = None
+
+    def record(self, stage, seconds):
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats()
+        stats.observe(seconds)
+
+    def summary(self):
+        return {
+            "job": self.job,
+            **self.labels,
+            "started_at": self.started_at,
+            "elapsed_s": round(self.elapsed, 4) if self.elapsed is not None else None,
+            "stages": {name: s.to_dict() for name, s in self.stages.items()},
+        }
+
+
+def add_sink(fn):
+    """
+    Register a callable receiving each finished JobTimer (e.g. a metrics exporter).
+    """
+    if fn not in _sinks:
+        _sinks.append(fn)
+
+
+def remove_sink(fn):
+    if fn in _sinks:
+        _sinks.remove(fn)
+
+
+def current_job():
+    return _current_job.get()
+
+
+def _emit(timer):
+    logger.info("⏱️ Stage timings: %s", json.dumps(timer.summary(), default=str))
+    for sink in list(_sinks):
+        try:
+            sink(timer)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("⚠️ Timing sink %r failed: %s", sink, e)
+
+
+@contextmanager
+def track_job(job, **labels):
+    """
+    Collect stage timings for the enclosed block and emit a summary on exit.
+    Nested calls join the outer job instead of starting a new one.
+    """
+    existing = _current_job.get()
+    if existing is not None:
+        yield existing
+        return
+
+    timer = JobTimer(job, **labels)
+    token = _current_job.set(timer)
+    start = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.elapsed = time.perf_counter() - start
+        _current_job.reset(token)
+        _emit(timer)
+
+
+@contextmanager
+def span(stage):
+    """
+    Time the enclosed block as `stage` within the active job, if any.
+    """
+    timer = _current_job.get()
+    if timer is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.record(stage, time.perf_counter() - start)
+
+
+def timed(stage):
+    """
+    Decorator form of span().
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_job(job, *labels):
+    """
+    Decorator form of track_job(). `labels` name arguments of the wrapped
+    function whose values label the job, e.g. "athlete_id".
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            with track_job(job, **{name: bound.arguments[name] for name in labels}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
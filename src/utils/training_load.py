@@ -0,0 +1,80 @@
+"""
+Training-load math: per-activity load and the CTL/ATL/TSB recurrences.
+
+Load per activity, in order of preference:
+    1. Zone TRIMP: minutes in each HR zone weighted 1..5 (from hr_zone_* percentages)
+    2. Strava suffer_score (already a TRIMP-style relative effort)
+    3. Pace-based: hours * (speed / threshold speed)^2 * 100, as in rTSS
+
+CTL (fitness) and ATL (fatigue) are exponentially weighted daily loads with
+42- and 7-day time constants; TSB (form) is yesterday's CTL minus ATL.
+Each day depends only on the day before, so a change on day D only needs
+days >= D recomputed.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import src.utils.config as config
+
+CTL_DAYS = 42
+ATL_DAYS = 7
+
+_ZONE_WEIGHTS = (1, 2, 3, 4, 5)
+
+
+@dataclass
+class LoadDay:
+    day: date
+    load: float
+    ctl: float
+    atl: float
+    tsb: float
+
+
+def _get(obj, name):
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def activity_load(activity) -> float:
+    """
+    Training load for one activity (Activity row or dict).
+    """
+    minutes = (_get(activity, "moving_time") or 0) / 60
+    zones = [_get(activity, f"hr_zone_{i}") or 0.0 for i in range(1, 6)]
+    if minutes and sum(zones) > 0:
+        return round(sum(minutes * pct / 100 * w for pct, w in zip(zones, _ZONE_WEIGHTS)), 1)
+
+    suffer = _get(activity, "suffer_score")
+    if suffer:
+        return float(suffer)
+
+    speed = _get(activity, "average_speed")
+    if minutes and speed:
+        return round(minutes / 60 * (speed / config.LOAD_THRESHOLD_SPEED) ** 2 * 100, 1)
+    return 0.0
+
+
+def roll_forward(start_day: date, prev_ctl: float, prev_atl: float, daily_loads: dict, end_day: date) -> list[LoadDay]:
+    """
+    Apply the CTL/ATL recurrences from `start_day` to `end_day` inclusive,
+    seeded with the previous day's values. Days missing from `daily_loads` have zero load.
+    """
+    days = []
+    ctl, atl = prev_ctl, prev_atl
+    day = start_day
+    while day <= end_day:
+        load = daily_loads.get(day, 0.0)
+        tsb = ctl - atl
+        ctl += (load - ctl) / CTL_DAYS
+        atl += (load - atl) / ATL_DAYS
+        days.append(LoadDay(day, round(load, 1), round(ctl, 2), round(atl, 2), round(tsb, 2)))
+        day += timedelta(days=1)
+    return days
+
+
+def decay(ctl: float, atl: float, days: int) -> tuple[float, float]:
+    """
+    CTL/ATL after `days` rest days, in closed form.
+    """
+    return ctl * (1 - 1 / CTL_DAYS) ** days, atl * (1 - 1 / ATL_DAYS) ** days
@@ -110,6 +110,23 @@ def seed_test_data(test_db_session):
     test_db_session.commit()
 
 
+# -------------------------
+# 🗃️ Stats Watermark
+# -------------------------
+
+@pytest.fixture(autouse=True)
+def memory_watermark(monkeypatch):
+    """
+    Conditional GETs read the stats_versions watermark; keep it in memory so
+    route tests with mocked sessions never reach the database.
+    """
+    import src.utils.stats_cache as stats_cache_module
+
+    watermark = stats_cache_module.MemoryVersions()
+    monkeypatch.setattr(stats_cache_module, "watermark", watermark)
+    return watermark
+
+
 # -------------------------
 # 🔁 Patched App Fixtures
 # -------------------------
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from src.db.models.activities import Activity
 from src.db.dao.activity_stats_dao import ActivityStatsDAO
 from src.db.dao.activity_dao import ActivityDAO
+from src.utils.conversions import convert_metrics_batch
 
 
 def test_get_by_id_returns_activity():
@@ -36,7 +37,7 @@ def test_get_by_id_returns_none():
     mock_filter_by.first.assert_called_once()
 
 
-@patch("src.db.dao.activity_dao.convert_metrics")
+@patch("src.db.dao.activity_dao.convert_metrics_batch", wraps=convert_metrics_batch)
 def test_upsert_activities_empty_list_returns_zero(mock_convert):
     mock_session = MagicMock()
     count = ActivityDAO.upsert_activities(mock_session, athlete_id=1, activities=[])
@@ -46,17 +47,9 @@ def test_upsert_activities_empty_list_returns_zero(mock_convert):
     mock_session.commit.assert_not_called()
 
 
-@patch("src.db.dao.activity_dao.convert_metrics")
+@patch("src.db.dao.activity_dao.convert_metrics_batch", wraps=convert_metrics_batch)
 def test_upsert_activities_single_activity(mock_convert):
     mock_session = MagicMock()
-    mock_convert.return_value = {
-        "conv_distance": 100,
-        "conv_elevation_feet": 50,
-        "conv_avg_speed": 5,
-        "conv_max_speed": 10,
-        "conv_moving_time": 60,
-        "conv_elapsed_time": 65,
-    }
 
     activities = [{
         "id": 101,
@@ -88,17 +81,21 @@ def test_upsert_activities_single_activity(mock_convert):
     mock_session.commit.assert_called_once()
 
 
-@patch("src.db.dao.activity_dao.convert_metrics")
+@patch("src.db.dao.activity_dao.update_index")
+def test_upsert_activities_can_leave_transaction_open(mock_index):
+    mock_session = MagicMock()
+    mock_session.execute.return_value.rowcount = 1
+    activity = {"id": 101, "type": "Run", "start_date": "2023-01-01T00:00:00Z", "distance": 1000,
+                "moving_time": 60, "elapsed_time": 65, "external_id": "ext-101"}
+
+    assert ActivityDAO.upsert_activities(mock_session, 42, [activity], commit=False) == 1
+    mock_session.commit.assert_not_called()
+    mock_index.assert_not_called()
+
+
+@patch("src.db.dao.activity_dao.convert_metrics_batch", wraps=convert_metrics_batch)
 def test_upsert_activities_multiple_activities(mock_convert):
     mock_session = MagicMock()
-    mock_convert.return_value = {
-        "conv_distance": 100,
-        "conv_elevation_feet": 50,
-        "conv_avg_speed": 5,
-        "conv_max_speed": 10,
-        "conv_moving_time": 60,
-        "conv_elapsed_time": 65,
-    }
 
     activities = [
         {"id": 201, "name": "Morning Run", "type": "Run", "start_date": "2023-01-01T06:00:00Z", "distance": 1000, "elapsed_time": 65, "moving_time": 60, "total_elevation_gain": 15, "external_id": "ext-201"},
@@ -112,7 +109,11 @@ def test_upsert_activities_multiple_activities(mock_convert):
     count = ActivityDAO.upsert_activities(mock_session, athlete_id=99, activities=activities)
 
     assert count == 2
-    assert mock_convert.call_count == 2
+    # One column-wise conversion for the whole page
+    mock_convert.assert_called_once()
+    rows = mock_session.execute.call_args[0][0].compile().params
+    assert rows["conv_distance_m0"] == 0.62
+    assert rows["conv_moving_time_m1"] == "0:30"
     mock_session.execute.assert_called_once()
     mock_session.commit.assert_called_once()
 
@@ -0,0 +1,117 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.utils import activity_index
+from src.utils.activity_index import ActivityIndex, query_tokens
+
+
+def _run(activity_id, day, km, minutes, name="Morning Run"):
+    return {
+        "activity_id": activity_id,
+        "start_date": day,
+        "distance": km * 1000,
+        "moving_time": minutes * 60,
+        "name": name,
+        "type": "Run",
+    }
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry(monkeypatch):
+    monkeypatch.setattr("src.utils.config.ACTIVITY_INDEX_DIR", None)
+    activity_index.clear()
+    yield
+    activity_index.clear()
+
+
+def test_query_tokens_resolve_relative_years():
+    tokens = query_tokens("How did my long runs this spring compare to last year?", today=date(2025, 6, 1))
+    assert {"long", "run", "spring", "2025", "2024"} <= set(tokens)
+
+
+def test_search_ranks_matching_history_first():
+    index = ActivityIndex()
+    index.upsert([
+        _run(1, datetime(2024, 4, 14), 21, 110, "Sunday long run"),
+        _run(2, datetime(2024, 11, 3), 5, 30, "Easy run"),
+        _run(3, datetime(2025, 4, 20), 24, 125, "Long run"),
+        _run(4, datetime(2025, 1, 8), 6, 22, "Intervals"),
+    ])
+
+    hits = index.search("How did my long runs this spring compare to last year?", k=3, today=date(2025, 6, 1))
+    activity_ids = [h["activity_id"] for h in hits if h["kind"] == "activity"]
+    assert set(activity_ids[:2]) == {1, 3}
+    assert all(h["score"] > 0 for h in hits)
+
+
+def test_upsert_builds_weekly_entries_and_replaces_activities():
+    index = ActivityIndex()
+    index.upsert([_run(1, datetime(2025, 6, 2), 10, 50), _run(2, datetime(2025, 6, 4), 5, 25)])
+    index.upsert([_run(2, datetime(2025, 6, 4), 8, 40)])
+
+    weeks = [h for h in index.search("weekly volume june 2025", k=5) if h["kind"] == "week"]
+    assert len(index) == 3  # two activities + one ISO week
+    assert weeks[0]["total_distance"] == pytest.approx(18000)
+    assert weeks[0]["runs"] == 2
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = ActivityIndex()
+    index.upsert([_run(1, datetime(2025, 3, 1), 12, 60, "Tempo")])
+    path = tmp_path / "7.npz"
+    index.save(str(path))
+
+    loaded = ActivityIndex.load(str(path))
+    assert len(loaded) == len(index)
+    assert loaded.search("tempo march")[0]["name"] == "Tempo"
+
+
+def test_update_index_only_touches_existing_indexes(monkeypatch, tmp_path):
+    assert activity_index.update_index(7, [_run(1, "2025-03-01T07:00:00Z", 5, 30)]) == 0
+
+    monkeypatch.setattr("src.utils.config.ACTIVITY_INDEX_DIR", str(tmp_path))
+    activity_index.search(7, "anything", 1, lambda: [_run(1, datetime(2025, 3, 1), 5, 30)])
+    assert (tmp_path / "7.npz").exists()
+    assert not list(tmp_path.glob("*.tmp.npz"))
+
+    assert activity_index.update_index(7, [_run(2, "2025-03-08T07:00:00Z", 30, 150, "Long run")]) == 1
+    activity_index.clear()  # simulate another worker loading from disk
+    hits = activity_index.search(7, "long run", 2, pytest.fail)
+    assert [h["activity_id"] for h in hits if h["kind"] == "activity"] == [2, 1]
+
+
+def test_search_loads_history_only_when_counts_disagree():
+    history = [_run(1, datetime(2025, 3, 1), 5, 30), _run(2, datetime(2025, 3, 8), 30, 150, "Long run")]
+    loads = []
+
+    def load():
+        loads.append(1)
+        return history
+
+    activity_index.search(7, "long run", 2, load)
+    activity_index.search(7, "long run", 2, load)
+    assert len(loads) == 1
+
+    # A write this worker never saw: top up from the database
+    history.append(_run(3, datetime(2025, 3, 15), 32, 160, "Long run"))
+    hits = activity_index.search(7, "long run", 3, load)
+    assert len(loads) == 2 and 3 in [h["activity_id"] for h in hits]
+
+    # A deletion: rebuild rather than keep serving the removed activity
+    del history[2]
+    hits = activity_index.search(7, "long run", 2, load)
+    assert 3 not in [h["activity_id"] for h in hits]
+    assert activity_index.get_index(7).activity_count == 2
+
+
+def test_query_latency_at_10k_activities():
+    from src.scripts.bench_activity_index import make_activities
+    import time
+
+    index = ActivityIndex()
+    index.upsert(make_activities(10000))
+    start = time.perf_counter()
+    for _ in range(20):
+        index.search("How did my long runs this spring compare to last year?", k=20)
+    assert (time.perf_counter() - start) / 20 < 0.05
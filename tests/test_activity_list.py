@@ -0,0 +1,72 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.db.dao.activity_dao import ActivityDAO
+from src.routes.activity_list_routes import format_cursor, parse_cursor
+
+
+def _rows(n, start_id=100):
+    return [
+        {"activity_id": start_id - i, "start_date": datetime(2026, 10, 10 - i, 7, 0), "name": f"Run {i}"}
+        for i in range(n)
+    ]
+
+
+def test_page_query_seeks_on_cursor_and_projects_columns():
+    session = MagicMock()
+    ActivityDAO.get_activities_page(session, 7, 21, (datetime(2026, 1, 1), 55), ["name", "distance"])
+
+    stmt = session.execute.call_args[0][0]
+    sql = str(stmt.compile(dialect=postgresql.dialect())).replace("\n", " ")
+    assert "SELECT activities.activity_id, activities.start_date, activities.name, activities.distance" in sql
+    assert "(activities.start_date, activities.activity_id) < (" in sql
+    assert "ORDER BY activities.start_date DESC, activities.activity_id DESC" in sql
+    assert "activities.start_date IS NOT NULL" in sql
+    assert "OFFSET" not in sql
+
+
+def test_page_query_rejects_unknown_columns():
+    with pytest.raises(ValueError):
+        ActivityDAO.get_activities_page(MagicMock(), 7, 10, columns=["athlete_id"])
+
+
+def test_format_cursor_without_start_date():
+    assert format_cursor({"start_date": None, "activity_id": 3}) is None
+    assert format_cursor({"start_date": datetime(2026, 1, 1), "activity_id": 3}) == "2026-01-01T00:00:00,3"
+
+
+def test_parse_cursor_accepts_unencoded_offset():
+    assert parse_cursor("2026-10-01T07:00:00 00:00,42") == (datetime.fromisoformat("2026-10-01T07:00:00+00:00"), 42)
+
+
+def test_list_activities_pages_with_cursor(client):
+    with patch("src.routes.activity_list_routes.get_session"), \
+            patch("src.routes.activity_list_routes.ActivityDAO.get_activities_page", return_value=_rows(3)) as page:
+        resp = client.get("/activities?athlete_id=7&limit=2&before=2026-10-11T00:00:00,101&fields=name")
+    body = resp.get_json()
+    assert resp.status_code == 200
+    assert [a["activity_id"] for a in body["activities"]] == [100, 99]
+    assert body["next_before"] == "2026-10-09T07:00:00,99"
+    assert page.call_args[0][1:] == (7, 3, (datetime(2026, 10, 11), 101), ["name"])
+
+
+def test_list_activities_last_page_and_etag(client):
+    with patch("src.routes.activity_list_routes.get_session"), \
+            patch("src.routes.activity_list_routes.ActivityDAO.get_activities_page", return_value=_rows(2)):
+        first = client.get("/activities?athlete_id=7&limit=5")
+        assert first.get_json()["next_before"] is None
+        etag = first.headers["ETag"]
+
+        again = client.get("/activities?athlete_id=7&limit=5", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+
+@pytest.mark.parametrize("query", [
+    "", "athlete_id=7&limit=0", "athlete_id=7&limit=500", "athlete_id=7&before=yesterday",
+])
+def test_list_activities_validates_params(client, query):
+    assert client.get(f"/activities?{query}").status_code == 400
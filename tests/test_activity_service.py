@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import MagicMock, patch, call, ANY
 from datetime import datetime, timedelta
 from src.services import activity_service as svc
 
@@ -69,6 +69,7 @@ def test_get_activities_to_enrich_returns_ids(mock_session, athlete_id):
     assert result == [101, 102, 103]
     mock_session.execute.assert_called_once()
 
+@patch("src.utils.config.HR_ZONES_SOURCE", "strava")
 @patch("src.services.activity_service.StravaClient")
 @patch("src.services.activity_service.extract_hr_zone_percentages", return_value=[10,20,30,25,15])
 @patch("src.services.activity_service.upsert_splits")
@@ -92,7 +93,7 @@ def test_enrich_one_activity_with_refresh_calls_enrich(mock_enrich, mock_token,
     result = svc.enrich_one_activity_with_refresh(mock_session, athlete_id, 456)
     assert result is True
     mock_token.assert_called_once_with(mock_session, athlete_id)
-    mock_enrich.assert_called_once_with(mock_session, "fake-token", 456)
+    mock_enrich.assert_called_once_with(mock_session, "fake-token", 456, batch=None)
 
 def test_update_activity_enrichment_executes_sql(mock_session, dummy_activity_json):
     hr_zones = [10, 20, 30, 25, 15]
@@ -164,4 +165,190 @@ def test_run_enrichment_batch_calls_all(mock_enrich, mock_get_activities, mock_s
     mock_get_activities.return_value = [1, 2, 3]
     svc.run_enrichment_batch(mock_session, athlete_id, batch_size=3)
     assert mock_enrich.call_count == 3
-    mock_enrich.assert_has_calls([call(mock_session, athlete_id, 1), call(mock_session, athlete_id, 2), call(mock_session, athlete_id, 3)])
+    mock_enrich.assert_has_calls([
+        call(mock_session, athlete_id, 1, batch=ANY),
+        call(mock_session, athlete_id, 2, batch=ANY),
+        call(mock_session, athlete_id, 3, batch=ANY),
+    ])
+
+def test_enrich_one_activity_single_commit(mock_session, dummy_activity_json, dummy_zones_data, dummy_streams):
+    with patch("src.services.activity_service.StravaClient") as MockClient, \
+         patch("src.services.activity_service.upsert_splits") as mock_upsert:
+        mock_client = MockClient.return_value
+        mock_client.get_activity.return_value = dummy_activity_json
+        mock_client.get_hr_zones.return_value = dummy_zones_data
+        mock_client.get_streams.return_value = dummy_streams
+
+        svc.enrich_one_activity(mock_session, "fake-token", 123)
+
+    mock_upsert.assert_called_once_with(mock_session, ANY, commit=False)
+    mock_session.commit.assert_called_once()
+
+@patch("src.services.activity_service.log_strava_payload")
+@patch("src.services.activity_service.StravaClient")
+def test_enrich_one_activity_with_batch_defers_writes(MockClient, mock_dump, mock_session, dummy_activity_json, dummy_zones_data, dummy_streams):
+    mock_client = MockClient.return_value
+    mock_client.get_activity.return_value = dummy_activity_json
+    mock_client.get_hr_zones.return_value = dummy_zones_data
+    mock_client.get_streams.return_value = dummy_streams
+
+    batch = svc.EnrichmentBatch(mock_session, commit_every=5)
+    assert svc.enrich_one_activity(mock_session, "fake-token", 123, batch=batch) is True
+    assert len(batch) == 1
+    mock_session.execute.assert_not_called()
+    mock_session.commit.assert_not_called()
+
+@patch("src.services.activity_service.upsert_splits")
+def test_enrichment_batch_flushes_every_n_with_one_commit(mock_upsert, mock_session, dummy_activity_json):
+    batch = svc.EnrichmentBatch(mock_session, commit_every=3)
+    for aid in (1, 2, 3, 4):
+        batch.add(aid, dummy_activity_json, [20.0] * 5, [{"activity_id": aid, "lap_index": 1}])
+
+    # First three flushed together: one UPDATE, one splits upsert, one commit
+    assert mock_session.execute.call_count == 1
+    assert mock_upsert.call_count == 1
+    assert len(mock_upsert.call_args[0][1]) == 3
+    assert mock_session.commit.call_count == 1
+    assert len(batch) == 1
+
+    assert batch.flush() == 1
+    assert mock_session.commit.call_count == 2
+    assert batch.flush() == 0
+
+def test_enrichment_batch_manual_only_flushes_on_demand(mock_session, dummy_activity_json):
+    batch = svc.EnrichmentBatch(mock_session, commit_every=1, manual=True)
+    for aid in (1, 2, 3):
+        batch.add(aid, dummy_activity_json, [20.0] * 5, [])
+    mock_session.commit.assert_not_called()
+    assert batch.flush() == 3
+    mock_session.commit.assert_called_once()
+
+@patch("src.services.activity_service.upsert_splits")
+def test_enrichment_batch_keeps_pending_results_when_flush_fails(mock_upsert, mock_session, dummy_activity_json):
+    batch = svc.EnrichmentBatch(mock_session, commit_every=2)
+    batch.add(1, dummy_activity_json, [20.0] * 5, [])
+    mock_session.commit.side_effect = [RuntimeError("db down"), None]
+    with pytest.raises(RuntimeError):
+        batch.add(2, dummy_activity_json, [20.0] * 5, [])
+
+    mock_session.rollback.assert_called_once()
+    assert batch.pending_ids == [1, 2]
+    assert batch.flush() == 2
+    assert len(batch) == 0
+
+@patch("src.services.activity_service.time.sleep")
+@patch("src.services.activity_service.enrich_one_activity_with_refresh")
+@patch("src.services.activity_service.get_activities_to_enrich", return_value=[1, 2])
+def test_run_enrichment_batch_flush_does_not_mask_error(mock_get, mock_enrich, mock_sleep, mock_session):
+    mock_enrich.side_effect = [True, ValueError("strava down")]
+    with patch.object(svc.EnrichmentBatch, "flush", side_effect=RuntimeError("db down")) as flush:
+        with pytest.raises(ValueError):
+            svc.run_enrichment_batch(mock_session, 7, batch_size=2)
+    flush.assert_called_once()
+
+def test_bulk_update_activity_enrichment_uses_values_join(mock_session, dummy_activity_json):
+    params = [
+        svc.build_enrichment_params(aid, dummy_activity_json, [20.0] * 5)
+        for aid in (10, 11)
+    ]
+    svc.bulk_update_activity_enrichment(mock_session, params)
+
+    stmt, binds = mock_session.execute.call_args[0]
+    sql = str(stmt)
+    assert "UPDATE activities AS a SET" in sql
+    assert "FROM (VALUES" in sql
+    assert "CAST(:activity_id_1 AS BIGINT)" in sql
+    assert binds["activity_id_0"] == 10
+    assert binds["activity_id_1"] == 11
+    mock_session.commit.assert_not_called()
+
+def test_upsert_splits_dedupes_conflict_keys_and_can_defer_commit(mock_session):
+    from src.db.dao.split_dao import upsert_splits
+
+    base = {"distance": 1609.3, "elapsed_time": 600, "moving_time": 590,
+            "average_speed": 2.7, "max_speed": 3.1, "start_index": 0, "end_index": 10}
+    splits = [
+        {**base, "activity_id": 1, "lap_index": 1, "split": 1},
+        {**base, "activity_id": 1, "lap_index": 1, "split": 1, "distance": 1610.0},
+        {**base, "activity_id": 2, "lap_index": 1, "split": 1},
+    ]
+    upsert_splits(mock_session, splits, commit=False)
+
+    stmt = mock_session.execute.call_args[0][0]
+    params = stmt.compile().params
+    assert sum(1 for k in params if k.startswith("activity_id")) == 2
+    mock_session.commit.assert_not_called()
+
+def test_build_splits_computes_all_schemes_in_one_pass():
+    streams = {
+        "distance": [i * 10.0 for i in range(400)],
+        "time": list(range(400)),
+        "velocity_smooth": [3.0] * 400,
+        "heartrate": [150] * 400,
+    }
+    splits = svc.build_splits(1, streams, schemes=svc.parse_split_schemes("km,mi,400m"))
+
+    by_scheme = {}
+    for s in splits:
+        by_scheme.setdefault(s["scheme"], []).append(s)
+    assert len(by_scheme["km"]) == 3
+    assert len(by_scheme["mi"]) == 2
+    assert len(by_scheme["400m"]) == 9
+    assert by_scheme["km"][0]["end_index"] == 100
+    assert by_scheme["mi"] == svc.build_mile_splits(1, streams)
+
+def test_parse_split_schemes_rejects_unknown():
+    assert svc.parse_split_schemes(" km , 800m ") == [("km", 1000.0), ("800m", 800.0)]
+    with pytest.raises(ValueError):
+        svc.parse_split_schemes("furlong")
+
+def test_upsert_splits_keeps_schemes_apart(mock_session):
+    from src.db.dao.split_dao import upsert_splits
+
+    base = {"activity_id": 1, "lap_index": 1, "distance": 1000.0, "elapsed_time": 300, "moving_time": 300,
+            "average_speed": 3.3, "max_speed": 4.0, "start_index": 0, "end_index": 10, "split": 1}
+    upsert_splits(mock_session, [{**base, "scheme": "km"}, {**base, "scheme": "mi"}, base], commit=False)
+
+    params = mock_session.execute.call_args[0][0].compile().params
+    assert sorted(v for k, v in params.items() if k.startswith("scheme")) == ["km", "mi"]
+
+@patch("src.services.activity_service.get_hr_zone_settings", return_value=([120, 140, 160, 180], None))
+@patch("src.services.activity_service.upsert_splits")
+@patch("src.services.activity_service.update_activity_enrichment")
+@patch("src.services.activity_service.StravaClient")
+def test_enrich_one_activity_local_zones_skip_strava_call(MockClient, mock_update, mock_upsert, mock_settings, mock_session, dummy_activity_json):
+    mock_client = MockClient.return_value
+    mock_client.get_activity.return_value = {**dummy_activity_json, "athlete": {"id": 7}}
+    mock_client.get_streams.return_value = {
+        "distance": [0, 10, 20, 30, 40], "time": [0, 10, 20, 30, 40],
+        "heartrate": [100, 110, 130, 150, 190],
+    }
+
+    with patch("src.utils.config.HR_ZONES_SOURCE", "local"):
+        svc.enrich_one_activity(mock_session, "fake-token", 123)
+
+    mock_client.get_hr_zones.assert_not_called()
+    mock_settings.assert_called_once_with(mock_session, 7)
+    assert mock_update.call_args[0][3] == [25.0, 25.0, 25.0, 0.0, 25.0]
+
+@patch("src.services.activity_service.log_strava_payload")
+@patch("src.services.activity_service.get_recent_best_times", return_value=[])
+@patch("src.services.activity_service.get_pace_zone_bounds", return_value=None)
+@patch("src.services.activity_service.get_hr_zone_settings", return_value=(None, 190))
+@patch("src.services.activity_service.StravaClient")
+def test_enrichment_batch_resolves_zone_bounds_once_per_athlete(MockClient, mock_hr, mock_pace, mock_efforts, mock_dump, mock_session, dummy_activity_json):
+    mock_client = MockClient.return_value
+    mock_client.get_activity.return_value = {**dummy_activity_json, "athlete": {"id": 7}}
+    mock_client.get_streams.return_value = {
+        "distance": [0, 10, 20, 30, 40], "time": [0, 10, 20, 30, 40], "heartrate": [100, 110, 130, 150, 190],
+    }
+    batch = svc.EnrichmentBatch(mock_session, commit_every=10)
+
+    with patch("src.utils.config.HR_ZONES_SOURCE", "local"):
+        for activity_id in (1, 2, 3):
+            svc.enrich_one_activity(mock_session, "fake-token", activity_id, batch=batch)
+
+    assert len(batch) == 3
+    mock_hr.assert_called_once_with(mock_session, 7)
+    mock_pace.assert_called_once_with(mock_session, 7)
+    mock_efforts.assert_called_once()
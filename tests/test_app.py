@@ -14,10 +14,8 @@ def test_ping(client):
     assert resp.data == b"pong"
 
 @patch("sqlalchemy.inspect")
-@patch("sqlalchemy.create_engine")
-def test_db_check_success(mock_create_engine, mock_inspect, client):
-    mock_engine = MagicMock()
-    mock_create_engine.return_value = mock_engine
+@patch("src.db.db_session.get_engine")
+def test_db_check_success(mock_get_engine, mock_inspect, client):
     mock_insp = MagicMock()
     mock_inspect.return_value = mock_insp
     mock_insp.get_columns.return_value = [
@@ -32,8 +30,8 @@ def test_db_check_success(mock_create_engine, mock_inspect, client):
     assert json_data["split_column"]["name"] == "split"
     assert json_data["split_column"]["nullable"] is True
 
-@patch("sqlalchemy.create_engine", side_effect=Exception("DB failure"))
-def test_db_check_failure(mock_create_engine, client):
+@patch("src.db.db_session.get_engine", side_effect=Exception("DB failure"))
+def test_db_check_failure(mock_get_engine, client):
     resp = client.get("/db-check")
     assert resp.status_code == 500
     json_data = resp.get_json()
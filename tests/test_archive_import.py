@@ -0,0 +1,172 @@
+import gzip
+import zipfile
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services import archive_import_service as svc
+from src.utils.activity_files import file_format, parse_activity_file, stream_summary, trackpoints_to_streams
+
+START = datetime(2024, 5, 1, 6, 30, tzinfo=timezone.utc)
+HR_BOUNDS = [114, 133, 152, 171]
+PACE_BOUNDS = [2.5, 3.0, 3.5, 4.0]
+CSV_HEADER = (
+    "Activity ID,Activity Date,Activity Name,Activity Type,Elapsed Time,Distance,"
+    "Max Heart Rate,Filename,Elapsed Time,Moving Time,Distance,Elevation Gain,Calories\n"
+)
+
+
+def gpx(points=1500, step_m=3.0):
+    # Due north at ~3 m/s, one point per second, HR 150
+    deg = step_m / 111195.0
+    trkpts = "".join(
+        f'<trkpt lat="{45 + i * deg:.7f}" lon="7.0"><ele>{100 + (i % 10)}</ele>'
+        f"<time>{(START + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ')}</time>"
+        "<extensions><gpxtpx:TrackPointExtension><gpxtpx:hr>150</gpxtpx:hr>"
+        "</gpxtpx:TrackPointExtension></extensions></trkpt>"
+        for i in range(points)
+    )
+    return (
+        '\n<?xml version="1.0" encoding="UTF-8"?>'
+        '<gpx xmlns="http://www.topografix.com/GPX/1/1" '
+        'xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">'
+        f"<trk><trkseg>{trkpts}</trkseg></trk></gpx>"
+    ).encode()
+
+
+def tcx(points=700):
+    tps = "".join(
+        f"<Trackpoint><Time>{(START + timedelta(seconds=2 * i)).isoformat()}</Time>"
+        f"<DistanceMeters>{i * 7.0}</DistanceMeters>"
+        f"<HeartRateBpm><Value>{140 + i % 5}</Value></HeartRateBpm></Trackpoint>"
+        for i in range(points)
+    )
+    return (
+        '<TrainingCenterDatabase xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2">'
+        f"<Activities><Activity><Lap><Track>{tps}</Track></Lap></Activity></Activities>"
+        "</TrainingCenterDatabase>"
+    ).encode()
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    (tmp_path / "activities").mkdir()
+    (tmp_path / "activities" / "11.gpx").write_bytes(gpx())
+    (tmp_path / "activities" / "12.tcx.gz").write_bytes(gzip.compress(tcx()))
+    (tmp_path / "activities" / "14.gpx").write_bytes(b"<gpx><broken")
+    (tmp_path / "activities.csv").write_text(
+        CSV_HEADER
+        + '11,"May 1, 2024, 6:30:00 AM",Morning Run,Run,1499,"4.50",,activities/11.gpx,1499,,4497.0,,420\n'
+        + '12,"May 2, 2024, 6:30:00 AM",Track,Run,1398,4.89,,activities/12.tcx.gz,1398,,4893.0,,\n'
+        + '13,"May 3, 2024, 6:30:00 AM",Ride,Ride,3600,30,,activities/13.gpx,3600,,30000,,\n'
+        + '14,"May 4, 2024, 6:30:00 AM",Corrupt,Run,100,1,,activities/14.gpx,100,,1000,,\n'
+        + '15,"May 5, 2024, 6:30:00 AM",Treadmill run,Run,1800,5,,,1800,1800,5000,,\n'
+    )
+    return tmp_path
+
+
+def test_file_format():
+    assert file_format("activities/1.gpx") == "gpx"
+    assert file_format("activities/1.FIT.gz") == "fit"
+    assert file_format("activities/1.json") is None
+
+
+def test_gpx_streams_match_strava_shape():
+    streams = trackpoints_to_streams(parse_activity_file("a.gpx", gpx()))
+    assert len(streams["time"]) == len(streams["distance"]) == len(streams["heartrate"]) == 1500
+    assert streams["time"][:2] == [0.0, 1.0]
+    assert streams["distance"][-1] == pytest.approx(1499 * 3.0, rel=1e-3)
+    assert streams["velocity_smooth"][700] == pytest.approx(3.0, rel=1e-2)
+    assert streams["latlng"][0] == [45.0, 7.0]
+
+    summary = stream_summary(streams)
+    assert summary["elapsed_time"] == 1499
+    assert summary["average_heartrate"] == 150
+    assert summary["total_elevation_gain"] > 0
+
+
+def test_tcx_uses_device_distance():
+    streams = trackpoints_to_streams(parse_activity_file("a.tcx", tcx()))
+    assert streams["distance"][-1] == 699 * 7.0
+    assert "latlng" not in streams
+    assert stream_summary(streams)["moving_time"] == 1398
+
+
+def test_read_activities_csv_prefers_raw_unit_columns(archive_dir):
+    entries = svc.ArchiveReader(archive_dir).activities()
+    assert [e["id"] for e in entries] == [11, 12, 13, 14, 15]
+    assert entries[0]["distance"] == 4497.0
+    assert entries[0]["calories"] == 420
+
+
+def test_zip_archive_with_top_level_folder(archive_dir, tmp_path_factory):
+    path = tmp_path_factory.mktemp("zip") / "export.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        for f in archive_dir.rglob("*"):
+            if f.is_file():
+                zf.write(f, f"export_123/{f.relative_to(archive_dir).as_posix()}")
+    reader = svc.ArchiveReader(path)
+    assert len(reader.activities()) == 5
+    assert reader.read("activities/11.gpx") == gpx()
+
+
+def test_process_archive_activity_derives_enrichment(archive_dir):
+    entry = svc.ArchiveReader(archive_dir).activities()[0]
+    result = svc.process_archive_activity((str(archive_dir), entry, 7, HR_BOUNDS, PACE_BOUNDS))
+    assert result["error"] is None
+    act = result["activity_json"]
+    assert act["start_date"] == "2024-05-01T06:30:00Z"
+    assert act["external_id"] == "11.gpx"
+    assert act["athlete"] == {"id": 7}
+    assert act["distance"] == pytest.approx(4497, rel=1e-3)
+    assert result["hr_zone_pcts"][2] == 100.0
+    km = [s for s in result["splits"] if s["scheme"] == "km"]
+    assert len(km) == 4 and all(s["pace_zone"] == 3 for s in km)
+    assert {e["name"] for e in result["best_efforts"]} >= {"1k", "1 mile"}
+    assert result["route"]["point_count"] == 1500
+
+
+def test_process_archive_activity_reports_parse_errors(archive_dir):
+    entry = svc.ArchiveReader(archive_dir).activities()[3]
+    result = svc.process_archive_activity((str(archive_dir), entry, 7, HR_BOUNDS, PACE_BOUNDS))
+    assert "14.gpx" in result["error"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_archive_writes_runs_in_chunks(archive_dir, workers):
+    session = MagicMock()
+    with patch.object(svc, "resolve_zone_bounds", return_value=(HR_BOUNDS, PACE_BOUNDS)), \
+         patch.object(svc, "resolve_pace_zone_bounds", return_value=PACE_BOUNDS), \
+         patch.object(svc.ActivityDAO, "upsert_activities") as upsert, \
+         patch.object(svc, "EnrichmentBatch") as batch_cls, \
+         patch.object(svc, "cluster_routes", return_value=3) as cluster:
+        counts = svc.import_archive(session, 7, archive_dir, workers=workers, chunk_size=2)
+
+    assert counts["imported"] == 3
+    assert counts["skipped"] == 1
+    assert counts["failed"] == 1
+    assert counts["splits"] > 0
+    cluster.assert_called_once_with(session, 7)
+    upserted = [a["id"] for call in upsert.call_args_list for a in call.args[2]]
+    assert sorted(upserted) == [11, 12, 15]
+    assert batch_cls.return_value.flush.call_count == upsert.call_count
+    # Activities and their enrichment share the batch's single commit
+    assert all(call.kwargs["commit"] is False for call in upsert.call_args_list)
+    assert all(call.kwargs["manual"] is True for call in batch_cls.call_args_list)
+
+
+def test_import_archive_reclassify_bumps_stats_version(archive_dir):
+    session = MagicMock()
+    with patch.object(svc, "resolve_zone_bounds", return_value=(HR_BOUNDS, PACE_BOUNDS)), \
+         patch.object(svc, "resolve_pace_zone_bounds", return_value=[2.6, 3.1, 3.6, 4.1]), \
+         patch.object(svc.ActivityDAO, "upsert_activities"), \
+         patch.object(svc, "EnrichmentBatch"), \
+         patch.object(svc, "cluster_routes", return_value=0), \
+         patch.object(svc, "bulk_assign_pace_zones") as bulk, \
+         patch.object(svc, "bump_version") as bump:
+        svc.import_archive(session, 7, archive_dir, workers=1)
+
+    assert bulk.call_args.kwargs["commit"] is False
+    bump.assert_called_once_with(session, 7)
+    session.commit.assert_called_once()
@@ -0,0 +1,143 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from src.routes.ask_routes import ask_bp
+from src.utils import gpt_ops
+from src.utils.ask_cache import AskResponseCache, ask_cache, normalise_question, context_hash
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalise_question_ignores_case_punctuation_and_spacing():
+    assert normalise_question("  How far did I RUN this week?? ") == "how far did i run this week"
+
+
+def test_context_hash_is_order_insensitive_for_keys():
+    assert context_hash([{"a": 1, "b": 2}]) == context_hash([{"b": 2, "a": 1}])
+    assert context_hash([{"a": 1}]) != context_hash([{"a": 2}])
+
+
+def test_cache_hit_miss_and_ttl():
+    clock = FakeClock()
+    cache = AskResponseCache(ttl_seconds=10, clock=clock)
+    cache.put(1, "q", "ctx", "answer")
+    assert cache.get(1, "q", "ctx") == "answer"
+    assert cache.get(1, "q", "other-ctx") is None
+    assert cache.get(2, "q", "ctx") is None
+
+    clock.now = 11
+    assert cache.get(1, "q", "ctx") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = AskResponseCache(max_entries=2)
+    cache.put(1, "a", "c", "A")
+    cache.put(1, "b", "c", "B")
+    cache.get(1, "a", "c")
+    cache.put(1, "c", "c", "C")
+    assert cache.get(1, "b", "c") is None
+    assert cache.get(1, "a", "c") == "A"
+
+
+def test_invalidate_athlete_only_drops_that_athlete():
+    cache = AskResponseCache()
+    cache.put(1, "q", "c", "one")
+    cache.put(2, "q", "c", "two")
+    cache.invalidate_athlete(1)
+    assert cache.get(1, "q", "c") is None
+    assert cache.get(2, "q", "c") == "two"
+
+
+def test_fuzzy_matching_requires_same_context():
+    cache = AskResponseCache(fuzzy_threshold=0.6)
+    cache.put(1, "how far did i run this week", "c", "20 miles")
+    assert cache.get(1, "how far did i run this week so far", "c") == "20 miles"
+    assert cache.get(1, "how far did i run this week so far", "other") is None
+    assert cache.get(1, "what is my resting heart rate", "c") is None
+
+
+def test_fuzzy_matching_disabled_by_default():
+    cache = AskResponseCache()
+    cache.put(1, "how far did i run this week", "c", "20 miles")
+    assert cache.get(1, "how far did i run this week so far", "c") is None
+
+
+@patch("src.db.dao.activity_dao.invalidate_athlete")
+def test_upsert_activities_invalidates_cache(mock_invalidate):
+    from src.db.dao.activity_dao import ActivityDAO
+
+    session = MagicMock()
+    ActivityDAO.upsert_activities(session, 7, [{
+        "id": 1, "type": "Run", "name": "Run", "start_date": "2025-01-01T00:00:00Z",
+        "distance": 5000, "moving_time": 1500, "elapsed_time": 1600, "external_id": "x",
+    }])
+    mock_invalidate.assert_called_once_with(7)
+
+
+@pytest.fixture
+def ask_client(monkeypatch):
+    ask_cache.clear()
+    monkeypatch.setattr("src.routes.ask_routes.get_session", MagicMock)
+    monkeypatch.setattr("src.routes.ask_routes._load_prompt_aggregates", lambda athlete_id: None)
+    monkeypatch.setattr("src.utils.config.ASK_RETRIEVAL_TOP_K", 0)
+    # Nothing in the current week, so the prompt context is empty
+    monkeypatch.setattr("src.routes.ask_routes.ActivityDAO.get_activities_since", lambda session, athlete_id, since: [])
+    app = Flask(__name__)
+    app.register_blueprint(ask_bp)
+    app.config["TESTING"] = True
+    yield app.test_client()
+    ask_cache.clear()
+
+
+def test_ask_repeat_question_served_from_cache(ask_client, monkeypatch):
+    monkeypatch.setattr("src.utils.config.LLM_BACKEND", "stub")
+    with patch("src.routes.ask_routes.get_gpt_response", wraps=gpt_ops.get_gpt_response) as llm:
+        first = ask_client.post("/ask", json={"question": "How far did I run?", "athlete_id": 5})
+        second = ask_client.post("/ask", json={"question": "how far did i run", "athlete_id": 5})
+
+    assert first.get_json()["cached"] is False
+    assert second.get_json()["cached"] is True
+    assert second.get_json()["response"] == first.get_json()["response"]
+    assert llm.call_count == 1
+
+
+def test_ask_errors_are_not_cached(ask_client):
+    with patch("src.routes.ask_routes.get_gpt_response", return_value="❌ GPT error: boom") as llm:
+        ask_client.post("/ask", json={"question": "Status?", "athlete_id": 5})
+        resp = ask_client.post("/ask", json={"question": "Status?", "athlete_id": 5})
+
+    assert resp.get_json()["cached"] is False
+    assert llm.call_count == 2
+
+
+def test_ask_cache_misses_when_aggregates_change(ask_client, monkeypatch):
+    aggregates = {"hr_zones": {"z2": 40.0, "z3": 60.0}}
+    monkeypatch.setattr("src.routes.ask_routes._load_prompt_aggregates", lambda athlete_id: dict(aggregates))
+    with patch("src.routes.ask_routes.get_gpt_response", return_value="Zone 3 mostly") as llm:
+        ask_client.post("/ask", json={"question": "Which zone?", "athlete_id": 5})
+        aggregates["hr_zones"] = {"z2": 20.0, "z3": 80.0}
+        resp = ask_client.post("/ask", json={"question": "Which zone?", "athlete_id": 5})
+
+    assert resp.get_json()["cached"] is False
+    assert llm.call_count == 2
+
+
+@patch("src.services.activity_service.invalidate_athlete")
+def test_enrichment_flush_invalidates_cache(mock_invalidate):
+    from src.services.activity_service import EnrichmentBatch
+
+    batch = EnrichmentBatch(MagicMock(), commit_every=10)
+    with patch("src.services.activity_service.refresh_training_load"), \
+         patch("src.services.activity_service.bump_stats_versions"):
+        batch.add(1, {"id": 1, "athlete": {"id": 7}}, [0.0] * 5, [])
+        batch.flush()
+    mock_invalidate.assert_called_once_with(7)
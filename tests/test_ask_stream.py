@@ -0,0 +1,114 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask
+
+from src.routes.ask_routes import ask_bp
+from src.utils import gpt_ops
+from src.utils.ask_cache import ask_cache
+from tests.utils import FakeLLMServer
+
+
+def _events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def stream_client(monkeypatch):
+    ask_cache.clear()
+    monkeypatch.setattr("src.routes.ask_routes.get_session", MagicMock)
+    monkeypatch.setattr("src.routes.ask_routes._load_prompt_aggregates", lambda athlete_id: None)
+    monkeypatch.setattr("src.utils.config.ASK_RETRIEVAL_TOP_K", 0)
+    # Nothing in the current week, so the prompt context is empty
+    monkeypatch.setattr("src.routes.ask_routes.ActivityDAO.get_activities_since", lambda session, athlete_id, since: [])
+    app = Flask(__name__)
+    app.register_blueprint(ask_bp)
+    app.config["TESTING"] = True
+    yield app.test_client()
+    ask_cache.clear()
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    def start(chunks, delay=0.0):
+        server = FakeLLMServer(chunks, delay=delay).__enter__()
+        monkeypatch.setattr("src.utils.config.LLM_BACKEND", "openai")
+        monkeypatch.setattr("src.utils.config.OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(gpt_ops, "_client", None)
+        started.append(server)
+        return server
+
+    started = []
+    yield start
+    for server in started:
+        server.__exit__(None, None, None)
+
+
+def test_stream_relays_tokens_then_done(stream_client, fake_llm):
+    fake_llm(["You ", "ran ", "far."])
+    resp = stream_client.post("/ask/stream", json={"question": "How far?", "athlete_id": 3})
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    events = _events(resp.get_data(as_text=True))
+    assert [e for e, _ in events] == ["token", "token", "token", "done"]
+    assert [d["token"] for e, d in events if e == "token"] == ["You ", "ran ", "far."]
+    assert events[-1][1]["response"] == "You ran far."
+    assert events[-1][1]["cached"] is False
+    assert events[-1][1]["prompt_tokens"] > 0
+
+
+def test_stream_result_is_cached(stream_client, fake_llm):
+    server = fake_llm(["cached ", "answer"])
+    stream_client.post("/ask/stream", json={"question": "Status?", "athlete_id": 3}).get_data()
+    resp = stream_client.post("/ask/stream", json={"question": "status", "athlete_id": 3})
+
+    events = _events(resp.get_data(as_text=True))
+    assert events[-1][1] == {"response": "cached answer", "cached": True}
+    assert server.sent == 2  # upstream only streamed once
+
+
+def test_stream_empty_completion_is_an_error_and_not_cached(stream_client, fake_llm):
+    server = fake_llm(["", "  "])
+    first = _events(stream_client.post("/ask/stream", json={"question": "Empty?", "athlete_id": 3}).get_data(as_text=True))
+    second = _events(stream_client.post("/ask/stream", json={"question": "Empty?", "athlete_id": 3}).get_data(as_text=True))
+
+    assert first[-1][0] == "error"
+    assert second[-1][0] == "error"
+    assert server.sent == 4  # asked upstream both times
+
+
+def test_stream_client_disconnect_cancels_upstream(stream_client, fake_llm):
+    server = fake_llm([f"t{i} " for i in range(200)], delay=0.02)
+    resp = stream_client.post("/ask/stream", json={"question": "Long answer?", "athlete_id": 3}, buffered=False)
+
+    first = next(iter(resp.response))
+    assert b"event: token" in first
+    resp.close()
+
+    assert server.disconnected.wait(timeout=5)
+    assert not server.finished.is_set()
+    assert server.sent < 200
+
+
+def test_stream_stub_backend(stream_client, monkeypatch):
+    monkeypatch.setattr("src.utils.config.LLM_BACKEND", "stub")
+    resp = stream_client.post("/ask/stream", json={"question": "Ping?", "athlete_id": 3})
+    events = _events(resp.get_data(as_text=True))
+    assert events[-1][1]["response"] == "[stub] Ping?"
+
+
+def test_stream_validates_payload(stream_client):
+    resp = stream_client.post("/ask/stream", json={"question": " ", "athlete_id": 3})
+    assert resp.status_code == 400
+
+
+def test_get_gpt_response_uses_shared_client(fake_llm):
+    fake_llm(["One ", "shot."])
+    assert gpt_ops.get_gpt_response("USER QUESTION: How far?") == "One shot."
@@ -0,0 +1,109 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.activity_service import EnrichmentBatch, build_best_efforts
+from src.db.dao.best_effort_dao import upsert_best_efforts
+from src.utils.best_efforts import compute_best_efforts, fastest_effort
+
+
+def _brute_force(distances, times, target):
+    best = None
+    for i in range(len(distances)):
+        for j in range(i + 1, len(distances)):
+            if distances[j] - distances[i] >= target:
+                elapsed = times[j] - times[i]
+                best = elapsed if best is None else min(best, elapsed)
+                break
+    return best
+
+
+def test_fastest_effort_finds_quickest_window():
+    # 100 m per sample; a fast stretch (10 s/100 m) between samples 20 and 30
+    distances = [i * 100.0 for i in range(60)]
+    times, t = [], 0.0
+    for i in range(60):
+        times.append(t)
+        t += 10.0 if 20 <= i < 30 else 30.0
+
+    elapsed, start, end = fastest_effort(distances, times, 1000.0)
+    assert (start, end) == (20, 30)
+    assert elapsed == pytest.approx(100.0)
+
+
+def test_fastest_effort_matches_brute_force_on_sample_boundaries():
+    import random
+    rng = random.Random(1)
+    distances, times = [0.0], [0.0]
+    for _ in range(400):
+        distances.append(distances[-1] + 50.0)
+        times.append(times[-1] + rng.uniform(8, 25))
+
+    # Targets on exact sample spacing need no interpolation, so both agree
+    for target in (400.0, 1000.0, 5000.0):
+        assert fastest_effort(distances, times, target)[0] == pytest.approx(_brute_force(distances, times, target))
+
+
+def test_fastest_effort_interpolates_window_start():
+    elapsed, _, _ = fastest_effort([0.0, 100.0, 200.0], [0.0, 50.0, 100.0], 150.0)
+    assert elapsed == pytest.approx(75.0)
+
+
+def test_fastest_effort_none_when_too_short():
+    assert fastest_effort([0.0, 300.0], [0.0, 60.0], 400.0) is None
+    assert fastest_effort([], [], 400.0) is None
+
+
+def test_compute_best_efforts_only_covered_distances():
+    streams = {"distance": [i * 10.0 for i in range(600)], "time": [i * 3.0 for i in range(600)]}
+    efforts = compute_best_efforts(1, 7, streams, start_date="2025-06-01T07:00:00Z")
+
+    assert [e["name"] for e in efforts] == ["400m", "1k", "1 mile", "5k"]
+    assert efforts[0]["elapsed_time"] == 120.0
+    assert efforts[0]["athlete_id"] == 7
+    assert efforts[0]["start_date"].year == 2025
+
+
+def test_build_best_efforts_requires_athlete_on_payload():
+    streams = {"distance": [0.0, 500.0], "time": [0.0, 100.0]}
+    assert build_best_efforts(1, {}, streams) == []
+    assert build_best_efforts(1, {"athlete": {"id": 7}}, streams)[0]["name"] == "400m"
+
+
+def test_upsert_best_efforts_dedupes_on_conflict_target():
+    session = MagicMock()
+    effort = {"athlete_id": 7, "activity_id": 1, "name": "1k", "distance": 1000.0, "elapsed_time": 240.0,
+              "start_index": 0, "end_index": 10, "start_date": None}
+    with patch("src.db.dao.best_effort_dao.insert") as insert:
+        upsert_best_efforts(session, [effort, {**effort, "elapsed_time": 230.0}], commit=False)
+
+    rows = insert.return_value.values.call_args[0][0]
+    assert len(rows) == 1 and rows[0]["elapsed_time"] == 230.0
+    session.commit.assert_not_called()
+
+
+@patch("src.services.activity_service.upsert_best_efforts")
+@patch("src.services.activity_service.upsert_splits")
+@patch("src.services.activity_service.bulk_update_activity_enrichment")
+def test_enrichment_batch_flushes_best_efforts(mock_bulk, mock_splits, mock_efforts):
+    session = MagicMock()
+    batch = EnrichmentBatch(session, commit_every=10)
+    batch.add(1, {"name": "Run"}, [0.0] * 5, [], [{"activity_id": 1, "distance": 1000.0}])
+    batch.flush()
+
+    mock_efforts.assert_called_once_with(session, [{"activity_id": 1, "distance": 1000.0}], commit=False)
+    session.commit.assert_called_once()
+
+
+def test_records_route(client):
+    record = MagicMock(activity_id=1, distance=5000.0, elapsed_time=1199.6, start_date=None)
+    record.name = "5k"
+    with patch("src.routes.records_routes.get_session"), \
+            patch("src.routes.records_routes.get_personal_records", return_value=[record]):
+        resp = client.get("/athletes/7/records")
+
+    assert resp.status_code == 200
+    assert resp.get_json()["records"][0] == {
+        "name": "5k", "distance": 5000.0, "elapsed_time": 1199.6, "conv_elapsed_time": "19:59",
+        "activity_id": 1, "start_date": None,
+    }
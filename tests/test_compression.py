@@ -0,0 +1,107 @@
+import gzip
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from flask import Flask, Response, jsonify
+
+from src.scripts.precompress_static import precompress
+from src.utils import compression, static_files
+
+
+@pytest.fixture
+def static_app(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "index-abc12345.js").write_text("console.log('x');" * 200)
+    (tmp_path / "index.html").write_text("<html>" + "x" * 2000 + "</html>")
+    (tmp_path / "robots.txt").write_text("User-agent: *")
+
+    app = Flask(__name__, static_folder=str(tmp_path), static_url_path="/")
+    compression.init_app(app)
+    static_files.init_app(app)
+
+    @app.route("/big")
+    def big():
+        return jsonify({"rows": list(range(1000))})
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/stream")
+    def stream():
+        return Response((c for c in ["data: " + "x" * 2000 + "\n\n"]), mimetype="text/plain")
+
+    @app.errorhandler(404)
+    def fallback(e):
+        index = app.extensions["spa_index"]
+        return index.response() if index.exists else ("404 Not Found", 404)
+
+    return app, tmp_path
+
+
+def test_large_json_is_gzipped_small_is_not(static_app):
+    client = static_app[0].test_client()
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert gzip.decompress(resp.data).startswith(b'{"rows":[0,1,2')
+
+    assert "Content-Encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/big").headers
+    assert "Content-Encoding" not in client.get("/stream", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_precompressed_hashed_asset_is_immutable(static_app):
+    app, root = static_app
+    assert precompress(root) >= 2  # the bundle and index.html
+    client = app.test_client()
+
+    resp = client.get("/assets/index-abc12345.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.mimetype == "text/javascript"
+    assert resp.headers["Cache-Control"] == static_files.IMMUTABLE
+    assert gzip.decompress(resp.get_data()).startswith(b"console.log")
+    resp.close()
+
+    plain = client.get("/assets/index-abc12345.js")
+    assert "Content-Encoding" not in plain.headers
+    plain.close()
+
+    robots = client.get("/robots.txt")
+    assert robots.headers["Cache-Control"] == "no-cache"
+    robots.close()
+
+
+def test_precompressed_lookup_only_caches_existing_files(tmp_path):
+    (tmp_path / "app.js").write_text("x")
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(b"x"))
+    lookup = static_files.PrecompressedLookup(str(tmp_path))
+
+    assert lookup.encodings("app.js") == ["gzip"]
+    for i in range(50):
+        assert lookup.encodings(f"probe-{i}.php") == []
+    assert list(lookup._encodings) == ["app.js"]
+
+
+def test_spa_fallback_serves_index_from_memory(static_app):
+    app, root = static_app
+    client = app.test_client()
+    first = client.get("/some/client/route")
+    assert first.status_code == 200 and first.data.startswith(b"<html>")
+
+    # Served from memory once loaded
+    (root / "index.html").unlink()
+    assert client.get("/another/route").data == first.data
+    again = client.get("/another/route", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_app_compresses_api_json(client):
+    rows = [{"activity_id": i, "start_date": datetime(2026, 1, 1), "name": "Run " * 5} for i in range(60, 0, -1)]
+    with patch("src.routes.activity_list_routes.get_session"), \
+            patch("src.routes.activity_list_routes.ActivityDAO.get_activities_page", return_value=rows):
+        resp = client.get("/activities?athlete_id=7", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["ETag"].startswith("W/")
+    assert b'"activity_id":60' in gzip.decompress(resp.data)
@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.utils.stats_cache import stats_cache
+
+
+class FakeSharedVersions:
+    shared = True
+    transactional = False
+
+    def __init__(self):
+        self.version, self.updated_at = 3, datetime(2026, 10, 19, 6, 30, tzinfo=timezone.utc)
+
+    def state(self, athlete_id, session=None):
+        return self.version, self.updated_at
+
+    def get(self, athlete_id, session=None):
+        return self.version
+
+    def bump(self, athlete_id, session=None):
+        self.version += 1
+
+
+@pytest.fixture
+def shared_versions(monkeypatch):
+    versions = FakeSharedVersions()
+    monkeypatch.setattr(stats_cache, "versions", versions)
+    with patch("src.utils.conditional.get_session"):
+        yield versions
+
+
+def test_current_etag_skips_the_view(client, shared_versions):
+    with patch("src.routes.records_routes.get_session"), \
+            patch("src.routes.records_routes.get_personal_records", return_value=[]) as records:
+        first = client.get("/athletes/7/records")
+        etag = first.headers["ETag"]
+        assert etag.startswith('W/"a7-v3-')
+        assert first.headers["Cache-Control"] == "private, no-cache"
+        assert first.headers["Last-Modified"]
+
+        again = client.get("/athletes/7/records", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert records.call_count == 1
+
+        shared_versions.bump(7)
+        changed = client.get("/athletes/7/records", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert records.call_count == 2
+
+
+def test_if_modified_since_and_path_specific_etags(client, shared_versions):
+    with patch("src.routes.stats_routes.get_session"), \
+            patch("src.routes.stats_routes.cached_stat", return_value=({"distance_km": 1.0}, False)) as stat:
+        first = client.get("/stats/7/total_distance?days=30")
+        since = client.get("/stats/7/total_distance?days=30", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+        other = client.get("/stats/7/total_distance?days=90", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert since.status_code == 304
+    assert other.status_code == 200
+    assert stat.call_count == 2
+
+
+def test_memory_backend_uses_database_watermark(client, memory_watermark):
+    assert not stats_cache.versions.shared
+    with patch("src.utils.conditional.get_session"), \
+            patch("src.routes.activity_list_routes.get_session"), \
+            patch("src.routes.activity_list_routes.get_activity_splits", return_value=[{"lap_index": 1}]) as splits:
+        first = client.get("/athletes/7/activities/9/splits?scheme=km")
+        again = client.get("/athletes/7/activities/9/splits?scheme=km", headers={"If-None-Match": first.headers["ETag"]})
+        memory_watermark.bump(7)
+        changed = client.get("/athletes/7/activities/9/splits?scheme=km", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.get_json()["splits"] == [{"lap_index": 1}]
+    assert first.headers["ETag"].startswith('W/"a7-v0-')
+    assert again.status_code == 304
+    assert changed.status_code == 200
+    # The 304 never ran the view
+    assert splits.call_count == 2
+    assert splits.call_args[0][1:] == (7, 9, "km")
+
+
+def test_memory_backend_bumps_watermark_in_writer_transaction(monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from src.utils import stats_cache as stats_cache_module
+
+    watermark = MagicMock()
+    monkeypatch.setattr(stats_cache_module, "watermark", watermark)
+    with Session(create_engine("sqlite://")) as session:
+        stats_cache_module.bump_version(session, 7)
+    watermark.bump.assert_called_once_with(7, session)
+
+
+def test_errors_are_not_made_conditional(client, shared_versions):
+    resp = client.get("/stats/7/longest_run?days=0")
+    assert resp.status_code == 400
+    assert "ETag" not in resp.headers
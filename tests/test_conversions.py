@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from src.utils.conversions import convert_metrics, convert_metrics_batch
+
+ALL_FIELDS = ["distance", "elevation", "average_speed", "max_speed", "moving_time", "elapsed_time"]
+
+
+def _assert_matches_scalar(rows, fields=ALL_FIELDS):
+    columns = {k: [r.get(k) for r in rows] for k in fields}
+    batch = convert_metrics_batch(columns, fields)
+    for i, row in enumerate(rows):
+        expected = convert_metrics(row, fields)
+        for key, value in expected.items():
+            assert batch[key][i] == value, (key, row, value, batch[key][i])
+            assert type(batch[key][i]) is type(value), (key, row)
+
+
+def test_batch_matches_scalar_on_random_rows():
+    rng = random.Random(42)
+    choices = [
+        lambda: None,
+        lambda: 0,
+        lambda: -3.2,
+        lambda: rng.randint(0, 50000),
+        lambda: round(rng.uniform(0, 50000), rng.randint(0, 4)),
+        lambda: rng.uniform(0, 8),
+        lambda: str(rng.randint(0, 9000)),
+        lambda: "not-a-number",
+    ]
+    rows = [{k: rng.choice(choices)() for k in ALL_FIELDS} for _ in range(5000)]
+    _assert_matches_scalar(rows)
+
+
+@pytest.mark.parametrize("values", [
+    [2.675, 0.125, 1.005, 1609.344 * 2.5, 4023.36, 804.672],   # rounding ties
+    [5000, 10000, 0, 42195],                                    # int fast path
+    [3.5, 2.91, 0.0, -1.0],                                     # float fast path
+    [None, None],                                               # all missing
+    [],                                                         # empty page
+])
+def test_batch_matches_scalar_edge_cases(values):
+    rows = [{k: v for k in ALL_FIELDS} for v in values]
+    _assert_matches_scalar(rows)
+
+
+def test_batch_time_formatting():
+    conv = convert_metrics_batch({"moving_time": [59, 61, 3600, 3725.9, None]}, ["moving_time"])
+    assert conv["conv_moving_time"] == ["0:59", "1:01", "1:00:00", "1:02:05", None]
+
+
+def test_batch_only_returns_requested_fields():
+    conv = convert_metrics_batch({"distance": [1609.344]}, ["distance"])
+    assert conv == {"conv_distance": [1.0]}
@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db.models.activities import Activity
+from src.db.models.splits import Split
+from src.services import export_service
+from src.services.export_service import FIELDNAMES, iter_csv, iter_ndjson, stream_export
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Activity.__table__.create(engine)
+    Split.__table__.create(engine)
+    factory = sessionmaker(bind=engine, future=True)
+    session = factory()
+    session.add_all([
+        Activity(activity_id=1, athlete_id=7, name="Old", start_date=datetime(2024, 1, 1), distance=3000),
+        Activity(activity_id=2, athlete_id=7, name="New", start_date=datetime(2024, 2, 1), distance=2000),
+        Activity(activity_id=3, athlete_id=8, name="Other", start_date=datetime(2024, 3, 1)),
+        Split(activity_id=2, scheme="km", lap_index=1, distance=1000, moving_time=300, pace_zone=2),
+        Split(activity_id=2, scheme="km", lap_index=2, distance=1000, moving_time=290, pace_zone=3),
+        Split(activity_id=2, scheme="mi", lap_index=1, distance=1609, moving_time=480),
+    ])
+    session.commit()
+    session.close()
+    return factory
+
+
+def test_export_rows_one_per_split_newest_first(session_factory):
+    rows = list(csv.DictReader(io.StringIO(b"".join(stream_export(session_factory, 7, "csv")).decode())))
+    assert [(r["activity_id"], r["split_scheme"], r["split_lap_index"]) for r in rows] == [
+        ("2", "km", "1"), ("2", "km", "2"), ("2", "mi", "1"), ("1", "", ""),
+    ]
+    assert rows[0]["start_date"] == "2024-02-01T00:00:00"
+
+
+def test_export_scheme_filter_keeps_activities_without_splits(session_factory):
+    lines = b"".join(stream_export(session_factory, 7, "ndjson", scheme="mi")).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [(r["activity_id"], r["split_scheme"]) for r in rows] == [(2, "mi"), (1, None)]
+    assert set(rows[0]) == set(FIELDNAMES)
+
+
+def test_writers_emit_bounded_chunks():
+    rows = ({"activity_id": i, "name": "x" * 100} for i in range(2000))
+    with patch.object(export_service, "CHUNK_BYTES", 4096):
+        chunks = list(iter_csv(rows))
+    assert len(chunks) > 10
+    assert all(len(c) < 4096 + 1024 for c in chunks)
+
+    with patch.object(export_service, "CHUNK_BYTES", 4096):
+        chunks = list(iter_ndjson({"activity_id": i} for i in range(2000)))
+    assert sum(c.count(b"\n") for c in chunks) == 2000
+
+
+def test_stream_export_closes_session_on_early_stop(session_factory):
+    sessions = []
+
+    def factory():
+        sessions.append(session_factory())
+        return sessions[-1]
+
+    with patch.object(export_service, "CHUNK_BYTES", 1):
+        gen = stream_export(factory, 7, "ndjson")
+        next(gen)
+        with patch.object(sessions[0], "close") as close:
+            gen.close()
+    close.assert_called_once()
+
+
+def test_export_route_streams_csv(client, session_factory):
+    with patch("src.routes.export_routes.get_session", session_factory):
+        resp = client.get("/export/7?format=csv")
+        assert resp.is_streamed
+        body = resp.get_data(as_text=True)
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/csv"
+    assert "athlete_7.csv" in resp.headers["Content-Disposition"]
+    assert body.splitlines()[0].split(",") == FIELDNAMES
+    assert len(body.splitlines()) == 5
+
+
+def test_export_route_rejects_unknown_format(client):
+    resp = client.get("/export/7?format=xlsx")
+    assert resp.status_code == 400
+
+
+def test_export_route_parquet_needs_pyarrow(client):
+    with patch("src.routes.export_routes.parquet_available", return_value=False):
+        resp = client.get("/export/7?format=parquet")
+    assert resp.status_code == 400
+    assert "pyarrow" in resp.get_json()["error"]
+
+
+def test_parquet_export_round_trips(session_factory):
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = b"".join(stream_export(session_factory, 7, "parquet"))
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_rows == 4
+    assert parquet.schema_arrow.names == FIELDNAMES
@@ -1,5 +1,120 @@
 # tests/test_health.py
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine, text
+
+import src.routes.health_routes as health_routes
+
+
 def test_ping(client):
     resp = client.get("/ping")
     assert resp.status_code == 200
     assert resp.data == b"pong"
+
+
+@pytest.fixture(autouse=True)
+def reset_ready_cache():
+    health_routes._ready_cache["result"] = None
+
+
+def test_livez_does_no_io(client):
+    with patch("src.routes.health_routes.get_engine") as get_engine, \
+         patch("src.routes.health_routes.get_session") as get_session:
+        resp = client.get("/livez")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"status": "ok"}
+    get_engine.assert_not_called()
+    get_session.assert_not_called()
+
+
+def test_readyz_caches_result(client):
+    with patch("src.routes.health_routes.get_engine"), \
+         patch("src.routes.health_routes.check_readiness", return_value=({"status": "ok"}, 200)) as check:
+        first = client.get("/readyz")
+        second = client.get("/readyz")
+    assert first.status_code == second.status_code == 200
+    assert check.call_count == 1
+
+
+def test_readyz_reports_failure(client):
+    with patch("src.routes.health_routes.get_engine"), \
+         patch("src.routes.health_routes.check_readiness", return_value=({"status": "error"}, 503)):
+        resp = client.get("/readyz")
+    assert resp.status_code == 503
+    assert resp.get_json()["status"] == "error"
+
+
+def test_check_readiness_reads_migration_version():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32))"))
+        conn.execute(text("INSERT INTO alembic_version VALUES (:v)"), {"v": health_routes.migration_head()})
+    body, status = health_routes.check_readiness(engine)
+    assert status == 200
+    assert body["migration"]["up_to_date"] is True
+    assert "checked_out" in body["pool"]
+
+
+def test_check_readiness_without_alembic_table():
+    body, status = health_routes.check_readiness(create_engine("sqlite://"))
+    assert status == 200
+    assert body["migration"]["current"] is None
+
+
+def test_check_readiness_short_circuits_saturated_pool():
+    engine = create_engine("sqlite://")
+    with patch("src.routes.health_routes.pool_stats", return_value={"checked_out": 10, "capacity": 10, "saturation": 1.0}), \
+         patch.object(engine, "connect") as connect:
+        body, status = health_routes.check_readiness(engine)
+    assert status == 503
+    assert body["db"] == "pool saturated"
+    connect.assert_not_called()
+
+
+def test_readyz_serves_stale_result_while_check_runs(client, monkeypatch):
+    monkeypatch.setattr("src.utils.config.READYZ_CACHE_SECONDS", 5)
+    health_routes._ready_cache["result"] = (time.monotonic() - 60, {"status": "ok"}, 200)
+    with health_routes._ready_lock, \
+         patch("src.routes.health_routes.check_readiness") as check:
+        resp = client.get("/readyz")
+    assert resp.status_code == 200
+    assert resp.get_json()["age_seconds"] >= 60
+    check.assert_not_called()
+
+
+def test_check_readiness_reapplies_timeout_after_rollback():
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    engine.pool = object()
+    conn = engine.connect.return_value.__enter__.return_value
+    statements = []
+
+    def execute(stmt):
+        statements.append(str(stmt))
+        if "alembic_version" in str(stmt):
+            raise RuntimeError("relation does not exist")
+        return MagicMock()
+
+    conn.execute.side_effect = execute
+    body, status = health_routes.check_readiness(engine)
+    assert status == 200
+    conn.rollback.assert_called_once()
+    assert statements[-2].startswith("SET LOCAL statement_timeout")
+    assert statements[-1] == "SELECT 1"
+
+
+def test_postgres_engine_bounds_connect_and_checkout(monkeypatch):
+    from src.db import db_session
+
+    monkeypatch.setattr("src.utils.config.DB_CONNECT_TIMEOUT", 3)
+    monkeypatch.setattr("src.utils.config.DB_POOL_TIMEOUT", 4)
+    url = "postgresql://u:p@db.invalid/readyz_test"
+    with patch("src.db.db_session.create_engine") as create, \
+         patch("src.db.db_session.instrument_engine", side_effect=lambda engine: engine):
+        db_session.get_engine(url)
+    db_session._engines.pop(url, None)
+    kwargs = create.call_args.kwargs
+    assert kwargs["connect_args"] == {"connect_timeout": 3}
+    assert kwargs["pool_timeout"] == 4
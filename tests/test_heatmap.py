@@ -0,0 +1,163 @@
+import struct
+import zlib
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.db.dao.route_dao import build_route
+from src.utils import heatmap, polyline
+
+# A ~1.1 km line heading east across central London
+LINE = [[51.5074, -0.1278 + i * 0.0001] for i in range(160)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_tiles():
+    heatmap.clear()
+    yield
+    heatmap.clear()
+
+
+def tile_for(latlng, z):
+    px = heatmap.project(latlng, z)[0]
+    return int(px[0] // heatmap.TILE_SIZE), int(px[1] // heatmap.TILE_SIZE)
+
+
+def png_rgba(data):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height = struct.unpack(">II", data[16:24])
+    idat_len = struct.unpack(">I", data[33:37])[0]
+    raw = zlib.decompress(data[41:41 + idat_len])
+    return np.frombuffer(raw, dtype=np.uint8).reshape(height, 1 + width * 4)[:, 1:].reshape(height, width, 4)
+
+
+def test_polyline_round_trip_and_reference_value():
+    # Reference example from the encoded polyline format documentation
+    points = [[38.5, -120.2], [40.7, -120.95], [43.252, -126.453]]
+    assert polyline.encode(points) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert np.allclose(polyline.decode(polyline.encode(points)), points)
+
+
+def test_polyline_skips_gaps_and_repeats():
+    encoded = polyline.encode([[1.0, 2.0], None, [1.0, 2.0], [1.00001, 2.0]])
+    assert polyline.decode(encoded).tolist() == [[1.0, 2.0], [1.00001, 2.0]]
+
+
+def test_build_route_bbox():
+    route = build_route(9, 7, LINE + [None])
+    assert route["point_count"] == 160
+    assert route["min_lng"] == pytest.approx(-0.1278)
+    assert route["max_lat"] == route["min_lat"] == 51.5074
+    assert build_route(9, 7, [[1.0, 2.0]]) is None
+
+
+def test_tile_bbox_contains_projected_point():
+    z = 14
+    x, y = tile_for(LINE[0], z)
+    min_lat, min_lng, max_lat, max_lng = heatmap.tile_bbox(z, x, y)
+    assert min_lat <= LINE[0][0] <= max_lat
+    assert min_lng <= LINE[0][1] <= max_lng
+
+
+def test_route_pixels_are_connected_and_unique():
+    z = 16
+    x, y = tile_for(LINE[0], z)
+    pixels = heatmap.route_pixels(LINE, z, x, y)
+    assert len(pixels) == len(np.unique(pixels))
+    cols = np.sort(pixels % heatmap.TILE_SIZE)
+    # An eastward line leaves no gaps between columns it covers
+    assert np.all(np.diff(cols) <= 1)
+
+
+def test_get_tile_only_rasterises_new_routes():
+    z = 15
+    x, y = tile_for(LINE[0], z)
+    encoded = {1: polyline.encode(LINE), 2: polyline.encode(LINE)}
+    calls = []
+
+    def load(ids):
+        calls.append(set(ids))
+        return {i: encoded[i] for i in ids}
+
+    first = heatmap.get_tile(7, z, x, y, {1: 10}, load)
+    assert first.counts.max() == 1
+    again = heatmap.get_tile(7, z, x, y, {1: 10}, load)
+    assert again is first
+    second = heatmap.get_tile(7, z, x, y, {1: 10, 2: 20}, load)
+    assert calls == [{1}, {2}]
+    assert second.counts.max() == 2
+    # Dropping a route rebuilds from the remaining ones
+    heatmap.get_tile(7, z, x, y, {2: 20}, load)
+    assert calls[-1] == {2}
+
+
+def test_get_tile_redraws_replaced_route():
+    z = 15
+    x, y = tile_for(LINE[0], z)
+    encoded = {1: polyline.encode(LINE)}
+    first = heatmap.get_tile(7, z, x, y, {1: 10}, lambda ids: {i: encoded[i] for i in ids})
+    # Re-uploaded track, now a few tiles away
+    encoded[1] = polyline.encode([[lat + 0.05, lng] for lat, lng in LINE])
+    replaced = heatmap.get_tile(7, z, x, y, {1: 11}, lambda ids: {i: encoded[i] for i in ids})
+    assert first.counts.any()
+    assert not replaced.counts.any()
+    assert replaced.routes == {1: 11}
+
+
+def test_empty_tiles_are_not_stored(tmp_path):
+    z = 15
+    x, y = tile_for(LINE[0], z)
+    far = polyline.encode([[lat + 0.05, lng] for lat, lng in LINE])
+    with patch.object(heatmap.config, "HEATMAP_TILE_DIR", str(tmp_path)):
+        empty = heatmap.get_tile(7, z, x, y, {}, lambda ids: pytest.fail("nothing to load"))
+        assert not empty.counts.any()
+        assert heatmap.get_tile(7, z, x, y, {}, lambda ids: {}) is empty
+        heatmap.get_tile(7, z, x, y, {1: 10}, lambda ids: {1: far})
+        assert not list(tmp_path.rglob("*.npz"))
+        heatmap.get_tile(7, z, x, y, {1: 11}, lambda ids: {1: polyline.encode(LINE)})
+        assert len(list(tmp_path.rglob("*.npz"))) == 1
+        # The route moved away: the stored tile goes too
+        heatmap.get_tile(7, z, x, y, {}, lambda ids: {})
+        assert not list(tmp_path.rglob("*.npz"))
+
+
+def test_tiles_persist_to_disk(tmp_path):
+    z = 15
+    x, y = tile_for(LINE[0], z)
+    load = lambda ids: {i: polyline.encode(LINE) for i in ids}
+    with patch.object(heatmap.config, "HEATMAP_TILE_DIR", str(tmp_path)):
+        built = heatmap.get_tile(7, z, x, y, {1: 10}, load)
+        heatmap.clear()
+        reloaded = heatmap.get_tile(7, z, x, y, {1: 10}, lambda ids: pytest.fail("should not reload routes"))
+    assert np.array_equal(built.counts, reloaded.counts)
+
+
+def test_render_png_is_transparent_without_routes():
+    counts = np.zeros(heatmap.TILE_SIZE ** 2, dtype=np.uint16)
+    counts[0] = 1
+    counts[1] = 50
+    rgba = png_rgba(heatmap.render_png(counts, saturation=20))
+    assert rgba.shape == (256, 256, 4)
+    assert 110 < rgba[0, 0, 3] < 255 and rgba[0, 1, 3] == 255
+    assert rgba[5, 5, 3] == 0
+
+
+def test_tile_route_serves_png(client):
+    z = 15
+    x, y = tile_for(LINE[0], z)
+    with patch("src.routes.heatmap_routes.get_session"), \
+         patch("src.routes.heatmap_routes.get_route_versions_in_bbox", return_value={1: 10}), \
+         patch("src.routes.heatmap_routes.get_polylines", return_value={1: polyline.encode(LINE)}):
+        resp = client.get(f"/tiles/7/{z}/{x}/{y}.png")
+        etag = resp.headers["ETag"]
+        cached = client.get(f"/tiles/7/{z}/{x}/{y}.png", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.mimetype == "image/png"
+    assert png_rgba(resp.data)[..., 3].any()
+    assert cached.status_code == 304
+
+
+def test_tile_route_rejects_out_of_range(client):
+    assert client.get("/tiles/7/1/0/0").status_code == 404
+    assert client.get("/tiles/7/10/5000/0").status_code == 404
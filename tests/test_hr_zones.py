@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.utils.hr_zones import (
+    bounds_from_max_hr, parse_bounds, resolve_bounds, time_in_zones, validate_bounds, zone_percentages,
+)
+import src.utils.config as config
+from tests.utils import generate_test_token
+
+
+def test_time_in_zones_credits_interval_to_end_sample():
+    seconds = time_in_zones([100, 120, 140, 160, 180], [0, 10, 30, 60, 100], [120, 140, 160, 180])
+    # Intervals of 10/20/30/40 s ending at 120, 140, 160, 180 bpm
+    assert seconds.tolist() == [0.0, 10.0, 20.0, 30.0, 40.0]
+
+
+def test_zone_percentages_ignore_gaps_and_missing_samples():
+    pcts = zone_percentages([100, None, 150, 150], [0, 5, 5, 15], [120, 140, 160, 180])
+    assert pcts == [0.0, 0.0, 100.0, 0.0, 0.0]
+
+
+def test_zone_percentages_none_without_hr():
+    assert zone_percentages([], [0, 1, 2], [1, 2, 3, 4]) is None
+    assert zone_percentages(None, None, [1, 2, 3, 4]) is None
+
+
+def test_matches_python_loop_on_random_stream():
+    rng = np.random.default_rng(0)
+    hr = rng.integers(90, 200, 5000).tolist()
+    t = np.cumsum(rng.integers(1, 4, 5000)).tolist()
+    bounds = [120, 140, 160, 180]
+
+    expected = [0.0] * 5
+    for i in range(1, len(hr)):
+        zone = sum(hr[i] >= b for b in bounds)
+        expected[zone] += t[i] - t[i - 1]
+    assert time_in_zones(hr, t, bounds).tolist() == expected
+
+
+def test_bounds_resolution_order(monkeypatch):
+    monkeypatch.setattr("src.utils.config.HR_ZONE_BOUNDS", "110,130,150,170")
+    assert resolve_bounds([120, 140, 160, 180], 200) == [120, 140, 160, 180]
+    assert resolve_bounds(None, 200) == bounds_from_max_hr(200) == [120, 140, 160, 180]
+    assert resolve_bounds() == [110, 130, 150, 170]
+
+
+def test_invalid_bounds_rejected():
+    with pytest.raises(ValueError):
+        validate_bounds([150, 140, 160, 180])
+    with pytest.raises(ValueError):
+        parse_bounds("120,140")
+
+
+def test_hr_zone_put_requires_auth(client):
+    with patch("src.routes.hr_zone_routes.set_hr_zone_settings") as store:
+        assert client.put("/athletes/7/hr-zones", json={"max_heartrate": 200}).status_code == 401
+    store.assert_not_called()
+
+
+def test_hr_zone_routes(client):
+    headers = {"Authorization": f"Bearer {generate_test_token('7', config.SECRET_KEY)}"}
+    with patch("src.routes.hr_zone_routes.get_session"), \
+            patch("src.routes.hr_zone_routes.set_hr_zone_settings", return_value=True) as store, \
+            patch("src.routes.hr_zone_routes.get_hr_zone_settings", return_value=(None, 200)):
+        resp = client.put("/athletes/7/hr-zones", json={"max_heartrate": 200}, headers=headers)
+        assert resp.status_code == 200
+        assert resp.get_json()["effective_bounds"] == [120, 140, 160, 180]
+        # Only the field in the body is written; stored bounds are left alone
+        assert store.call_args[0][2] == {"max_heartrate": 200}
+
+        assert client.put("/athletes/7/hr-zones", json={}, headers=headers).status_code == 400
+
+        assert client.put("/athletes/7/hr-zones", json={"hr_zone_bounds": [1, 2]}, headers=headers).status_code == 400
+
+    with patch("src.routes.hr_zone_routes.get_session"), \
+            patch("src.routes.hr_zone_routes.get_hr_zone_settings", return_value=(None, None)):
+        resp = client.get("/athletes/7/hr-zones")
+    assert resp.get_json()["hr_zone_bounds"] is None
+
+
+def test_set_hr_zone_settings_updates_only_given_fields():
+    from src.db.dao.athlete_dao import set_hr_zone_settings
+
+    session = MagicMock()
+    assert set_hr_zone_settings(session, 7, {"max_heartrate": 190, "other": 1})
+    session.query.return_value.filter_by.return_value.update.assert_called_once_with({"max_heartrate": 190})
+    with pytest.raises(ValueError):
+        set_hr_zone_settings(session, 7, {})
@@ -0,0 +1,42 @@
+"""
+Import-time budget for the web app and the ingestion CLI, measured with
+`python -X importtime` in a fresh interpreter.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# Generous enough for slow CI machines; the module checks below catch regressions precisely
+BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", 1500))
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """
+    {module name: cumulative import microseconds} for importing `module`.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.mark.parametrize("module, forbidden", [
+    ("src.app", {"openai", "docx", "pyarrow"}),
+    ("src.scripts.main_pipeline", {"openai", "docx", "flask", "webbrowser"}),
+])
+def test_import_time_budget(module, forbidden):
+    profile = import_profile(module)
+    assert not forbidden & profile.keys(), f"{module} eagerly imports {sorted(forbidden & profile.keys())}"
+    assert profile[module] / 1000 < BUDGET_MS
@@ -12,6 +12,10 @@ def session():
     return MagicMock()
 
 
+def _queue_result(sess, ath_id, act_id, batch=None):
+    batch.add(act_id, {"id": act_id, "type": "Run", "athlete": {"id": ath_id}}, [0.0] * 5, [])
+
+
 @patch("src.services.ingestion_orchestrator_service.enrich_one_activity_with_refresh")
 @patch("src.services.ingestion_orchestrator_service.ActivityDAO.upsert_activities")
 @patch("src.services.ingestion_orchestrator_service.ActivityIngestionService")
@@ -64,7 +68,7 @@ def test_ingest_between_dates_success(mock_service, mock_upsert, mock_enrich, se
     mock_service_instance.client.get_activities.return_value = mock_activities
 
     mock_upsert.return_value = 2
-    mock_enrich.return_value = None
+    mock_enrich.side_effect = _queue_result
 
     result = ingest_between_dates(session, athlete_id, start_date, end_date, batch_size=1)
 
@@ -106,10 +110,10 @@ def test_ingest_between_dates_enrichment_failure(mock_service, mock_upsert, mock
 
     mock_upsert.return_value = 2
 
-    def enrich_side_effect(sess, ath_id, act_id):
+    def enrich_side_effect(sess, ath_id, act_id, batch=None):
         if act_id == 2:
             raise Exception("Enrich error")
-        return None
+        _queue_result(sess, ath_id, act_id, batch)
 
     mock_enrich.side_effect = enrich_side_effect
 
@@ -118,3 +122,32 @@ def test_ingest_between_dates_enrichment_failure(mock_service, mock_upsert, mock
 
     assert mock_enrich.call_count == 2  # Both enrichment attempts made
     assert result == 1  # Upsert count remains 2
+
+
+@patch("src.services.ingestion_orchestrator_service.enrich_one_activity_with_refresh", side_effect=_queue_result)
+@patch("src.services.ingestion_orchestrator_service.ActivityDAO.upsert_activities")
+@patch("src.services.ingestion_orchestrator_service.ActivityIngestionService")
+def test_ingest_between_dates_raises_when_flush_fails(mock_service, mock_upsert, mock_enrich, session):
+    mock_service.return_value.client.get_activities.return_value = [{"id": 1, "type": "Run"}]
+    session.commit.side_effect = RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        ingest_between_dates(session, 123, datetime(2025, 1, 1), datetime(2025, 1, 3))
+    session.rollback.assert_called_once()
+
+
+@patch("src.services.ingestion_orchestrator_service.enrich_one_activity_with_refresh")
+@patch("src.services.ingestion_orchestrator_service.ActivityDAO.upsert_activities")
+@patch("src.services.ingestion_orchestrator_service.ActivityIngestionService")
+def test_ingest_between_dates_interrupt_is_not_masked(mock_service, mock_upsert, mock_enrich, session):
+    mock_service.return_value.client.get_activities.return_value = [{"id": 1, "type": "Run"}, {"id": 2, "type": "Run"}]
+
+    def interrupt(sess, ath_id, act_id, batch=None):
+        if act_id == 2:
+            raise KeyboardInterrupt
+        _queue_result(sess, ath_id, act_id, batch)
+
+    mock_enrich.side_effect = interrupt
+    session.commit.side_effect = RuntimeError("db down")
+    with pytest.raises(KeyboardInterrupt):
+        ingest_between_dates(session, 123, datetime(2025, 1, 1), datetime(2025, 1, 3))
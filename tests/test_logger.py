@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+from logging.handlers import QueueHandler
+
+import pytest
+
+import src.utils.logger as logger_module
+from src.utils.logger import (
+    get_logger,
+    redact,
+    DebugSamplingFilter,
+    JsonFormatter,
+    RedactingFilter,
+)
+
+
+def _record(msg, *args, level=logging.INFO, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    for k, v in extra.items():
+        setattr(record, k, v)
+    return record
+
+
+def test_redact_masks_bearer_and_oauth_fields():
+    line = "headers={'Authorization': 'Bearer abc.def-123'} refresh_token=xyz"
+    out = redact(line)
+    assert "abc.def-123" not in out
+    assert "xyz" not in out
+    assert "[REDACTED]" in out
+
+
+def test_redact_masks_oauth_code_parameter():
+    assert redact("GET /exchange_token?state=x&code=9f8e&scope=read") == \
+        "GET /exchange_token?state=x&code=[REDACTED]&scope=read"
+    assert redact("code=9f8e&grant_type=authorization_code") == "code=[REDACTED]&grant_type=authorization_code"
+    assert "9f8e" not in redact('payload={"code": "9f8e", "client_id": 1}')
+
+
+def test_redact_keeps_status_codes():
+    line = "Strava returned status code: 500, error code=429"
+    assert redact(line) == line
+
+
+def test_redact_leaves_ordinary_text_alone():
+    assert redact("Synced 12 splits for activity 42") == "Synced 12 splits for activity 42"
+
+
+def test_redacting_filter_renders_args_once():
+    record = _record("token %s", "Bearer secret-token")
+    assert RedactingFilter().filter(record)
+    assert record.args is None
+    assert "secret-token" not in record.msg
+
+
+def test_debug_sampling_keeps_one_in_n_and_all_warnings():
+    f = DebugSamplingFilter(0.25)
+    kept = sum(f.filter(_record("d", level=logging.DEBUG)) for _ in range(100))
+    assert kept == 25
+    assert f.filter(_record("w", level=logging.WARNING))
+
+
+def test_debug_sampling_rate_zero_drops_debug():
+    f = DebugSamplingFilter(0)
+    assert not f.filter(_record("d", level=logging.DEBUG))
+
+
+def test_json_formatter_includes_structured_fields():
+    record = _record("sync done", fields={"athlete_id": 7, "synced": 3})
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "sync done"
+    assert payload["athlete_id"] == 7
+    assert payload["level"] == "INFO"
+
+
+def test_get_logger_uses_queue_handler(monkeypatch):
+    monkeypatch.setenv("LOG_DEBUG_SAMPLE_RATE", "0.5")
+    logger = get_logger("tests.logger.queue")
+    assert any(isinstance(h, QueueHandler) for h in logger.handlers)
+    assert any(isinstance(f, DebugSamplingFilter) for f in logger.filters)
+    # Repeated calls do not stack handlers
+    get_logger("tests.logger.queue")
+    assert len(logger.handlers) == 1
+
+
+def test_get_logger_falls_back_to_info_for_unknown_level(monkeypatch, capsys):
+    monkeypatch.setenv("LOG_LEVEL", "verbose")
+    assert get_logger("tests.logger.level").level == logging.INFO
+    assert "LOG_LEVEL" in capsys.readouterr().err
+    monkeypatch.setenv("LOG_LEVEL", " debug ")
+    assert get_logger("tests.logger.level").level == logging.DEBUG
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_listener_restarts_in_forked_child():
+    logger = get_logger("tests.logger.fork")
+    pid = os.fork()
+    if pid == 0:
+        # Child: a fresh listener must drain the queue
+        ok = logger_module._listener is not None and logger_module._listener._thread.is_alive()
+        logger.warning("from the child")
+        logger_module.stop_logging()
+        os._exit(0 if ok and logger_module._log_queue.empty() else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
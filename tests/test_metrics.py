@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+from prometheus_client import REGISTRY
+
+from src.utils import metrics
+from src.utils.timing import track_job, span
+
+
+def test_metrics_endpoint_exposes_request_latency(client):
+    client.get("/ping")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.content_type.startswith("text/plain")
+    body = resp.get_data(as_text=True)
+    assert 'http_request_duration_seconds_count{endpoint="ping",method="GET",status="200"}' in body
+
+
+def test_metrics_endpoint_multiprocess_mode(client, monkeypatch, tmp_path):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+
+
+def test_strava_endpoint_label_collapses_ids():
+    url = "https://www.strava.com/api/v3/activities/12345/streams?keys=time"
+    assert metrics.strava_endpoint_label(url) == "/activities/{id}/streams"
+    assert metrics.strava_endpoint_label("https://www.strava.com/api/v3/athlete/activities") == "/athlete/activities"
+
+
+def test_observe_strava_response_sets_rate_limit_headroom():
+    response = MagicMock(status_code=200, headers={
+        "X-RateLimit-Limit": "600,30000",
+        "X-RateLimit-Usage": "12,345",
+    })
+    metrics.observe_strava_response("https://www.strava.com/api/v3/activities/1", response, 0.2)
+
+    assert REGISTRY.get_sample_value("strava_ratelimit_remaining", {"window": "15min"}) == 588
+    assert REGISTRY.get_sample_value("strava_ratelimit_remaining", {"window": "daily"}) == 29655
+    assert REGISTRY.get_sample_value(
+        "strava_requests_total", {"endpoint": "/activities/{id}", "status": "200"}
+    ) >= 1
+
+
+def test_observe_openai_call_counts_tokens():
+    before = REGISTRY.get_sample_value("openai_tokens_total", {"model": "test-model", "kind": "prompt"}) or 0
+    metrics.observe_openai_call("test-model", 1.5, usage={"prompt_tokens": 100, "completion_tokens": 20})
+    after = REGISTRY.get_sample_value("openai_tokens_total", {"model": "test-model", "kind": "prompt"})
+    assert after - before == 100
+
+
+def test_job_timings_are_exported():
+    with track_job("metrics_test_job"):
+        with span("stage_a"):
+            pass
+    assert REGISTRY.get_sample_value(
+        "ingestion_stage_calls_total", {"job": "metrics_test_job", "stage": "stage_a"}
+    ) == 1
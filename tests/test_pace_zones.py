@@ -0,0 +1,111 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.utils.pace_zones import (
+    assign_pace_zones, bounds_from_threshold, classify, hour_speed, resolve_bounds,
+    split_speed, threshold_from_efforts, validate_bounds,
+)
+import src.utils.config as config
+from tests.utils import generate_test_token
+
+BOUNDS = [2.5, 3.0, 3.5, 4.0]
+
+
+def test_classify_edges_belong_to_upper_zone():
+    assert classify([2.0, 2.5, 3.2, 3.5, 4.5, None, 0], BOUNDS) == [1, 2, 3, 4, 5, None, None]
+
+
+def test_split_speed_prefers_moving_speed():
+    assert split_speed({"distance": 1609.344, "moving_time": 400, "average_speed": 3.0}) == pytest.approx(4.02336)
+    assert split_speed({"distance": 100, "moving_time": 0, "average_speed": 3.0}) == 3.0
+    assert split_speed({}) is None
+
+
+def test_assign_pace_zones_in_place():
+    splits = [{"distance": 1000, "moving_time": 400}, {"distance": 1000, "moving_time": 200}, {}]
+    assign_pace_zones(splits, BOUNDS)
+    assert [s["pace_zone"] for s in splits] == [2, 5, None]
+
+
+def test_threshold_from_efforts_uses_fastest_projection():
+    # A one-hour effort projects to itself
+    assert hour_speed(12000, 3600) == pytest.approx(12000 / 3600)
+    # 5k in 20:00 projects faster than a 3:30 marathon
+    five_k = hour_speed(5000, 1200)
+    assert threshold_from_efforts([(5000, 1200), (42195, 12600)]) == five_k
+    assert threshold_from_efforts([]) is None
+
+
+def test_threshold_ignores_short_and_long_efforts():
+    # A 75 s 400m would project to ~4.3 m/s; the 45:00 10k gives ~3.6
+    ten_k = hour_speed(10000, 2700)
+    assert threshold_from_efforts([(400, 75), (1609.344, 330), (10000, 2700)]) == ten_k
+    assert ten_k == pytest.approx(3.6, abs=0.1)
+    assert classify([10000 / 2700], bounds_from_threshold(ten_k)) == [4]
+    assert threshold_from_efforts([(400, 75), (42195, 12600)]) is None
+
+
+def test_bounds_resolution_order(monkeypatch):
+    monkeypatch.setattr("src.utils.config.PACE_ZONE_BOUNDS", "2,2.5,3,3.5")
+    assert resolve_bounds(BOUNDS, [(5000, 1200)]) == BOUNDS
+    assert resolve_bounds(None, [(3600 * 4, 3600)]) == bounds_from_threshold(4.0)
+    assert resolve_bounds() == [2.0, 2.5, 3.0, 3.5]
+    with pytest.raises(ValueError):
+        validate_bounds([3, 2, 4, 5])
+
+
+def test_enrichment_falls_back_to_defaults_on_bad_settings():
+    from src.services.activity_service import resolve_pace_zone_bounds
+
+    with patch("src.services.activity_service.get_pace_zone_bounds", return_value=[1, 2]), \
+            patch("src.services.activity_service.get_recent_best_times", return_value=[]):
+        assert resolve_pace_zone_bounds(MagicMock(), 7) == resolve_bounds()
+
+
+def test_bulk_assign_binds_bounds():
+    from src.db.dao.split_dao import bulk_assign_pace_zones
+
+    mock_session = MagicMock()
+    mock_session.execute.return_value.rowcount = 3
+    assert bulk_assign_pace_zones(mock_session, 7, BOUNDS, commit=False) == 3
+    params = mock_session.execute.call_args[0][1]
+    assert params == {"athlete_id": 7, "b1": 2.5, "b2": 3.0, "b3": 3.5, "b4": 4.0}
+    mock_session.commit.assert_not_called()
+
+
+def test_pace_zone_put_requires_auth(client):
+    with patch("src.routes.pace_zone_routes.bulk_assign_pace_zones") as bulk:
+        assert client.put("/athletes/7/pace-zones", json={"pace_zone_bounds": BOUNDS}).status_code == 401
+    bulk.assert_not_called()
+
+
+def test_pace_zone_routes(client):
+    headers = {"Authorization": f"Bearer {generate_test_token('7', config.SECRET_KEY)}"}
+    with patch("src.routes.pace_zone_routes.get_session") as get_session, \
+            patch("src.routes.pace_zone_routes.set_pace_zone_bounds", return_value=True) as store, \
+            patch("src.routes.pace_zone_routes.resolve_pace_zone_bounds", return_value=BOUNDS), \
+            patch("src.routes.pace_zone_routes.bulk_assign_pace_zones", return_value=12) as bulk:
+        resp = client.put("/athletes/7/pace-zones", json={"pace_zone_bounds": BOUNDS}, headers=headers)
+        assert resp.status_code == 200
+        assert resp.get_json()["splits_updated"] == 12
+        bulk.assert_called_once()
+        # One transaction for the bounds, the splits and the version bump
+        assert store.call_args.kwargs["commit"] is False
+        get_session.return_value.commit.assert_called_once()
+        assert client.put("/athletes/7/pace-zones", json={"pace_zone_bounds": [4, 3]}, headers=headers).status_code == 400
+
+    rows = [
+        {"week": datetime(2026, 10, 5), "pace_zone": 2, "moving_time": 1800},
+        {"week": datetime(2026, 10, 5), "pace_zone": 4, "moving_time": 600},
+        {"week": datetime(2026, 10, 12), "pace_zone": 1, "moving_time": 90},
+    ]
+    with patch("src.routes.pace_zone_routes.get_session"), \
+            patch("src.routes.pace_zone_routes.ActivityStatsDAO.get_weekly_pace_zone_time", return_value=rows):
+        resp = client.get("/athletes/7/pace-zones/weekly?weeks=4&scheme=km")
+    assert resp.get_json()["weeks"] == [
+        {"week": "2026-10-05", "zone_minutes": [0.0, 30.0, 0.0, 10.0, 0.0]},
+        {"week": "2026-10-12", "zone_minutes": [1.5, 0.0, 0.0, 0.0, 0.0]},
+    ]
+    assert client.get("/athletes/7/pace-zones/weekly?scheme=bogus").status_code == 400
@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock, patch
+
+from src.utils.prompt_context import build_prompt, estimate_tokens, load_aggregates, rank_activities
+
+
+def _activities(n):
+    return [
+        {"date": f"2025-06-{i + 1:02d}", "distance_km": 5.0 + i % 3, "duration_min": 30, "name": "Easy run"}
+        for i in range(n)
+    ]
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_build_prompt_respects_budget_and_reports_tokens():
+    context = build_prompt("How was my week?", _activities(200), token_budget=300)
+
+    assert context.tokens <= 300
+    assert context.tokens == estimate_tokens(context.prompt)
+    assert 0 < context.activities_included < 200
+    assert context.activities_included + context.activities_omitted == 200
+    assert f"[{context.activities_omitted} more activities omitted]" in context.prompt
+    assert context.prompt.endswith("USER QUESTION:\nHow was my week?")
+
+
+def test_build_prompt_prefers_recent_activities():
+    context = build_prompt("How was my week?", _activities(30), token_budget=150)
+    assert "2025-06-30" in context.prompt
+    assert "date: 2025-06-01," not in context.prompt
+
+
+def test_rank_activities_uses_question_keywords():
+    activities = [
+        {"date": "2025-06-03", "distance_km": 5, "duration_min": 30, "name": "Easy run"},
+        {"date": "2025-06-01", "distance_km": 21, "duration_min": 120, "name": "Sunday long run"},
+        {"date": "2025-06-02", "distance_km": 8, "duration_min": 32, "name": "Tempo"},
+    ]
+    assert rank_activities("How did my long run go?", activities)[0] == 1
+    assert rank_activities("Was my tempo pace ok?", activities)[0] == 2
+
+
+def test_build_prompt_includes_aggregates_first():
+    aggregates = {
+        "weekly": [{"year": 2025, "week": 26, "total_distance": 42195.0, "total_time": 14400}],
+        "hr_zones": {"zone_1": 10.0, "zone_2": 60.0, "zone_3": 20.0, "zone_4": 8.0, "zone_5": 2.0},
+        "longest_run": {"date": "2025-06-29", "distance_km": 21.1, "duration_min": 110, "name": "Long"},
+        "fastest_run": None,
+    }
+    prompt = build_prompt("Summary?", _activities(2), aggregates).prompt
+
+    assert prompt.index("SUMMARY:") < prompt.index("ACTIVITIES:")
+    assert "week 2025-W26: 42.2 km, 240 min" in prompt
+    assert "zone_2=60" in prompt
+    assert "longest_run: date: 2025-06-29, distance_km: 21.1" in prompt
+
+
+def test_load_aggregates_uses_stats_dao():
+    session = MagicMock()
+    with patch("src.utils.prompt_context.ActivityStatsDAO") as dao:
+        dao.get_weekly_summary.return_value = []
+        dao.get_hr_zone_summary.return_value = {"zone_1": 0.0}
+        dao.get_longest_run.return_value = None
+        dao.get_fastest_run.return_value = None
+        result = load_aggregates(session, 7, days=28)
+
+    dao.get_weekly_summary.assert_called_once_with(session, 7, past_weeks=4)
+    assert result["longest_run"] is None
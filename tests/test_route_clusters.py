@@ -0,0 +1,165 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+import src.services.route_cluster_service as svc
+from src.db.dao.route_dao import build_route
+from src.utils import polyline
+from src.utils.route_fingerprint import (
+    candidate_cells, fingerprint, geohash, geohash_centre, neighbour_cells, resample, shape_deviation,
+)
+
+# A ~2.8 km loop in Hyde Park, and a different course starting at the same spot
+LOOP = [[51.5073 + 0.004 * np.sin(t), -0.1657 + 0.006 * np.cos(t)] for t in np.linspace(0, 2 * np.pi, 200)]
+LINE = [[51.5073, -0.1657 + i * 0.0002] for i in range(100)]
+
+
+def route_row(activity_id, latlng, cluster_id=None):
+    row = build_route(activity_id, 7, latlng)
+    return SimpleNamespace(**{k: row[k] for k in ("activity_id", "distance", "start_cell", "end_cell", "shape")},
+                           cluster_id=cluster_id)
+
+
+def test_geohash_reference_value_and_centre():
+    # Reference example from the geohash documentation
+    assert geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    lat, lng = geohash_centre("u4pruydqqvj")
+    assert lat == pytest.approx(57.64911, abs=1e-5)
+    assert lng == pytest.approx(10.40744, abs=1e-5)
+
+
+def test_neighbour_cells_surround_the_cell():
+    cell = geohash(51.5073, -0.1657, 6)
+    cells = neighbour_cells(cell)
+    assert len(cells) == 9 and cell in cells
+    # A point just across a cell edge is still a candidate
+    assert geohash(51.5073 + 0.004, -0.1657, 6) in cells
+    assert candidate_cells(cell, geohash(51.52, -0.13, 6)) >= cells
+
+
+def test_resample_spaces_points_evenly_by_distance():
+    shape = resample([[0.0, 0.0], [0.0, 0.001], [0.0, 0.01]], 11)
+    assert shape.shape == (11, 2)
+    assert np.allclose(np.diff(shape[:, 1]), 0.001)
+
+
+def test_shape_deviation_matches_reversed_runs():
+    a = fingerprint(LOOP)["shape"]
+    reversed_loop = fingerprint(LOOP[::-1])["shape"]
+    other = fingerprint(LINE)["shape"]
+    assert shape_deviation(a, a) == pytest.approx(0.0)
+    assert shape_deviation(a, reversed_loop) < 5
+    assert shape_deviation(a, other) > 200
+
+
+def test_build_route_includes_fingerprint():
+    route = build_route(1, 7, LOOP)
+    assert route["distance"] == pytest.approx(2 * np.pi * 445, rel=0.1)
+    assert route["start_cell"] == route["end_cell"] == geohash(*LOOP[0])
+    assert len(polyline.decode(route["shape"])) == 32
+    # Too short to compare: kept for the heatmap, left out of clustering
+    assert build_route(2, 7, LINE[:3])["shape"] is None
+
+
+def test_find_matches_filters_candidates_by_shape():
+    route = route_row(1, LOOP)
+    candidates = [route_row(2, LOOP[::-1], cluster_id=2), route_row(3, LINE, cluster_id=3)]
+    with patch.object(svc, "get_candidate_routes", return_value=candidates) as get_candidates:
+        matches = svc.find_matches(MagicMock(), 7, route)
+    assert [m.activity_id for _, m in matches] == [2]
+    cells = get_candidates.call_args.args[2]
+    assert route.start_cell in cells
+
+
+def test_cluster_routes_joins_closest_cluster_or_starts_one():
+    routes = [
+        route_row(1, LOOP, cluster_id=1),
+        route_row(2, LOOP[::-1]),
+        route_row(3, LINE),
+        route_row(4, LINE[::-1]),
+    ]
+    session = MagicMock()
+    with patch.object(svc, "backfill_fingerprints"), \
+         patch.object(svc, "get_comparable_routes", return_value=routes), \
+         patch.object(svc, "bulk_assign_clusters") as bulk, \
+         patch.object(svc, "bump_version") as bump:
+        assert svc.cluster_routes(session, 7) == 3
+
+    # Route 4 matches route 3, assigned earlier in the same pass
+    bulk.assert_called_once_with(session, {2: 1, 3: 3, 4: 3})
+    bump.assert_called_once_with(session, 7)
+    session.commit.assert_called_once()
+
+
+def test_bulk_assign_clusters_is_one_statement_per_chunk():
+    from src.db.dao.route_dao import bulk_assign_clusters
+
+    session = MagicMock()
+    assert bulk_assign_clusters(session, {i: 1 for i in range(5)}, chunk_size=2) == 5
+    assert session.execute.call_count == 3
+    sql, binds = session.execute.call_args_list[0].args
+    assert "FROM (VALUES" in str(sql) and binds == {"a0": 0, "c0": 1, "a1": 1, "c1": 1}
+
+
+def test_upsert_routes_keeps_cluster_for_unchanged_polyline():
+    from sqlalchemy.dialects import postgresql
+    from src.db.dao.route_dao import upsert_routes
+
+    session = MagicMock()
+    upsert_routes(session, [build_route(1, 7, LINE)], commit=False)
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "cluster_id = CASE WHEN (activity_routes.polyline IS DISTINCT FROM excluded.polyline) THEN NULL " \
+           "ELSE activity_routes.cluster_id END" in sql
+    assert "ELSE activity_routes.updated_at END" in sql
+    session.commit.assert_not_called()
+
+
+def test_min_distance_is_separate_from_match_tolerance(monkeypatch):
+    monkeypatch.setattr("src.utils.config.ROUTE_MATCH_METERS", 5000)
+    assert build_route(1, 7, LINE)["shape"] is not None
+    monkeypatch.setattr("src.utils.config.ROUTE_MIN_DISTANCE", 5000)
+    assert build_route(1, 7, LINE)["shape"] is None
+
+
+def run(activity_id):
+    return SimpleNamespace(
+        activity_id=activity_id, name=f"Run {activity_id}", start_date=datetime(2024, 5, activity_id, tzinfo=timezone.utc),
+        distance=2800.0, moving_time=900, average_speed=3.1, average_heartrate=150.0,
+    )
+
+
+def test_similar_route_returns_closest_runs(client):
+    route = route_row(1, LOOP, cluster_id=1)
+    with patch("src.routes.route_cluster_routes.get_session"), \
+         patch.object(svc, "get_route_fingerprint", return_value=route), \
+         patch.object(svc, "get_candidate_routes", return_value=[route_row(2, LOOP[::-1], cluster_id=1)]), \
+         patch.object(svc, "get_runs", return_value=[run(2)]):
+        resp = client.get("/athletes/7/activities/1/similar")
+    assert resp.status_code == 200
+    similar = resp.get_json()["similar"]
+    assert [r["activity_id"] for r in similar] == [2]
+    assert similar[0]["deviation_m"] < 5
+
+
+def test_similar_route_404_without_route(client):
+    with patch("src.routes.route_cluster_routes.get_session"), \
+         patch.object(svc, "get_route_fingerprint", return_value=None):
+        assert client.get("/athletes/7/activities/1/similar").status_code == 404
+    assert client.get("/athletes/7/activities/1/similar?limit=0").status_code == 400
+
+
+def test_route_cluster_routes(client):
+    summary = SimpleNamespace(
+        cluster_id=1, runs=2, distance=2801.26, first_run=run(1).start_date, last_run=run(2).start_date,
+        best_moving_time=880,
+    )
+    with patch("src.routes.route_cluster_routes.get_session"), \
+         patch.object(svc, "get_cluster_summaries", return_value=[summary]), \
+         patch.object(svc, "get_cluster_runs", return_value=[run(1), run(2)]):
+        clusters = client.get("/athletes/7/route-clusters").get_json()["clusters"]
+        detail = client.get("/athletes/7/route-clusters/1").get_json()["runs"]
+    assert clusters[0]["runs"] == 2 and clusters[0]["distance"] == 2801.3
+    assert [r["activity_id"] for r in detail] == [1, 2]
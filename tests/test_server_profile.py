@@ -0,0 +1,38 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.server_profile import compute_profile
+
+
+def test_gthread_defaults_size_threads_to_pool():
+    profile = compute_profile(cpu_count=2)
+    assert (profile.worker_class, profile.workers, profile.threads) == ("gthread", 3, 5)
+    assert profile.graceful_timeout == profile.timeout == 120
+    assert profile.max_requests_jitter == 100
+
+
+def test_sync_uses_more_workers_one_thread_each():
+    profile = compute_profile(cpu_count=2, worker_class="sync", threads=8)
+    assert (profile.workers, profile.threads) == (5, 1)
+
+
+def test_workers_capped_by_db_connections():
+    profile = compute_profile(cpu_count=16, db_pool_size=5, db_max_overflow=5, db_max_connections=40)
+    assert profile.workers == 4
+
+
+def test_explicit_workers_and_threads_win():
+    profile = compute_profile(cpu_count=16, workers=2, threads=3)
+    assert (profile.workers, profile.threads) == (2, 3)
+
+
+def test_unknown_worker_class_rejected():
+    with pytest.raises(ValueError):
+        compute_profile(cpu_count=2, worker_class="eventlet")
+
+
+def test_gevent_requires_package():
+    with patch("src.utils.server_profile.importlib.util.find_spec", return_value=None):
+        with pytest.raises(RuntimeError):
+            compute_profile(cpu_count=2, worker_class="gevent")
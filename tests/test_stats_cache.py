@@ -0,0 +1,109 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.utils.stats_cache import MemoryVersions, PostgresVersions, StatsCache, make_versions
+
+
+def test_bumping_version_makes_old_entries_unreachable():
+    cache = StatsCache(MemoryVersions())
+    compute = MagicMock(side_effect=[1, 2])
+
+    assert cache.get_or_compute(None, 7, ("q",), compute) == (1, False)
+    assert cache.get_or_compute(None, 7, ("q",), compute) == (1, True)
+    cache.versions.bump(8)
+    assert cache.get_or_compute(None, 7, ("q",), compute) == (1, True)
+    cache.versions.bump(7)
+    assert cache.get_or_compute(None, 7, ("q",), compute) == (2, False)
+
+
+def test_entries_expire_and_lru_is_bounded():
+    now = [0.0]
+    cache = StatsCache(MemoryVersions(), ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+    for q in ("a", "b", "c"):
+        cache.get_or_compute(None, 1, q, lambda: q)
+    assert len(cache) == 2
+    assert cache.get_or_compute(None, 1, "a", lambda: "a2") == ("a2", False)
+
+    now[0] = 11
+    assert cache.get_or_compute(None, 1, "c", lambda: "c2") == ("c2", False)
+
+
+def test_postgres_versions_bump_in_callers_transaction():
+    session = MagicMock()
+    PostgresVersions().bump(7, session)
+    sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (athlete_id) DO UPDATE SET version = (stats_versions.version + " in sql
+    session.commit.assert_not_called()
+
+
+def test_non_transactional_bump_waits_for_commit(monkeypatch):
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+    from src.utils.stats_cache import bump_version, stats_cache
+
+    monkeypatch.setattr(stats_cache, "versions", MemoryVersions())
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        session.execute(text("SELECT 1"))
+        bump_version(session, 7)
+        assert stats_cache.versions.get(7) == 0
+        session.commit()
+        assert stats_cache.versions.get(7) == 1
+
+        session.execute(text("SELECT 1"))
+        bump_version(session, 7)
+        session.rollback()
+        session.commit()
+        assert stats_cache.versions.get(7) == 1
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        make_versions("memcached")
+
+
+def test_upsert_activities_bumps_version():
+    from src.db.dao.activity_dao import ActivityDAO
+
+    act = {
+        "id": 1, "type": "Run", "name": "Treadmill", "start_date": "2026-10-01T07:00:00Z",
+        "distance": 5000, "moving_time": 1500, "elapsed_time": 1500,
+    }
+    with patch("src.db.dao.activity_dao.bump_version") as bump, \
+            patch("src.db.dao.activity_dao.update_index"):
+        ActivityDAO.upsert_activities(MagicMock(), 7, [act])
+    assert bump.call_args[0][1] == 7
+
+
+def test_stats_route_serves_from_cache_until_bump(client):
+    from src.utils.stats_cache import bump_version, stats_cache
+
+    stats_cache.clear()
+    run = SimpleNamespace(
+        activity_id=1, name="Long run", start_date=datetime(2026, 10, 1), distance=21097.5, moving_time=6300,
+    )
+    with patch("src.routes.stats_routes.get_session"), \
+            patch("src.services.stats_service.ActivityStatsDAO.get_longest_run", return_value=run) as dao:
+        first = client.get("/stats/7/longest_run?days=90")
+        second = client.get("/stats/7/longest_run?days=90")
+        bump_version(None, 7)
+        third = client.get("/stats/7/longest_run?days=90")
+
+    assert first.get_json()["data"]["distance_km"] == 21.1
+    assert [r.headers["X-Cache"] for r in (first, second, third)] == ["MISS", "HIT", "MISS"]
+    assert dao.call_count == 2
+    assert dao.call_args[0][1:] == (7, 90)
+
+
+@pytest.mark.parametrize("path, status", [
+    ("/stats/7/nope", 404),
+    ("/stats/7/longest_run?days=0", 400),
+    ("/stats/7/trend_metric?metric=__class__", 400),
+])
+def test_stats_route_validation(client, path, status):
+    with patch("src.routes.stats_routes.get_session"):
+        assert client.get(path).status_code == status
@@ -122,3 +122,13 @@ def test_get_streams_handles_bad_data(mock_request, client):
 
     streams = client.get_streams(1, ["heartrate"])
     assert streams["heartrate"] == [123.0]
+
+@patch("src.services.strava_access_service.requests.request")
+def test_get_streams_keeps_latlng_pairs(mock_request, client):
+    resp_json = {
+        "latlng": {"data": [[37.77, -122.41], [37.78, -122.42], "bad"]},
+    }
+    mock_request.return_value = MagicMock(status_code=200, json=lambda: resp_json)
+
+    streams = client.get_streams(1, ["latlng"])
+    assert streams["latlng"] == [[37.77, -122.41], [37.78, -122.42]]
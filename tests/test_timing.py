@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, patch
+
+from src.utils import timing
+from src.utils.timing import span, timed, timed_job, track_job, add_sink, remove_sink
+
+
+def test_span_outside_job_is_noop():
+    with span("anything"):
+        pass
+    assert timing.current_job() is None
+
+
+def test_track_job_aggregates_stage_counts():
+    with track_job("full_sync", athlete_id=42) as timer:
+        for _ in range(3):
+            with span("upsert_splits"):
+                pass
+        with span("strava_get_activity"):
+            pass
+
+    summary = timer.summary()
+    assert summary["job"] == "full_sync"
+    assert summary["athlete_id"] == 42
+    assert summary["elapsed_s"] is not None
+    assert summary["stages"]["upsert_splits"]["count"] == 3
+    assert summary["stages"]["strava_get_activity"]["count"] == 1
+    assert sum(summary["stages"]["upsert_splits"]["histogram"].values()) == 3
+
+
+def test_nested_track_job_joins_outer():
+    with track_job("outer", athlete_id=1) as outer:
+        with track_job("inner", athlete_id=1) as inner:
+            with span("stage"):
+                pass
+        assert inner is outer
+    assert outer.stages["stage"].count == 1
+
+
+def test_timed_decorator_records_and_returns():
+    @timed("work")
+    def work(x):
+        return x * 2
+
+    with track_job("job") as timer:
+        assert work(3) == 6
+    assert timer.stages["work"].count == 1
+
+
+def test_timed_job_labels_from_arguments():
+    seen = []
+
+    @timed_job("sync", "athlete_id")
+    def sync(session, athlete_id, limit=10):
+        with span("stage"):
+            pass
+        seen.append(timing.current_job())
+        return limit
+
+    assert sync(None, athlete_id=5) == 10
+    assert seen[0].summary()["athlete_id"] == 5
+    assert seen[0].stages["stage"].count == 1
+    assert timing.current_job() is None
+
+
+def test_span_records_even_when_block_raises():
+    with track_job("job") as timer:
+        try:
+            with span("boom"):
+                raise ValueError("fail")
+        except ValueError:
+            pass
+    assert timer.stages["boom"].count == 1
+
+
+def test_sinks_receive_finished_job_and_errors_are_swallowed():
+    received = MagicMock()
+    broken = MagicMock(side_effect=RuntimeError("sink down"))
+    add_sink(received)
+    add_sink(broken)
+    try:
+        with track_job("job"):
+            pass
+    finally:
+        remove_sink(received)
+        remove_sink(broken)
+
+    received.assert_called_once()
+    assert received.call_args[0][0].job == "job"
+
+
+@patch("src.services.activity_service.time.sleep", return_value=None)
+@patch("src.services.activity_service.enrich_one_activity_with_refresh")
+@patch("src.services.activity_service.get_activities_to_enrich", return_value=[1, 2])
+def test_run_enrichment_batch_emits_stage_summary(mock_get, mock_enrich, mock_sleep):
+    from src.services import activity_service as svc
+
+    received = []
+    add_sink(received.append)
+    try:
+        svc.run_enrichment_batch(MagicMock(), 7, batch_size=2)
+    finally:
+        remove_sink(received.append)
+
+    assert len(received) == 1
+    stages = received[0].summary()["stages"]
+    assert stages["enrich_activity"]["count"] == 2
+    assert stages["sleep"]["count"] == 2
+    assert stages["select_activities_to_enrich"]["count"] == 1
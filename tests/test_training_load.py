@@ -0,0 +1,95 @@
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services import training_load_service as svc
+from src.services.activity_service import refresh_training_load
+from src.utils.training_load import CTL_DAYS, ATL_DAYS, LoadDay, activity_load, decay, roll_forward
+
+
+def test_activity_load_prefers_hr_zones_then_suffer_score_then_pace():
+    zoned = {"moving_time": 3600, "hr_zone_1": 0, "hr_zone_2": 50, "hr_zone_3": 50, "hr_zone_4": 0, "hr_zone_5": 0}
+    assert activity_load(zoned) == 150.0  # 30 min * 2 + 30 min * 3
+
+    assert activity_load({"moving_time": 3600, "suffer_score": 88}) == 88.0
+
+    with patch("src.utils.config.LOAD_THRESHOLD_SPEED", 4.0):
+        assert activity_load({"moving_time": 3600, "average_speed": 4.0}) == 100.0
+    assert activity_load({}) == 0.0
+
+
+def test_roll_forward_recurrences():
+    days = roll_forward(date(2025, 1, 1), 0.0, 0.0, {date(2025, 1, 1): 100.0}, date(2025, 1, 2))
+
+    assert days[0].ctl == pytest.approx(100 / CTL_DAYS, abs=0.01)
+    assert days[0].atl == pytest.approx(100 / ATL_DAYS, abs=0.01)
+    assert days[0].tsb == 0.0
+    assert days[1].load == 0.0
+    assert days[1].tsb == pytest.approx(days[0].ctl - days[0].atl, abs=0.02)
+
+
+def test_incremental_recompute_matches_full_recompute():
+    loads = {date(2025, 1, 1) + timedelta(days=i): float((i * 37) % 90) for i in range(120)}
+    full = roll_forward(date(2025, 1, 1), 0.0, 0.0, loads, date(2025, 4, 30))
+
+    seed = full[59]
+    tail = roll_forward(seed.day + timedelta(days=1), seed.ctl, seed.atl, loads, date(2025, 4, 30))
+    for a, b in zip(full[60:], tail):
+        assert (a.ctl, a.atl) == pytest.approx((b.ctl, b.atl), abs=0.02)
+
+
+def test_decay_matches_rest_days():
+    rolled = roll_forward(date(2025, 1, 1), 50.0, 80.0, {}, date(2025, 1, 10))[-1]
+    assert decay(50.0, 80.0, 10) == pytest.approx((rolled.ctl, rolled.atl), abs=0.01)
+
+
+def test_update_training_load_seeds_from_previous_day():
+    session = MagicMock()
+    seed = MagicMock(day=date(2025, 3, 9), ctl=40.0, atl=60.0)
+    run = MagicMock(start_date=datetime(2025, 3, 10, 7), moving_time=3600, suffer_score=100,
+                    hr_zone_1=None, hr_zone_2=None, hr_zone_3=None, hr_zone_4=None, hr_zone_5=None)
+    session.scalars.return_value.all.return_value = [run]
+
+    with patch.object(svc, "get_day_before", return_value=seed), \
+            patch.object(svc, "upsert_training_load", return_value=3) as upsert:
+        svc.update_training_load(session, 7, date(2025, 3, 10), today=date(2025, 3, 12))
+
+    days = upsert.call_args[0][2]
+    assert [d.day for d in days] == [date(2025, 3, 10), date(2025, 3, 11), date(2025, 3, 12)]
+    assert days[0].load == 100.0
+    assert days[0].tsb == -20.0
+
+
+def test_training_load_series_decays_past_last_row():
+    last = MagicMock(day=date(2025, 3, 1), load=0.0, ctl=42.0, atl=70.0, tsb=0.0)
+    with patch.object(svc.ActivityStatsDAO, "get_training_load", return_value=[]), \
+            patch.object(svc, "get_day_before", return_value=last):
+        series = svc.training_load_series(MagicMock(), 7, date(2025, 3, 11), date(2025, 3, 13))
+
+    expected = roll_forward(date(2025, 3, 2), 42.0, 70.0, {}, date(2025, 3, 13))[-3:]
+    assert [d.day for d in series] == [d.day for d in expected]
+    assert [d.ctl for d in series] == pytest.approx([d.ctl for d in expected], abs=0.01)
+
+
+def test_refresh_training_load_uses_earliest_day_per_athlete():
+    payloads = [
+        {"athlete": {"id": 7}, "start_date": "2025-03-10T07:00:00Z"},
+        {"athlete": {"id": 7}, "start_date": "2025-03-05T07:00:00Z"},
+        {"start_date": "2025-03-01T07:00:00Z"},
+    ]
+    with patch("src.services.activity_service.update_training_load") as update:
+        refresh_training_load("session", payloads)
+    update.assert_called_once_with("session", 7, date(2025, 3, 5), commit=False)
+
+
+def test_training_load_route(client):
+    series = [LoadDay(date(2025, 3, 1), 50.0, 10.0, 20.0, -5.0)]
+    with patch("src.routes.training_load_routes.get_session"), \
+            patch("src.routes.training_load_routes.training_load_series", return_value=series) as fetch:
+        resp = client.get("/athletes/7/training-load?start=2025-03-01&end=2025-03-01")
+
+    assert resp.status_code == 200
+    assert resp.get_json()["days"] == [{"day": "2025-03-01", "load": 50.0, "ctl": 10.0, "atl": 20.0, "tsb": -5.0}]
+    assert fetch.call_args[0][2:] == (date(2025, 3, 1), date(2025, 3, 1))
+    assert client.get("/athletes/7/training-load?start=bad").status_code == 400
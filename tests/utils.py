@@ -7,3 +7,84 @@ def generate_test_token(user_id, secret_key, expires_in=3600):
         "exp": datetime.datetime.utcnow() + datetime.timedelta(seconds=expires_in)
     }
     return jwt.encode(payload, secret_key, algorithm="HS256")
+
+
+class FakeLLMServer:
+    """
+    Minimal OpenAI-compatible chat completions server that streams `chunks`
+    as SSE with `delay` seconds between them, or returns them joined as one
+    completion when the request doesn't ask for a stream. Records whether the client
+    hung up before the stream finished.
+    """
+
+    def __init__(self, chunks, delay=0.0):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.chunks = chunks
+        self.delay = delay
+        self.sent = 0
+        self.disconnected = threading.Event()
+        self.finished = threading.Event()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                import json
+                import time
+
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not body.get("stream"):
+                    completion = {
+                        "id": "fake", "object": "chat.completion", "created": 0, "model": "fake",
+                        "choices": [{
+                            "index": 0, "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": "".join(server.chunks)},
+                        }],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": len(server.chunks), "total_tokens": 10 + len(server.chunks)},
+                    }
+                    payload = json.dumps(completion).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    server.sent += len(server.chunks)
+                    server.finished.set()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                try:
+                    for text in server.chunks:
+                        event = {
+                            "id": "fake", "object": "chat.completion.chunk", "created": 0, "model": "fake",
+                            "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}],
+                        }
+                        self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                        self.wfile.flush()
+                        server.sent += 1
+                        time.sleep(server.delay)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                    server.finished.set()
+                except (BrokenPipeError, ConnectionResetError):
+                    server.disconnected.set()
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/v1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()